@@ -1,8 +1,10 @@
 from typing import Optional
-from flask import Flask, send_from_directory, Response
+from flask import Flask, send_from_directory, request, Response
 from flask_cors import CORS
 from config import Config
 from backend.routes import register_routes
+from backend.utils.compression import init_compression, precompressed_sibling
+from backend.utils.json_provider import FastJSONProvider
 import os
 import mimetypes
 
@@ -14,6 +16,7 @@ def create_app() -> Flask:
         Configured Flask application instance
     """
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     
     app.config.from_object(Config)
     CORS(app)
@@ -26,6 +29,9 @@ def create_app() -> Flask:
     # Register all API routes FIRST (with /api prefix)
     register_routes(app)
     
+    # gzip/brotli for API responses (no reverse proxy needed)
+    init_compression(app)
+    
     # Serve documentation HTML file
     @app.route("/docs")
     @app.route("/panduan")
@@ -65,6 +71,25 @@ def create_app() -> Flask:
         else:
             return Response("Screenshot not found", status=404)
     
+    def send_static(relative_path: str, mimetype: str) -> Response:
+        """
+        Send a file from dist/, preferring a precompressed .br/.gz sibling
+        
+        Args:
+            relative_path: File path relative to dist/
+            mimetype: MIME type of the uncompressed file
+            
+        Returns:
+            File response
+        """
+        sibling = precompressed_sibling(Config.DIST_DIR, relative_path, request)
+        if sibling is None:
+            return send_from_directory(Config.DIST_DIR, relative_path, mimetype=mimetype)
+        response = send_from_directory(Config.DIST_DIR, sibling[0], mimetype=mimetype)
+        response.headers['Content-Encoding'] = sibling[1]
+        response.vary.add('Accept-Encoding')
+        return response
+    
     # Serve React frontend - CATCH-ALL route (must be LAST)
     @app.route("/", defaults={"path": ""})
     @app.route("/<path:path>")
@@ -133,7 +158,7 @@ def create_app() -> Flask:
                 if Config.DEBUG:
                     print(f"[DEBUG] MIME type: {mimetype}")
                 
-                response = send_from_directory(Config.DIST_DIR, normalized_path, mimetype=mimetype)
+                response = send_static(normalized_path, mimetype)
                 
                 # Ensure proper headers for CSS files
                 if file_path.endswith('.css'):
@@ -155,7 +180,7 @@ def create_app() -> Flask:
         
         # For all other requests (SPA routes), return index.html
         # This handles: /, /dashboard, /engineers, /stockpart, etc.
-        response = send_from_directory(Config.DIST_DIR, "index.html")
+        response = send_static("index.html", "text/html")
         # Disable caching for index.html to ensure fresh builds are served
         response.cache_control.no_cache = True
         response.cache_control.no_store = True
@@ -7,6 +7,8 @@ from flask import Flask, Response
 from flask_cors import CORS
 from config import Config
 from backend.routes import register_routes
+from backend.utils.compression import init_compression
+from backend.utils.json_provider import FastJSONProvider
 import os
 
 def create_app() -> Flask:
@@ -17,6 +19,7 @@ def create_app() -> Flask:
         Configured Flask application instance
     """
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     
     app.config.from_object(Config)
     
@@ -34,6 +37,9 @@ def create_app() -> Flask:
     # Register all API routes with /api prefix
     register_routes(app)
     
+    # gzip/brotli for API responses (no reverse proxy needed)
+    init_compression(app)
+    
     # Root endpoint - API info
     @app.route("/")
     def root() -> Response:
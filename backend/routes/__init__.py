@@ -12,6 +12,11 @@ from .tools import tool_bp
 from .baby_parts import baby_part_bp
 from .leveling import leveling_bp
 from .so_data import so_bp
+from .kpi import kpi_bp
+from .search import search_bp
+from .stock_movements import stock_movement_bp
+from .geo import geo_bp
+from backend.utils.conditional import init_conditional_requests
 
 def register_routes(app: 'Flask') -> None:
     """
@@ -29,4 +34,11 @@ def register_routes(app: 'Flask') -> None:
     app.register_blueprint(tool_bp, url_prefix='/api')
     app.register_blueprint(baby_part_bp, url_prefix='/api')
     app.register_blueprint(leveling_bp, url_prefix='/api')
-    app.register_blueprint(so_bp, url_prefix='/api')
\ No newline at end of file
+    app.register_blueprint(so_bp, url_prefix='/api')
+    app.register_blueprint(kpi_bp, url_prefix='/api')
+    app.register_blueprint(search_bp, url_prefix='/api')
+    app.register_blueprint(stock_movement_bp, url_prefix='/api')
+    app.register_blueprint(geo_bp, url_prefix='/api')
+    
+    # Body-hash ETags for endpoints without data-version ETags
+    init_conditional_requests(app)
\ No newline at end of file
@@ -5,10 +5,12 @@ Handles CRUD operations for baby parts inventory
 from flask import Blueprint, jsonify, request
 from urllib.parse import unquote
 from backend.services.baby_part_service import BabyPartService
+from backend.utils.conditional import track_data_versions
 import traceback
 
 baby_part_bp = Blueprint('baby_parts', __name__)
 service = BabyPartService()
+track_data_versions(baby_part_bp, service)
 
 @baby_part_bp.route('/baby-parts', methods=['GET', 'POST'])
 def baby_parts():
@@ -23,18 +25,8 @@ def baby_parts():
             per_page = request.args.get('per_page', type=int)
             search = request.args.get('search', '')
             
-            # Get all data
-            data = service.get_all()
-            
-            # Apply search filter
-            if search:
-                from backend.utils.helpers import search_dict_list
-                # Search in: baby_parts, Baby Parts
-                data = search_dict_list(data, search, [
-                    'baby_parts', 
-                    'Baby Parts', 
-                    'BABY PARTS',
-                ])
+            # Get all data (search uses the ranked token/trigram index)
+            data = service.search(search) if search else service.get_all()
             
             # Apply pagination if requested
             if page and per_page:
@@ -1,19 +1,32 @@
 from flask import Blueprint, jsonify, request
 from backend.services.engineer_service import EngineerService
+from backend.utils.columnar import get_columnar_format
+from backend.utils.response_cache import cached_json_response
+from backend.utils.conditional import track_data_versions
+from backend.utils.delta_sync import expose_change_version
 
 engineer_bp = Blueprint('engineers', __name__)
 service = EngineerService()
+# Change versions restart with the process; the change log itself is in-memory state
+track_data_versions(engineer_bp, service, service.get_change_epoch, exclude=('engineer_changes',))
 
 @engineer_bp.route('/engineers', methods=['GET', 'POST'])
 def engineers():
     """
-    GET: Retrieve all engineers
+    GET: Retrieve all engineers (?format=columns|dict returns column-oriented data;
+         X-Change-Version is the cursor for /engineers/changes)
     POST: Create new engineer
     """
     if request.method == 'GET':
         try:
-            data = service.get_all()
-            return jsonify(data), 200
+            expose_change_version(service)
+            columnar = get_columnar_format(request)
+            if columnar:
+                return cached_json_response(service.get_data_version(),
+                                            lambda: service.get_columnar(dictionary=columnar == 'dict')), 200
+            return cached_json_response(service.get_data_version(), service.get_all), 200
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         except FileNotFoundError as e:
             return jsonify({"error": str(e)}), 404
         except Exception as e:
@@ -33,6 +46,24 @@ def engineers():
             print(f"[ERROR] Failed to create engineer: {e}")
             return jsonify({"error": str(e)}), 500
 
+@engineer_bp.route('/engineers/changes', methods=['GET'])
+def engineer_changes():
+    """
+    Get engineers inserted, updated or deleted after ?since=<change version>
+    Start from the X-Change-Version header of GET /engineers; reset=true means
+    the log no longer covers since and the full list must be refetched
+    """
+    try:
+        since = request.args.get('since', 0, type=int)
+        return jsonify(service.get_changes(since)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        print(f"[ERROR] Failed to get engineer changes: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+
 @engineer_bp.route('/engineers/<engineer_id>', methods=['PUT', 'DELETE'])
 def engineer_by_id(engineer_id):
     """
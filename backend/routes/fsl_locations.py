@@ -1,17 +1,27 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from backend.services.fsl_service import FSLLocationService
+from backend.utils.columnar import get_columnar_format
+from backend.utils.conditional import track_data_versions
+from backend.utils.response_cache import cached_json_response
 
 fsl_bp = Blueprint('fsl_locations', __name__)
 service = FSLLocationService()
+track_data_versions(fsl_bp, service)
 
 @fsl_bp.route('/fsl-locations', methods=['GET'])
 def fsl_locations():
     """
-    GET: Retrieve all FSL locations
+    GET: Retrieve all FSL locations (?format=columns|dict returns column-oriented data)
     """
     try:
+        columnar = get_columnar_format(request)
+        if columnar:
+            return cached_json_response(service.get_data_version(),
+                                        lambda: service.get_columnar(dictionary=columnar == 'dict')), 200
         data = service.get_all()
         return jsonify(data), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except FileNotFoundError as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
@@ -0,0 +1,259 @@
+"""
+Geo API Routes
+Nearest engineer / FSL lookups over a KD-tree, machine coverage analysis
+and SO service-load heatmaps
+"""
+from flask import Blueprint, jsonify, request
+from backend.services.assignment_service import AssignmentService
+from backend.services.geo_service import GeoService
+from backend.services.province_centroids import province_centroids
+from backend.utils.csv_utils import paginate_frame
+
+geo_bp = Blueprint('geo', __name__)
+service = GeoService()
+assignment_service = AssignmentService()
+
+MAX_K = 100
+MAX_WAIT_SECONDS = 30
+
+def _parse_bbox():
+    """
+    Parse ?bbox=west,south,east,north
+    
+    Returns:
+        Tuple of 4 floats, or None if not given
+    
+    Raises:
+        ValueError: If bbox is malformed
+    """
+    bbox_param = request.args.get('bbox', '').strip()
+    if not bbox_param:
+        return None
+    try:
+        bbox = tuple(float(value) for value in bbox_param.split(','))
+    except ValueError:
+        bbox = ()
+    if len(bbox) != 4:
+        raise ValueError("bbox must be west,south,east,north")
+    return bbox
+
+@geo_bp.route('/geo/nearest', methods=['GET'])
+def geo_nearest():
+    """
+    GET: Nearest engineers or FSLs (?lat=&lng=&k=5&type=engineer|fsl&max_km=)
+    A machine's location can be used instead of lat/lng with ?wsid=
+    Returns records with distance_km (great-circle), nearest first
+    """
+    lat = request.args.get('lat', type=float)
+    lng = request.args.get('lng', type=float)
+    wsid = request.args.get('wsid', '').strip()
+    k = request.args.get('k', 5, type=int)
+    point_type = request.args.get('type', 'engineer')
+    max_km = request.args.get('max_km', type=float)
+    
+    try:
+        if wsid:
+            lat, lng = service.get_machine_location(wsid)
+        elif lat is None or lng is None:
+            return jsonify({"error": "Numeric 'lat' and 'lng' (or 'wsid') are required"}), 400
+        
+        data = service.nearest(lat, lng, k=min(k, MAX_K), point_type=point_type, max_km=max_km)
+        if wsid:
+            data["query"]["wsid"] = wsid
+        return jsonify(data), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        print(f"[ERROR] Failed to find nearest {point_type}: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@geo_bp.route('/geo/clusters', methods=['GET'])
+def geo_clusters():
+    """
+    GET: Grid clusters for the map (?layer=machine|engineer&zoom=5&bbox=west,south,east,north)
+    Returns one entry per occupied grid cell with counts by status and region
+    """
+    layer = request.args.get('layer', 'machine')
+    zoom = request.args.get('zoom', 5, type=int)
+    
+    try:
+        data = service.clusters(layer=layer, zoom=zoom, bbox=_parse_bbox())
+        return jsonify(data), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        print(f"[ERROR] Failed to get {layer} clusters: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@geo_bp.route('/geo/so-heatmap', methods=['GET'])
+def geo_so_heatmap():
+    """
+    GET: Service order load per map grid cell (?zoom=5&bbox=west,south,east,north)
+    SOs are joined to machine locations by wsid; each cell is
+    [lat, lng, so_count, machines, avg_resolution_time] (see "fields")
+    """
+    zoom = request.args.get('zoom', 5, type=int)
+    
+    try:
+        data = service.service_load_heatmap(zoom=zoom, bbox=_parse_bbox())
+        return jsonify(data), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        print(f"[ERROR] Failed to get SO heatmap: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@geo_bp.route('/geo/so-load/machines', methods=['GET'])
+def geo_so_load_machines():
+    """
+    GET: SO count and mean resolution time per machine, most orders first
+    (?area_group=&min_so=1&page=1&per_page=50)
+    """
+    area_group = request.args.get('area_group', '').strip()
+    min_so = request.args.get('min_so', 1, type=int)
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 50, type=int)
+    
+    try:
+        machines = service.get_service_load_machines(area_group=area_group or None, min_so=min_so)
+        return jsonify(paginate_frame(machines, page, max(1, min(per_page, 500)))), 200
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        print(f"[ERROR] Failed to get SO load per machine: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@geo_bp.route('/geo/coverage', methods=['GET'])
+def geo_coverage():
+    """
+    GET: Machine coverage by area group (?wait=<seconds>)
+    Distance from each machine to its nearest engineer / FSL, bucketed
+    0-60km, 60-120km, >120km. Computed by a background job that reruns when
+    machine, engineer or FSL data change; returns 202 until the first result.
+    """
+    wait = request.args.get('wait', 0, type=float)
+    
+    try:
+        data = service.get_coverage(wait=max(0.0, min(wait, MAX_WAIT_SECONDS)))
+        if "summary" not in data:
+            return jsonify(data), 500 if data["status"] == "failed" else 202
+        return jsonify(data), 200
+    except Exception as e:
+        print(f"[ERROR] Failed to get coverage: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@geo_bp.route('/geo/coverage/machines', methods=['GET'])
+def geo_coverage_machines():
+    """
+    GET: Per-machine nearest distances from the last coverage result
+    (?area_group=&bucket=0-60km|60-120km|>120km|unknown&target=engineer|fsl&page=1&per_page=50)
+    Worst covered machines first
+    """
+    area_group = request.args.get('area_group', '').strip()
+    bucket = request.args.get('bucket', '').strip()
+    target = request.args.get('target', 'engineer')
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 50, type=int)
+    
+    try:
+        machines = service.get_coverage_machines(area_group=area_group or None, bucket=bucket or None,
+                                                 target=target)
+        if machines is None:
+            return jsonify({"status": "running"}), 202
+        return jsonify(paginate_frame(machines, page, max(1, min(per_page, 500)))), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"[ERROR] Failed to get machine coverage: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@geo_bp.route('/geo/coverage/refresh', methods=['POST'])
+def geo_coverage_refresh():
+    """
+    POST: Recompute coverage in the background now
+    """
+    try:
+        service.refresh_coverage(force=True)
+        return jsonify({"status": "running"}), 202
+    except Exception as e:
+        print(f"[ERROR] Failed to start coverage job: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@geo_bp.route('/geo/assignment', methods=['GET'])
+def geo_assignment():
+    """
+    GET: Proposed machine-to-engineer assignment (?capacity=<max machines per engineer>&wait=<seconds>)
+    Minimizes total travel distance under engineer capacity. Computed by a
+    background job that reruns when machine/engineer data or capacity change;
+    returns 202 until the first result.
+    """
+    capacity = request.args.get('capacity', type=int)
+    wait = request.args.get('wait', 0, type=float)
+    
+    try:
+        data = assignment_service.get_assignment(capacity=capacity,
+                                                 wait=max(0.0, min(wait, MAX_WAIT_SECONDS)))
+        if "summary" not in data:
+            return jsonify(data), 500 if data["status"] == "failed" else 202
+        return jsonify(data), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"[ERROR] Failed to get assignment: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@geo_bp.route('/geo/assignment/machines', methods=['GET'])
+def geo_assignment_machines():
+    """
+    GET: Per-machine proposals from the last assignment result
+    (?engineer=<id or name>&reassigned=true&page=1&per_page=50)
+    """
+    engineer = request.args.get('engineer', '').strip()
+    reassigned = request.args.get('reassigned', 'false').lower() == 'true'
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 50, type=int)
+    
+    try:
+        machines = assignment_service.get_assignment_machines(engineer=engineer or None,
+                                                              reassigned_only=reassigned)
+        if machines is None:
+            return jsonify({"status": "running"}), 202
+        return jsonify(paginate_frame(machines, page, max(1, min(per_page, 500)))), 200
+    except Exception as e:
+        print(f"[ERROR] Failed to get assignment machines: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@geo_bp.route('/geo/assignment/refresh', methods=['POST'])
+def geo_assignment_refresh():
+    """
+    POST: Recompute the assignment in the background ({"capacity": <optional int>})
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        capacity = data.get('capacity')
+        assignment_service.refresh(capacity=int(capacity) if capacity is not None else None, force=True)
+        return jsonify({"status": "running"}), 202
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"[ERROR] Failed to start assignment job: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@geo_bp.route('/geo/province-centroids', methods=['GET'])
+def geo_province_centroids():
+    """
+    GET: Province centroid lookup used to locate machines without coordinates
+    """
+    try:
+        lookup = province_centroids.get_lookup()
+        data = [{"provinsi_key": key, "latitude": lat, "longitude": lng} for key, (lat, lng) in lookup.items()]
+        return jsonify(data), 200
+    except Exception as e:
+        print(f"[ERROR] Failed to get province centroids: {e}")
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,58 @@
+"""
+KPI API Routes
+Live engineer KPIs maintained incrementally from SO changes
+"""
+from flask import Blueprint, jsonify, request
+from backend.services.kpi_service import KPIService
+
+kpi_bp = Blueprint('kpi', __name__)
+service = KPIService()
+
+@kpi_bp.route('/kpi', methods=['GET'])
+def kpi_all():
+    """
+    GET: Retrieve live KPIs for all engineers
+    """
+    try:
+        data = service.get_all()
+        return jsonify(data), 200
+    except Exception as e:
+        print(f"[ERROR] Failed to get KPI data: {e}")
+        return jsonify({"error": "Internal server error processing KPI data"}), 500
+
+@kpi_bp.route('/kpi/<path:engineer>', methods=['GET'])
+def kpi_by_engineer(engineer):
+    """
+    GET: Retrieve live KPIs for one engineer (ce_id or engineer name)
+    """
+    try:
+        data = service.get_by_engineer(engineer)
+        return jsonify(data), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        print(f"[ERROR] Failed to get KPI for engineer: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@kpi_bp.route('/kpi/so-delta', methods=['POST'])
+def kpi_so_delta():
+    """
+    POST: Apply SO changes to the running KPI aggregates
+    Body:
+        {"upserts": [SO records], "deletes": [so_number, ...]}
+    Returns:
+        Affected engineers with their updated KPIs
+    """
+    try:
+        payload = request.get_json()
+        if not payload or not isinstance(payload, dict):
+            return jsonify({"error": "No data provided"}), 400
+        result = service.apply_so_delta(payload.get('upserts'), payload.get('deletes'))
+        return jsonify(result), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"[ERROR] Failed to apply SO delta: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
@@ -2,20 +2,30 @@
 Leveling API Routes
 Handles GET operations for leveling/assessment data
 """
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from backend.services.leveling_service import LevelingService
+from backend.utils.columnar import get_columnar_format
+from backend.utils.conditional import track_data_versions
+from backend.utils.response_cache import cached_json_response
 
 leveling_bp = Blueprint('leveling', __name__)
 service = LevelingService()
+track_data_versions(leveling_bp, service)
 
 @leveling_bp.route('/leveling', methods=['GET'])
 def leveling():
     """
-    GET: Retrieve all leveling data
+    GET: Retrieve all leveling data (?format=columns|dict returns column-oriented data)
     """
     try:
+        columnar = get_columnar_format(request)
+        if columnar:
+            return cached_json_response(service.get_data_version(),
+                                        lambda: service.get_columnar(dictionary=columnar == 'dict')), 200
         data = service.get_all()
         return jsonify(data), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except FileNotFoundError as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
@@ -1,19 +1,45 @@
 from flask import Blueprint, jsonify, request
-from backend.services.machine_service import MachineService
+from backend.services.machine_service import MachineService, ROLLUP_DIMENSIONS
+from backend.utils.columnar import get_columnar_format
+from backend.utils.arrow_utils import arrow_available, arrow_stream_response, wants_arrow
+from backend.utils.response_cache import cached_json_response
+from backend.utils.streaming import STREAM_BATCH_SIZE, get_stream_format, stream_records
+from backend.utils.conditional import track_data_versions
+from backend.utils.delta_sync import expose_change_version
 
 machine_bp = Blueprint('machines', __name__)
 service = MachineService()
+# Change versions restart with the process; the change log itself is in-memory state
+track_data_versions(machine_bp, service, service.get_change_epoch, exclude=('machine_changes',))
 
 @machine_bp.route('/machines', methods=['GET', 'POST'])
 def machines():
     """
     GET: Retrieve all machines
+         (?stream=ndjson|json or Accept: application/x-ndjson streams records in batches;
+          Accept: application/vnd.apache.arrow.stream or ?format=arrow returns an Arrow IPC stream;
+          ?format=columns|dict returns column-oriented data;
+          X-Change-Version is the cursor for /machines/changes)
     POST: Create new machine
     """
     if request.method == 'GET':
         try:
-            data = service.get_all()
-            return jsonify(data), 200
+            expose_change_version(service)
+            if wants_arrow(request):
+                if not arrow_available():
+                    return jsonify({"error": "Arrow output requires pyarrow on the server"}), 406
+                return arrow_stream_response(service.get_arrow_table()), 200
+            stream_format = get_stream_format(request)
+            if stream_format:
+                total, batches = service.get_record_batches(STREAM_BATCH_SIZE)
+                return stream_records(total, batches, stream_format), 200
+            columnar = get_columnar_format(request)
+            if columnar:
+                return cached_json_response(service.get_data_version(),
+                                            lambda: service.get_columnar(dictionary=columnar == 'dict')), 200
+            return cached_json_response(service.get_data_version(), service.get_all), 200
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         except FileNotFoundError as e:
             return jsonify({"error": str(e)}), 404
         except Exception as e:
@@ -42,6 +68,24 @@ def machines():
                 return jsonify({"error": "Tidak dapat menyimpan data. Pastikan file 'data_mesin.csv' tidak sedang dibuka di aplikasi lain (Excel, Notepad, dll) dan tutup aplikasi tersebut terlebih dahulu."}), 403
             return jsonify({"error": error_msg}), 500
 
+@machine_bp.route('/machines/changes', methods=['GET'])
+def machine_changes():
+    """
+    Get machines inserted, updated or deleted after ?since=<change version>
+    Start from the X-Change-Version header of GET /machines; reset=true means
+    the log no longer covers since and the full list must be refetched
+    """
+    try:
+        since = request.args.get('since', 0, type=int)
+        return jsonify(service.get_changes(since)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        print(f"[ERROR] Failed to get machine changes: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+
 @machine_bp.route('/machines/<wsid>', methods=['GET', 'PUT', 'DELETE'])
 def machine_by_id(wsid):
     """
@@ -89,4 +133,25 @@ def machine_stats():
         return jsonify(stats), 200
     except Exception as e:
         print(f"[ERROR] Failed to get machine stats: {e}")
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+@machine_bp.route('/machines/rollup', methods=['GET'])
+def machine_rollup():
+    """
+    GET: Machine counts from the precomputed rollup
+    (?group_by=region,machine_status&<dimension>=<value>, a dimension may repeat to accept several values)
+    Dimensions: region, area_group, provinsi, machine_status, machine_type
+    """
+    try:
+        group_by = [dim.strip() for dim in request.args.get('group_by', '').split(',') if dim.strip()]
+        # Other query params (cache busters, format, ...) are not filters
+        filters = {dim: request.args.getlist(dim) for dim in ROLLUP_DIMENSIONS if dim in request.args}
+        data = service.get_rollup(group_by=group_by, filters=filters)
+        return jsonify(data), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        print(f"[ERROR] Failed to get machine rollup: {e}")
+        return jsonify({"error": str(e)}), 500
@@ -1,8 +1,10 @@
 from flask import Blueprint, jsonify
 from backend.services.monthly_machine_service import MonthlyMachineService
+from backend.utils.conditional import track_data_versions
 
 monthly_machine_bp = Blueprint('monthly_machines', __name__)
 service = MonthlyMachineService()
+track_data_versions(monthly_machine_bp, service)
 
 @monthly_machine_bp.route('/monthly-machines', methods=['GET'])
 def get_monthly_machines():
@@ -0,0 +1,51 @@
+"""
+Search API Routes
+Typo-tolerant search over tool names, part numbers and baby parts
+"""
+from flask import Blueprint, jsonify, request
+from backend.services.tool_service import ToolService
+from backend.services.stock_service import StockPartService
+from backend.services.baby_part_service import BabyPartService
+from backend.utils.conditional import track_data_versions
+
+search_bp = Blueprint('search', __name__)
+services = {
+    'tools': ToolService(),
+    'stock-parts': StockPartService(),
+    'baby-parts': BabyPartService(),
+}
+track_data_versions(search_bp, *services.values())
+
+MAX_LIMIT = 50
+
+@search_bp.route('/search/fuzzy', methods=['GET'])
+def fuzzy_search():
+    """
+    GET: Fuzzy search (?q=<text>&scope=tools|stock-parts|baby-parts|all&limit=10)
+    Returns top-k matches with similarity scores (0-1), best first
+    """
+    query = request.args.get('q', '').strip()
+    scope = request.args.get('scope', 'all')
+    limit = request.args.get('limit', 10, type=int)
+    
+    if not query:
+        return jsonify({"error": "Query parameter 'q' is required"}), 400
+    if scope != 'all' and scope not in services:
+        return jsonify({"error": f"Invalid scope '{scope}'. Use one of: all, {', '.join(services)}"}), 400
+    limit = max(1, min(limit, MAX_LIMIT))
+    
+    try:
+        scopes = list(services) if scope == 'all' else [scope]
+        results = []
+        for name in scopes:
+            try:
+                matches = services[name].fuzzy_search(query, limit=limit)
+            except FileNotFoundError:
+                continue
+            results.extend({"scope": name, **match} for match in matches)
+        
+        results.sort(key=lambda item: -item["score"])
+        return jsonify({"query": query, "results": results[:limit]}), 200
+    except Exception as e:
+        print(f"[ERROR] Failed to run fuzzy search: {e}")
+        return jsonify({"error": str(e)}), 500
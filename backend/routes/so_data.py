@@ -1,8 +1,14 @@
 from flask import Blueprint, jsonify, request
 from backend.services.so_service import SOService
+from backend.utils.columnar import get_columnar_format
+from backend.utils.arrow_utils import arrow_available, arrow_stream_response, wants_arrow
+from backend.utils.response_cache import cached_json_response
+from backend.utils.streaming import STREAM_BATCH_SIZE, get_stream_format, stream_records
+from backend.utils.conditional import track_data_versions
 
 so_bp = Blueprint('so_data', __name__)
 service = SOService()
+track_data_versions(so_bp, service)
 
 @so_bp.route('/so-data', methods=['GET'])
 def get_so_data():
@@ -32,14 +38,37 @@ def get_raw_so_data():
     """
     GET: Retrieve raw SO records
     Note: Month filter tidak digunakan karena field Month kosong di CSV
+    Query params:
+        stream: "ndjson" or "json" to stream records in batches
+                (Accept: application/x-ndjson also selects NDJSON)
+        format: "arrow" for an Arrow IPC stream
+                (same as Accept: application/vnd.apache.arrow.stream),
+                "columns" or "dict" for column-oriented data
     Returns:
         List of raw SO records with all fields including customer, area_group, service_type
     """
     try:
+        if wants_arrow(request):
+            if not arrow_available():
+                return jsonify({"error": "Arrow output requires pyarrow on the server"}), 406
+            return arrow_stream_response(service.get_arrow_table()), 200
+        stream_format = get_stream_format(request)
+        if stream_format:
+            total, batches = service.get_record_batches(STREAM_BATCH_SIZE)
+            return stream_records(total, batches, stream_format, envelope='data'), 200
+        columnar = get_columnar_format(request)
+        if columnar:
+            return cached_json_response(service.get_data_version(),
+                                        lambda: service.get_columnar(dictionary=columnar == 'dict')), 200
+        
         # Get all raw SO data (field Month kosong di CSV, jadi tidak bisa filter by month)
-        all_data = service.get_all_so_data()
+        def build():
+            all_data = service.get_all_so_data()
+            return {'data': all_data, 'total': len(all_data)}
         
-        return jsonify({'data': all_data, 'total': len(all_data)}), 200
+        return cached_json_response(service.get_data_version(), build), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except FileNotFoundError as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
@@ -0,0 +1,105 @@
+"""
+Stock Movement API Routes
+Append-only stock ledger for tools and stock parts
+"""
+from flask import Blueprint, jsonify, request
+from backend.services.stock_ledger import stock_ledger
+from backend.services.tool_service import ToolService
+from backend.services.stock_service import StockPartService
+
+stock_movement_bp = Blueprint('stock_movements', __name__)
+services = {
+    'tools': ToolService(),
+    'stock-parts': StockPartService(),
+}
+
+@stock_movement_bp.route('/stock-movements', methods=['GET', 'POST'])
+def stock_movements():
+    """
+    GET: Movement history, newest first (?resource=&item=&fsl=&limit=100)
+    POST: Record a movement
+          {"resource": "tools"|"stock-parts", "item", "movement_type": "in"|"out"|"adjust",
+           "quantity", "bucket", "actor", "note", "fsl"}
+          Stock-part items are keyed "<part_number>@<fsl>"; fsl is required when the
+          part number is stocked in several FSLs (400 otherwise)
+    """
+    if request.method == 'GET':
+        try:
+            resource = request.args.get('resource') or None
+            item = request.args.get('item') or None
+            if item and request.args.get('fsl'):
+                item = services['stock-parts'].ledger_item(item, request.args['fsl'])
+            limit = request.args.get('limit', 100, type=int)
+            data = stock_ledger.get_movements(resource=resource, item=item, limit=limit)
+            return jsonify(data), 200
+        except Exception as e:
+            print(f"[ERROR] Failed to get stock movements: {e}")
+            return jsonify({"error": "Internal server error"}), 500
+    
+    elif request.method == 'POST':
+        try:
+            data = request.get_json()
+            if not data:
+                return jsonify({"error": "No data provided"}), 400
+            resource = data.get('resource')
+            if resource not in services:
+                return jsonify({"error": f"Invalid resource '{resource}'. Use one of: {', '.join(services)}"}), 400
+            if not data.get('item'):
+                return jsonify({"error": "item is required"}), 400
+            
+            result = services[resource].record_movement(
+                data['item'],
+                data.get('movement_type') or data.get('type', ''),
+                data.get('quantity'),
+                bucket=data.get('bucket'),
+                actor=str(data.get('actor', '')),
+                note=str(data.get('note', '')),
+                scope=data.get('fsl')
+            )
+            return jsonify(result), 201
+        except FileNotFoundError as e:
+            return jsonify({"error": str(e)}), 404
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        except Exception as e:
+            print(f"[ERROR] Failed to record stock movement: {e}")
+            return jsonify({"error": str(e)}), 500
+
+@stock_movement_bp.route('/stock-movements/current/<resource>/<path:item>', methods=['GET'])
+def current_stock(resource, item):
+    """
+    GET: Current stock of an item (CSV balance plus movements since the last checkpoint;
+         ?fsl= selects the FSL of a part stocked in several)
+    """
+    if resource not in services:
+        return jsonify({"error": f"Invalid resource '{resource}'"}), 404
+    try:
+        return jsonify(services[resource].get_current_stock(item, scope=request.args.get('fsl'))), 200
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        print(f"[ERROR] Failed to get current stock: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@stock_movement_bp.route('/stock-movements/checkpoint', methods=['POST'])
+def checkpoint():
+    """
+    POST: Fold pending movements into stock_detail.csv / stok_part.csv
+          (optional {"resource": ...}; default all)
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        resource = data.get('resource')
+        if resource and resource not in services:
+            return jsonify({"error": f"Invalid resource '{resource}'"}), 400
+        names = [resource] if resource else list(services)
+        result = {name: services[name].checkpoint_stock() for name in names}
+        return jsonify(result), 200
+    except PermissionError as e:
+        print(f"[ERROR] Permission denied when checkpointing stock: {e}")
+        return jsonify({"error": str(e)}), 403
+    except Exception as e:
+        print(f"[ERROR] Failed to checkpoint stock: {e}")
+        return jsonify({"error": str(e)}), 500
@@ -1,48 +1,46 @@
-from flask import Blueprint, jsonify, request
+import json
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from backend.services.stock_alerts import stock_alerts
 from backend.services.stock_service import StockPartService
+from backend.utils.conditional import track_data_versions
+from backend.utils.data_cache import get_file_version
+from backend.utils.delta_sync import expose_change_version
 
 stock_part_bp = Blueprint('stock_parts', __name__)
 service = StockPartService()
+# Low-stock views also depend on the reorder thresholds; alerts and the change log
+# are in-memory state, and change versions restart with the process
+track_data_versions(stock_part_bp, service, lambda: get_file_version(stock_alerts.thresholds_path),
+                    service.get_change_epoch,
+                    exclude=('stock_part_alerts', 'stock_part_alert_stream', 'stock_part_changes'))
 
 @stock_part_bp.route('/stock-parts', methods=['GET', 'POST'])
 def stock_parts():
     """
     GET: Retrieve all stock parts with optional filtering and pagination
+         (?search=&fsl=&region=&sort_by=<column>&order=asc|desc&page=&per_page=;
+          X-Change-Version is the cursor for /stock-parts/changes)
     POST: Create new stock part
     """
     if request.method == 'GET':
         try:
-            # Get query parameters
-            page = request.args.get('page', type=int)
-            per_page = request.args.get('per_page', type=int)
-            search = request.args.get('search', '')
-            fsl = request.args.get('fsl', '')
-            region = request.args.get('region', '')
-            
-            # Get all data
-            data = service.get_all()
-            
-            # Apply filters
-            if search:
-                from backend.utils.helpers import search_dict_list
-                data = search_dict_list(data, search, ['part_number', 'part_name', 'fsl'])
-            
-            if fsl:
-                data = [item for item in data if item.get('fsl') == fsl]
-            
-            if region:
-                data = [item for item in data if item.get('region') == region]
-            
-            # Apply pagination if requested
-            if page and per_page:
-                from backend.utils.helpers import paginate
-                result = paginate(data, page, per_page)
-                return jsonify(result), 200
-            
+            expose_change_version(service)
+            # Filtering, sorting and paging run on the cached frame
+            data = service.query(
+                search=request.args.get('search', ''),
+                fsl=request.args.get('fsl', ''),
+                region=request.args.get('region', ''),
+                sort_by=request.args.get('sort_by') or None,
+                descending=request.args.get('order', 'asc').lower() == 'desc',
+                page=request.args.get('page', type=int),
+                per_page=request.args.get('per_page', type=int)
+            )
             return jsonify(data), 200
             
         except FileNotFoundError as e:
             return jsonify({"error": str(e)}), 404
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         except Exception as e:
             print(f"[ERROR] Failed to get stock parts: {e}")
             return jsonify({"error": "Internal server error"}), 500
@@ -60,6 +58,24 @@ def stock_parts():
             print(f"[ERROR] Failed to create stock part: {e}")
             return jsonify({"error": str(e)}), 500
 
+@stock_part_bp.route('/stock-parts/changes', methods=['GET'])
+def stock_part_changes():
+    """
+    Get stock parts inserted, updated or deleted after ?since=<change version>
+    Start from the X-Change-Version header of GET /stock-parts; reset=true means
+    the log no longer covers since and the full list must be refetched
+    """
+    try:
+        since = request.args.get('since', 0, type=int)
+        return jsonify(service.get_changes(since)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        print(f"[ERROR] Failed to get stock part changes: {e}")
+        return jsonify({"error": "Internal server error"}), 500
+
 @stock_part_bp.route('/stock-parts/<part_number>', methods=['GET', 'PUT', 'DELETE'])
 def stock_part_by_number(part_number):
     """
@@ -138,11 +154,13 @@ def stock_part_stats():
 @stock_part_bp.route('/stock-parts/low-stock', methods=['GET'])
 def low_stock_parts():
     """
-    Get parts with low stock (below threshold)
+    Get parts with low stock (below threshold), lowest first
+    Optional ?fsl= answers from that FSL's partition only
     """
     try:
         threshold = request.args.get('threshold', 10, type=int)
-        low_stock = service.get_low_stock_parts(threshold)
+        fsl = request.args.get('fsl') or None
+        low_stock = service.get_low_stock_parts(threshold, fsl=fsl)
         return jsonify(low_stock), 200
     except Exception as e:
         print(f"[ERROR] Failed to get low stock parts: {e}")
@@ -160,4 +178,107 @@ def stock_parts_by_fsl(fsl_name):
         return jsonify({"error": str(e)}), 404
     except Exception as e:
         print(f"[ERROR] Failed to get parts by FSL: {e}")
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+@stock_part_bp.route('/stock-parts/fsl', methods=['GET'])
+def stock_parts_fsl_summary():
+    """
+    Get part count, total quantity and low-stock count per FSL (?threshold=10)
+    """
+    try:
+        threshold = request.args.get('threshold', 10, type=int)
+        return jsonify(service.get_fsl_summary(threshold)), 200
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        print(f"[ERROR] Failed to get FSL stock summary: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@stock_part_bp.route('/stock-parts/fsl/<path:fsl_name>', methods=['GET'])
+def stock_parts_fsl(fsl_name):
+    """
+    Get one FSL's stock summary and parts from its partition (?threshold=10)
+    """
+    try:
+        threshold = request.args.get('threshold', 10, type=int)
+        return jsonify(service.get_fsl_stock(fsl_name, threshold)), 200
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        print(f"[ERROR] Failed to get FSL stock: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@stock_part_bp.route('/stock-parts/thresholds', methods=['GET', 'PUT'])
+def stock_part_thresholds():
+    """
+    GET: Reorder thresholds ({"default", "fsl": {...}, "part": {...}})
+    PUT: Set a threshold {"scope": "part"|"fsl"|"default", "key", "threshold"}
+         (threshold null removes a part/FSL threshold)
+    """
+    if request.method == 'GET':
+        try:
+            return jsonify(service.get_thresholds()), 200
+        except Exception as e:
+            print(f"[ERROR] Failed to get stock thresholds: {e}")
+            return jsonify({"error": str(e)}), 500
+    
+    elif request.method == 'PUT':
+        try:
+            data = request.get_json()
+            if not data:
+                return jsonify({"error": "No data provided"}), 400
+            result = service.set_threshold(data.get('scope', ''), data.get('key'), data.get('threshold'))
+            return jsonify(result), 200
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        except PermissionError as e:
+            print(f"[ERROR] Permission denied when saving stock thresholds: {e}")
+            return jsonify({"error": str(e)}), 403
+        except Exception as e:
+            print(f"[ERROR] Failed to set stock threshold: {e}")
+            return jsonify({"error": str(e)}), 500
+
+@stock_part_bp.route('/stock-parts/alerts', methods=['GET'])
+def stock_part_alerts():
+    """
+    Get low-stock/restocked alerts newer than ?since=<alert id> (oldest first)
+    """
+    try:
+        since = request.args.get('since', 0, type=int)
+        limit = request.args.get('limit', type=int)
+        return jsonify(service.get_alerts(since, limit)), 200
+    except Exception as e:
+        print(f"[ERROR] Failed to get stock alerts: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@stock_part_bp.route('/stock-parts/alerts/stream', methods=['GET'])
+def stock_part_alert_stream():
+    """
+    Server-sent events stream of stock alerts
+    Resumes after Last-Event-ID (or ?since=); otherwise sends only new alerts
+    """
+    since = request.headers.get('Last-Event-ID', type=int)
+    if since is None:
+        since = request.args.get('since', type=int)
+    if since is None:
+        since = service.get_alerts(limit=0)["last_id"]
+    
+    def generate(last_id):
+        yield "retry: 5000\n\n"
+        while True:
+            alerts = service.wait_for_alerts(last_id, timeout=15)
+            if not alerts:
+                # Keep-alive comment so proxies don't drop the connection
+                yield ": keep-alive\n\n"
+                continue
+            for alert in alerts:
+                last_id = alert["id"]
+                yield f"id: {last_id}\nevent: stock_alert\ndata: {json.dumps(alert, default=str)}\n\n"
+    
+    return Response(
+        stream_with_context(generate(since)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
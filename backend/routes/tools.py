@@ -5,40 +5,47 @@ Handles CRUD operations for tools inventory
 from flask import Blueprint, jsonify, request
 from urllib.parse import unquote
 from backend.services.tool_service import ToolService
+from backend.utils.conditional import track_data_versions
+from backend.utils.response_utils import (
+    PROFILE_COMPACT,
+    get_response_profile,
+    parse_fields,
+    profile_header
+)
 
 tool_bp = Blueprint('tools', __name__)
 service = ToolService()
+track_data_versions(tool_bp, service)
 
 @tool_bp.route('/tools', methods=['GET', 'POST'])
 def tools():
     """
     GET: Retrieve all tools with optional filtering and pagination
+         (?profile=compact or Accept: application/vnd.rocdashboard.v2+json
+         returns each field once; fields=a,b projects columns)
     POST: Create new tool
     """
     if request.method == 'GET':
+        profile = get_response_profile(request)
         try:
             # Get query parameters
             page = request.args.get('page', type=int)
             per_page = request.args.get('per_page', type=int)
             search = request.args.get('search', '')
             
-            # Get all data
-            data = service.get_all()
+            if profile == PROFILE_COMPACT:
+                fields = parse_fields(request.args.get('fields'), service.COMPACT_COLUMNS)
+                data = service.get_all_compact(fields=fields, search=search)
+                if page and per_page:
+                    from backend.utils.helpers import paginate
+                    data = paginate(data, page, per_page)
+                response = jsonify(data)
+                response.headers['X-API-Profile'] = profile_header(profile)
+                response.vary.add('Accept')
+                return response, 200
             
-            # Apply search filter
-            if search:
-                from backend.utils.helpers import search_dict_list
-                # Search in: tools_name, description, stock_detail, remark
-                data = search_dict_list(data, search, [
-                    'tools_name', 
-                    'Part Name', 
-                    'TOOLS NAME', 
-                    'description', 
-                    'stock_detail', 
-                    'Detail Specification',
-                    'remark',
-                    'Remark'
-                ])
+            # Get all data (search uses the ranked token/trigram index)
+            data = service.search(search) if search else service.get_all()
             
             # Apply pagination if requested
             if page and per_page:
@@ -53,6 +60,8 @@ def tools():
             import traceback
             traceback.print_exc()
             return jsonify([]), 200  # Return empty array instead of error object
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         except Exception as e:
             import traceback
             print(f"[ERROR] Failed to get tools: {e}")
@@ -123,7 +132,8 @@ def tool_by_name(tools_name):
             updated_tool = request.get_json()
             if not updated_tool:
                 return jsonify({"error": "No data provided"}), 400
-            result = service.update_by_tools_name(tools_name, updated_tool)
+            result = service.update_by_tools_name(tools_name, updated_tool,
+                                                  actor=str(updated_tool.get('actor', '')))
             
             # Check if no changes were detected
             if result.get("no_changes"):
@@ -0,0 +1,246 @@
+"""
+Assignment Service - Machine-to-engineer assignment optimizer
+Proposes assignments minimizing total travel distance under per-engineer
+capacity; runs as a background job and caches the last result
+"""
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from backend.services.engineer_service import EngineerService
+from backend.services.geo_service import COVERAGE_BUCKETS
+from backend.services.machine_service import MachineService, machine_coordinates
+from backend.utils.assignment import assign_with_capacity
+from backend.utils.background_job import BackgroundJob
+from backend.utils.geo_utils import coordinate_arrays, find_coordinate_columns, haversine_km, nearest_k_points
+
+# Nearest engineers considered per machine
+CANDIDATES_PER_MACHINE = 16
+# Default capacity = machines per engineer (on average) times this slack
+DEFAULT_CAPACITY_SLACK = 1.2
+
+
+class AssignmentService:
+    """Business logic for the machine-to-engineer assignment optimizer"""
+
+    def __init__(self, machine_service: Optional[MachineService] = None,
+                 engineer_service: Optional[EngineerService] = None):
+        self.machine_service = machine_service or MachineService()
+        self.engineer_service = engineer_service or EngineerService()
+        self._job = BackgroundJob("assignment-optimizer", self.compute_assignment)
+
+    def _job_key(self, capacity: Optional[int]) -> Tuple[Any, Any, Optional[int]]:
+        return (self.machine_service.get_data_version(), self.engineer_service.get_data_version(), capacity)
+
+    @staticmethod
+    def _located(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Get coordinates and valid mask of a frame (all invalid if no coordinate columns)"""
+        columns = find_coordinate_columns(df)
+        if columns is None:
+            return np.full(len(df), np.nan), np.full(len(df), np.nan), np.zeros(len(df), dtype=bool)
+        return coordinate_arrays(df[columns[0]], df[columns[1]])
+
+    @staticmethod
+    def _text(df: pd.DataFrame, col: str) -> pd.Series:
+        if col not in df.columns:
+            return pd.Series("", index=df.index)
+        return df[col].astype(str).str.strip()
+
+    @staticmethod
+    def _zona(distances: np.ndarray) -> np.ndarray:
+        """Distance zone (1-based index of COVERAGE_BUCKETS), NaN for unknown distances"""
+        bounds = np.array([limit for _, limit in COVERAGE_BUCKETS[:-1]])
+        zona = np.searchsorted(bounds, distances, side="left") + 1.0
+        return np.where(np.isnan(distances), np.nan, zona)
+
+    def compute_assignment(self, capacity: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Propose machine-to-engineer assignments
+
+        Cost is the great-circle distance between machine and engineer. Each
+        machine considers its CANDIDATES_PER_MACHINE nearest engineers (see
+        assign_with_capacity). Engineer capacity comes from a capacity column in
+        data_ce.csv when present, else from the capacity argument, else from
+        the average load times DEFAULT_CAPACITY_SLACK. Machines only placed at
+        their province centroid get no proposal (summary "approximate").
+
+        Args:
+            capacity: Maximum machines per engineer
+
+        Returns:
+            Dictionary with computed_at, capacity, summary, engineers and
+            machines (DataFrame, one row per machine)
+
+        Raises:
+            FileNotFoundError: If machine or engineer data doesn't exist
+            ValueError: If no engineer has a valid location
+        """
+        machines = self.machine_service._get_cached_dataframe()
+        engineers = self.engineer_service._get_cached_dataframe()
+        m_lat, m_lng, m_valid, m_approximate = machine_coordinates(machines)
+        e_lat, e_lng, e_valid = self._located(engineers)
+        engineers = engineers[e_valid]
+        e_lat, e_lng = e_lat[e_valid], e_lng[e_valid]
+        if not len(engineers):
+            raise ValueError("No engineer has a valid location")
+
+        located = np.flatnonzero(m_valid)
+        if capacity is None:
+            capacity = max(1, int(np.ceil(len(located) / len(engineers) * DEFAULT_CAPACITY_SLACK)))
+        capacities = np.full(len(engineers), capacity, dtype=np.int64)
+        if "capacity" in engineers.columns:
+            own = pd.to_numeric(engineers["capacity"], errors="coerce").to_numpy()
+            capacities = np.where(own > 0, own, capacities).astype(np.int64)
+
+        candidates, costs = nearest_k_points(m_lat[located], m_lng[located], e_lat, e_lng,
+                                             k=CANDIDATES_PER_MACHINE)
+        assigned, proposed_km = assign_with_capacity(
+            candidates, costs, capacities,
+            fallback_costs=lambda row: haversine_km(m_lat[located[row]], m_lng[located[row]], e_lat, e_lng),
+        )
+
+        engineer_ids = self._text(engineers, self.engineer_service.primary_key).to_numpy()
+        engineer_names = self._text(engineers, "name").to_numpy()
+        proposed = np.full(len(machines), -1, dtype=np.int64)
+        proposed[located] = assigned
+        distances = np.full(len(machines), np.nan)
+        distances[located] = proposed_km
+        has_proposal = proposed >= 0
+
+        # Current assignment: engineer_name column matched to engineer names
+        name_index = {name.casefold(): i for i, name in enumerate(engineer_names) if name}
+        current = self._text(machines, "engineer_name").str.casefold().map(name_index)
+        current = current.fillna(-1).astype(np.int64).to_numpy()
+        has_current = (current >= 0) & m_valid
+        current_km = np.full(len(machines), np.nan)
+        current_km[has_current] = haversine_km(m_lat[has_current], m_lng[has_current],
+                                               e_lat[current[has_current]], e_lng[current[has_current]])
+
+        zona = pd.to_numeric(machines["zona"], errors="coerce").to_numpy() if "zona" in machines.columns \
+            else np.full(len(machines), np.nan)
+        proposed_zona = self._zona(distances)
+        reassigned = has_current & has_proposal & (current != proposed)
+
+        result_machines = pd.DataFrame({
+            "wsid": self._text(machines, self.machine_service.primary_key).to_numpy(),
+            "area_group": self._text(machines, "area_group").to_numpy(),
+            "zona": zona,
+            "current_engineer": np.where(has_current, engineer_names[np.maximum(current, 0)], None),
+            "current_km": np.round(current_km, 3),
+            "proposed_engineer_id": np.where(has_proposal, engineer_ids[np.maximum(proposed, 0)], None),
+            "proposed_engineer": np.where(has_proposal, engineer_names[np.maximum(proposed, 0)], None),
+            "proposed_km": np.round(distances, 3),
+            "proposed_zona": proposed_zona,
+            "reassigned": reassigned,
+        })
+        result_machines = result_machines.astype(object).where(result_machines.notna(), None)
+
+        loads = np.bincount(assigned[assigned >= 0], minlength=len(engineers))
+        load_km = np.bincount(assigned[assigned >= 0], weights=proposed_km[assigned >= 0],
+                              minlength=len(engineers))
+        engineer_rows = pd.DataFrame({
+            "id": engineer_ids,
+            "name": engineer_names,
+            "load": loads,
+            "capacity": capacities,
+            "total_km": np.round(load_km, 2),
+            "avg_km": np.round(load_km / np.maximum(loads, 1), 2),
+        }).sort_values(["load", "total_km"], ascending=False, kind="stable")
+
+        compared = has_current & has_proposal
+        with np.errstate(invalid="ignore"):
+            zona_known = compared & ~np.isnan(zona)
+            summary = {
+                "machines": len(machines),
+                "located": len(located),
+                "approximate": int(m_approximate.sum()),
+                "assigned": int(has_proposal.sum()),
+                "unassigned": int(len(located) - has_proposal.sum()),
+                "total_km": round(float(np.nansum(distances)), 2),
+                "avg_km": round(float(np.nanmean(distances)), 2) if has_proposal.any() else None,
+                "compared": int(compared.sum()),
+                "current_km": round(float(current_km[compared].sum()), 2),
+                "proposed_km": round(float(distances[compared].sum()), 2),
+                "reassigned": int(reassigned.sum()),
+                "zona_improved": int((proposed_zona[zona_known] < zona[zona_known]).sum()),
+                "zona_worsened": int((proposed_zona[zona_known] > zona[zona_known]).sum()),
+            }
+
+        return {
+            "computed_at": datetime.now().isoformat(timespec="seconds"),
+            "capacity": capacity,
+            "summary": summary,
+            "engineers": engineer_rows.to_dict(orient="records"),
+            "machines": result_machines,
+        }
+
+    def refresh(self, capacity: Optional[int] = None, force: bool = False) -> bool:
+        """
+        Start the optimizer job if the result is missing or stale
+
+        Args:
+            capacity: Maximum machines per engineer (None = automatic)
+            force: Start even if the stored result is current
+
+        Returns:
+            True if a job is running after the call
+
+        Raises:
+            ValueError: If capacity is not positive
+        """
+        if capacity is not None and capacity <= 0:
+            raise ValueError("capacity must be positive")
+        return self._job.refresh(self._job_key(capacity), capacity, force=force)
+
+    def get_assignment(self, capacity: Optional[int] = None, wait: float = 0) -> Dict[str, Any]:
+        """
+        Get the last proposed assignment, recomputing it in the background when
+        data or capacity changed
+
+        Args:
+            capacity: Maximum machines per engineer (None = automatic)
+            wait: Seconds to wait for a running job before answering
+
+        Returns:
+            Dictionary with status, stale flag, and capacity/summary/engineers
+            once a result exists
+        """
+        self.refresh(capacity)
+        job = self._job.snapshot(wait)
+        data: Dict[str, Any] = {"status": job["status"]}
+        if job["error"]:
+            data["error"] = job["error"]
+        result = job["result"]
+        if result is not None:
+            data.update({
+                "stale": job["key"] != self._job_key(capacity),
+                "computed_at": result["computed_at"],
+                "capacity": result["capacity"],
+                "summary": result["summary"],
+                "engineers": result["engineers"],
+            })
+        return data
+
+    def get_assignment_machines(self, engineer: Optional[str] = None,
+                                reassigned_only: bool = False) -> Optional[pd.DataFrame]:
+        """
+        Get per-machine proposals from the last result
+
+        Args:
+            engineer: Filter by proposed engineer (id or name)
+            reassigned_only: Only machines whose proposed engineer differs
+
+        Returns:
+            DataFrame of machines, or None if no result yet
+        """
+        result = self._job.snapshot()["result"]
+        if result is None:
+            return None
+        machines = result["machines"]
+        mask = np.ones(len(machines), dtype=bool)
+        if engineer:
+            mask &= ((machines["proposed_engineer_id"] == engineer) |
+                     (machines["proposed_engineer"] == engineer)).to_numpy()
+        if reassigned_only:
+            mask &= (machines["reassigned"] == True).to_numpy()  # noqa: E712
+        return machines[mask]
@@ -3,14 +3,21 @@ Baby Part Service - Manages baby parts inventory data
 Handles CRUD operations for baby_part.csv
 """
 import os
-import unicodedata
 from backend.services.base_service import BaseService
-from typing import Dict, Any
+from backend.utils.name_index import NameIndex, normalize_name
+from backend.utils.csv_utils import text_column, int_column
+from typing import Dict, Any, Tuple
 import pandas as pd
 
 class BabyPartService(BaseService):
     """Service for managing baby parts inventory"""
     
+    # Output columns of get_all(), including legacy CSV-named duplicates
+    NORMALIZED_COLUMNS = ("id", "baby_parts", "qty", "Baby Parts", "Qty")
+    
+    SEARCH_FIELDS = ("baby_parts",)
+    FUZZY_FIELDS = ("baby_parts",)
+    
     def __init__(self):
         super().__init__(
             file_name="baby_part.csv",
@@ -62,85 +69,98 @@ class BabyPartService(BaseService):
         except (ValueError, TypeError):
             return 0
     
+    def _get_search_records(self) -> list[Dict[str, Any]]:
+        """
+        Get normalized records (shared, must not be modified)
+        
+        Returns:
+            List of records, cached per file version
+        """
+        def build() -> list[Dict[str, Any]]:
+            return self._get_normalized_frame().to_dict(orient="records")
+        
+        return self._cache.get("normalized_records", self.get_data_version(), build)
+    
     def get_all(self) -> list[Dict[str, Any]]:
         """
         Get all baby parts with normalized data
         
+        Records are built once per file version and shared between requests,
+        so callers must not modify them.
+        
         Returns:
             List of baby parts as dictionaries
         """
         try:
-            df = self._get_dataframe()
-            print(f"[DEBUG BabyPartService] DataFrame shape: {df.shape}")
-            print(f"[DEBUG BabyPartService] DataFrame columns: {df.columns.tolist()}")
-            print(f"[DEBUG BabyPartService] First few rows:\n{df.head()}")
+            return self._get_search_records()
         except Exception as e:
-            print(f"[ERROR BabyPartService] Failed to get dataframe: {e}")
+            print(f"[ERROR BabyPartService] Failed to load baby parts: {e}")
             import traceback
             traceback.print_exc()
             return []
+    
+    def _find_columns(self, df: pd.DataFrame) -> Tuple[str, str]:
+        """
+        Find the Baby Parts and Qty columns, with positional fallbacks
         
-        # Find the baby parts column
+        Args:
+            df: Baby parts DataFrame
+            
+        Returns:
+            Tuple of (baby_parts column, qty column)
+        """
         baby_parts_col = "baby_parts"
         if baby_parts_col not in df.columns:
             possible_names = [col for col in df.columns if 'baby' in col.lower() and 'part' in col.lower()]
             if possible_names:
                 baby_parts_col = possible_names[0]
-                print(f"[DEBUG BabyPartService] Found baby_parts column: {baby_parts_col}")
             else:
                 # Fallback to first column
                 baby_parts_col = df.columns[0] if len(df.columns) > 0 else "baby_parts"
-                print(f"[DEBUG BabyPartService] Using fallback baby_parts column: {baby_parts_col}")
-        else:
-            print(f"[DEBUG BabyPartService] Using standard baby_parts column: {baby_parts_col}")
         
-        # Find the qty column
         qty_col = "qty"
         if qty_col not in df.columns:
             possible_names = [col for col in df.columns if 'qty' in col.lower() or 'quantity' in col.lower()]
             if possible_names:
                 qty_col = possible_names[0]
-                print(f"[DEBUG BabyPartService] Found qty column: {qty_col}")
             else:
                 # Fallback to second column if exists
                 qty_col = df.columns[1] if len(df.columns) > 1 else "qty"
-                print(f"[DEBUG BabyPartService] Using fallback qty column: {qty_col}")
-        else:
-            print(f"[DEBUG BabyPartService] Using standard qty column: {qty_col}")
-        
-        # Filter out empty rows
-        if baby_parts_col in df.columns:
-            df = df[df[baby_parts_col].notna()]
-            df = df[df[baby_parts_col].astype(str).str.strip() != '']
-        else:
-            print(f"[ERROR BabyPartService] Column {baby_parts_col} not found in dataframe!")
-            return []
         
-        print(f"[DEBUG BabyPartService] After filtering, DataFrame shape: {df.shape}")
+        return baby_parts_col, qty_col
+    
+    def _get_normalized_frame(self) -> pd.DataFrame:
+        """
+        Get baby parts frame with normalized output columns, built with
+        vectorized column operations once per baby_part.csv version
         
-        # Normalize data
-        normalized = []
-        for idx, row in df.iterrows():
-            try:
-                baby_part_name = str(row.get(baby_parts_col, "")).strip()
-                if not baby_part_name:
-                    continue
-                
-                qty = self._parse_number(row.get(qty_col, 0))
-                
-                normalized.append({
-                    "id": baby_part_name,
-                    "baby_parts": baby_part_name,
-                    "qty": qty,
-                    "Baby Parts": baby_part_name,  # Original column name for compatibility
-                    "Qty": qty,  # Original column name for compatibility
-                })
-            except Exception as e:
-                print(f"[WARNING BabyPartService] Error processing row {idx}: {e}")
-                continue
-        
-        print(f"[DEBUG BabyPartService] Returning {len(normalized)} normalized baby parts")
-        return normalized
+        Returns:
+            DataFrame with one row per baby part (shared, must not be modified)
+        """
+        def build() -> pd.DataFrame:
+            df = self._get_cached_dataframe()
+            baby_parts_col, qty_col = self._find_columns(df)
+            if baby_parts_col not in df.columns:
+                print(f"[ERROR BabyPartService] Column {baby_parts_col} not found in dataframe!")
+                return pd.DataFrame(columns=list(self.NORMALIZED_COLUMNS))
+            
+            # Filter out empty rows
+            name = text_column(df, baby_parts_col)
+            keep = name != ""
+            qty = int_column(df[keep], qty_col)
+            name = name[keep]
+            
+            normalized = pd.DataFrame({
+                "id": name,
+                "baby_parts": name,
+                "qty": qty,
+                "Baby Parts": name,  # Original column name for compatibility
+                "Qty": qty,  # Original column name for compatibility
+            }, columns=list(self.NORMALIZED_COLUMNS))
+            print(f"[INFO] Normalized {len(normalized)} baby part records")
+            return normalized
+        
+        return self._cache.get("normalized_frame", self.get_data_version(), build)
     
     def _get_original_column_mapping(self) -> Dict[str, str]:
         """
@@ -287,47 +307,17 @@ class BabyPartService(BaseService):
         Raises:
             ValueError: If baby part not found
         """
-        df = self._get_dataframe()
-
-        baby_parts_col = "baby_parts"
-        if baby_parts_col not in df.columns:
-            possible_names = [col for col in df.columns if 'baby' in col.lower() and 'part' in col.lower()]
-            if possible_names:
-                baby_parts_col = possible_names[0]
-            else:
-                raise ValueError(f"Baby Parts column not found in data. Available columns: {list(df.columns)}")
-
-        df = df[df[baby_parts_col].notna()]
-        df = df[df[baby_parts_col].astype(str).str.strip() != '']
-
-        # Normalize for comparison: strip whitespace, normalize unicode, and convert to string
-        search_name = str(baby_part_name).strip()
-        # Normalize unicode characters (handles different unicode representations)
-        search_name_normalized = unicodedata.normalize('NFKC', search_name)
-        
-        # Normalize all baby part names in dataframe for comparison
-        df['_normalized_baby_part_name'] = df[baby_parts_col].astype(str).str.strip().apply(
-            lambda x: unicodedata.normalize('NFKC', x) if pd.notna(x) else ''
-        )
-        
-        # Try exact match first (case-sensitive, but normalized)
-        matching = df[df['_normalized_baby_part_name'] == search_name_normalized]
+        df = self._get_cached_dataframe()
+        baby_parts_col = self._get_lookup_column(df)
         
-        # If not found, try case-insensitive match
-        if matching.empty:
-            matching = df[df['_normalized_baby_part_name'].str.lower() == search_name_normalized.lower()]
-        
-        # Debug: print available baby part names if not found
-        if matching.empty:
-            available_names = df[baby_parts_col].astype(str).str.strip().tolist()[:10]  # First 10 for debugging
-            available_normalized = df['_normalized_baby_part_name'].tolist()[:10]
-            print(f"[DEBUG BabyPartService] Baby part '{search_name}' (normalized: '{search_name_normalized}') not found.")
-            print(f"[DEBUG BabyPartService] Available names (first 10): {available_names}")
-            print(f"[DEBUG BabyPartService] Available normalized (first 10): {available_normalized}")
+        search_name = str(baby_part_name).strip()
+        idx = self._get_name_index().lookup(search_name)
+        if idx is None:
+            print(f"[DEBUG BabyPartService] Baby part '{search_name}' (normalized: '{normalize_name(search_name)}') not found.")
             raise ValueError(f"Baby part with name '{search_name}' not found")
         
         # Get the baby part data
-        baby_part = matching.to_dict(orient="records")[0]
+        baby_part = df.loc[idx].to_dict()
         part_name = str(baby_part.get(baby_parts_col, "")).strip()
         
         # Find qty column
@@ -350,6 +340,39 @@ class BabyPartService(BaseService):
             "Qty": qty,
         }
     
+    def _get_lookup_column(self, df: pd.DataFrame) -> str:
+        """
+        Find the Baby Parts column used for lookups
+        
+        Args:
+            df: Baby parts DataFrame
+            
+        Returns:
+            Column name
+            
+        Raises:
+            ValueError: If no Baby Parts column exists
+        """
+        if "baby_parts" in df.columns:
+            return "baby_parts"
+        possible_names = [col for col in df.columns if 'baby' in col.lower() and 'part' in col.lower()]
+        if possible_names:
+            return possible_names[0]
+        raise ValueError(f"Baby Parts column not found in data. Available columns: {list(df.columns)}")
+    
+    def _get_name_index(self) -> NameIndex:
+        """
+        Get NFKC-normalized, casefolded Baby Parts name index, rebuilt only when baby_part.csv changes
+        
+        Returns:
+            NameIndex over the Baby Parts column
+        """
+        def build() -> NameIndex:
+            df = self._get_cached_dataframe()
+            return NameIndex(df[self._get_lookup_column(df)])
+        
+        return self._cache.get("name_index", self.get_data_version(), build)
+    
     def update_by_baby_part_name(self, baby_part_name: str, updated_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Update baby part by name
@@ -4,15 +4,28 @@ Provides common CRUD operations that can be reused by all service classes
 """
 import os
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Callable, Optional
+from contextlib import contextmanager
+from typing import Dict, List, Any, Callable, Iterator, Optional, Tuple
 import pandas as pd
 from config import Config
+from backend.utils.arrow_utils import frame_to_arrow
+from backend.utils.columnar import frame_to_columns
 from backend.utils.csv_utils import read_csv_normalized
+from backend.utils.data_cache import get_file_version, VersionedCache
+from backend.utils.search_index import SearchIndex
+from backend.utils.fuzzy_index import FuzzyIndex
+from backend.services.change_log import ChangeLog
 
 
 class BaseService(ABC):
     """Base service class for CSV-based data operations"""
     
+    # Fields covered by search(), most important first
+    SEARCH_FIELDS: tuple = ()
+    
+    # Name fields covered by fuzzy_search()
+    FUZZY_FIELDS: tuple = ()
+    
     def __init__(self, file_name: str, primary_key: str, entity_name: str):
         """
         Initialize base service
@@ -25,10 +38,42 @@ class BaseService(ABC):
         self.file_path = os.path.join(Config.DATA_DIR, file_name)
         self.primary_key = primary_key
         self.entity_name = entity_name
+        self._cache = VersionedCache()
+        self._change_log = ChangeLog()
     
-    def _get_dataframe(self) -> pd.DataFrame:
+    def get_data_version(self) -> Any:
         """
-        Get normalized dataframe from CSV file
+        Get version stamp of the backing CSV file
+        
+        Returns:
+            Tuple of (mtime_ns, size), or None if the file doesn't exist
+        """
+        return get_file_version(self.file_path)
+    
+    def get_data_files(self) -> List[str]:
+        """
+        Get paths of the files the data is read from
+        
+        Returns:
+            List of file paths
+        """
+        return [self.file_path]
+    
+    def _load_dataframe(self) -> pd.DataFrame:
+        """
+        Read normalized dataframe from CSV file
+        
+        Returns:
+            Normalized DataFrame
+        """
+        return read_csv_normalized(self.file_path)
+    
+    def _get_cached_dataframe(self) -> pd.DataFrame:
+        """
+        Get shared dataframe, re-read only when the CSV file changes
+        
+        The returned frame is shared between requests and must not be modified;
+        use _get_dataframe() for a private copy.
         
         Returns:
             Normalized DataFrame
@@ -38,7 +83,157 @@ class BaseService(ABC):
         """
         if not os.path.exists(self.file_path):
             raise FileNotFoundError(f"{self.entity_name.capitalize()} data not found")
-        return read_csv_normalized(self.file_path)
+        return self._cache.get("dataframe", self.get_data_version(), self._build_dataframe)
+    
+    def _build_dataframe(self) -> pd.DataFrame:
+        """
+        Build the shared dataframe cached by _get_cached_dataframe()
+        
+        Returns:
+            Normalized DataFrame
+        """
+        return self._load_dataframe()
+    
+    def _get_dataframe(self) -> pd.DataFrame:
+        """
+        Get normalized dataframe from CSV file
+        
+        Returns:
+            Normalized DataFrame (private copy, safe to modify)
+            
+        Raises:
+            FileNotFoundError: If file doesn't exist
+        """
+        return self._get_cached_dataframe().copy()
+    
+    def _get_stored_dataframe(self) -> pd.DataFrame:
+        """
+        Get the data as it is written back to the CSV file by create/update/delete/bulk_upsert
+        
+        Same as _get_dataframe() unless a service derives read-only columns
+        or values in _build_dataframe().
+        
+        Returns:
+            Normalized DataFrame (private copy, safe to modify)
+            
+        Raises:
+            FileNotFoundError: If file doesn't exist
+        """
+        return self._get_dataframe()
+    
+    def _get_primary_key_index(self) -> Dict[Any, Any]:
+        """
+        Get hash index of primary key value -> row index label
+        
+        Returns:
+            Dictionary mapping each primary key (first occurrence) to its row label
+        """
+        def build() -> Dict[Any, Any]:
+            df = self._get_cached_dataframe()
+            if self.primary_key not in df.columns:
+                return {}
+            keys = df[self.primary_key]
+            first = ~keys.duplicated(keep='first')
+            return dict(zip(keys[first], df.index[first]))
+        
+        return self._cache.get("primary_key_index", self.get_data_version(), build)
+    
+    def _get_search_records(self) -> List[Dict[str, Any]]:
+        """
+        Get records covered by the search index (shared, must not be modified)
+        
+        Returns:
+            List of records, cached per file version
+        """
+        def build() -> List[Dict[str, Any]]:
+            return self._get_cached_dataframe().to_dict(orient="records")
+        
+        return self._cache.get("records", self.get_data_version(), build)
+    
+    def _get_search_index(self) -> SearchIndex:
+        """
+        Get token/trigram search index over SEARCH_FIELDS
+        
+        The index is built on first use and rebuilt after the CSV file changes.
+        
+        Returns:
+            SearchIndex aligned with _get_search_records()
+        """
+        def build() -> SearchIndex:
+            return SearchIndex(self._get_search_records(), self.SEARCH_FIELDS)
+        
+        return self._cache.get("search_index", self.get_data_version(), build)
+    
+    def search_positions(self, query: str, limit: Optional[int] = None) -> List[int]:
+        """
+        Find positions of matching records, best match first
+        
+        Args:
+            query: Search text
+            limit: Maximum number of results (None = all)
+            
+        Returns:
+            Positions into _get_search_records()
+        """
+        return self._get_search_index().search(query, limit=limit)
+    
+    def search(self, query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Search records by prefix/substring over SEARCH_FIELDS, ranked by relevance
+        
+        Args:
+            query: Search text
+            limit: Maximum number of results (None = all)
+            
+        Returns:
+            Matching records (shared, must not be modified)
+        """
+        records = self._get_search_records()
+        return [records[pos] for pos in self.search_positions(query, limit=limit)]
+    
+    def _get_fuzzy_index(self) -> FuzzyIndex:
+        """
+        Get typo-tolerant index over FUZZY_FIELDS, keyed by record position
+        
+        Returns:
+            FuzzyIndex aligned with _get_search_records()
+        """
+        def build() -> FuzzyIndex:
+            records = self._get_search_records()
+            return FuzzyIndex(
+                (pos, record.get(field))
+                for pos, record in enumerate(records)
+                for field in self.FUZZY_FIELDS
+                if pd.notna(record.get(field))
+            )
+        
+        return self._cache.get("fuzzy_index", self.get_data_version(), build)
+    
+    def fuzzy_search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Find records whose names are closest to a possibly misspelled query
+        
+        Args:
+            query: Search text
+            limit: Maximum number of results
+            
+        Returns:
+            List of {"name", "score", "record"} dictionaries, best first
+        """
+        records = self._get_search_records()
+        return [
+            {"name": name, "score": score, "record": records[pos]}
+            for pos, name, score in self._get_fuzzy_index().search(query, limit=limit)
+        ]
+    
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        """Context around create/update/delete/bulk_upsert reading, changing and rewriting the CSV file"""
+        yield
+    
+    def _invalidate_cache(self) -> None:
+        """Drop cached frames and indexes after the CSV file was written"""
+        self._cache.invalidate()
     
     def _save_dataframe(self, df: pd.DataFrame) -> None:
         """
@@ -94,6 +289,14 @@ class BaseService(ABC):
         Raises:
             ValueError: If entity not found
         """
+        try:
+            idx = self._get_primary_key_index().get(key_value)
+        except (FileNotFoundError, TypeError):
+            idx = None
+        if idx is not None and idx in df.index and df.at[idx, self.primary_key] == key_value:
+            return idx
+        
+        # Fallback scan for frames that don't come from the cache
         if key_value not in df[self.primary_key].values:
             raise ValueError(f"{self.entity_name.capitalize()} with {self.primary_key} {key_value} not found")
         return df[df[self.primary_key] == key_value].index[0]
@@ -124,6 +327,118 @@ class BaseService(ABC):
         print(f"[INFO] Loaded {len(data)} {self.entity_name} records")
         return data
     
+    def get_record_batches(self, batch_size: int = 1000) -> Tuple[int, Iterator[List[Dict[str, Any]]]]:
+        """
+        Get all entities as lazily converted batches of the cached frame
+        
+        The frame is fetched now (so missing data raises here, not mid-stream);
+        each batch is converted to dictionaries only when iterated, so a
+        consumer that encodes and discards batches keeps memory flat.
+        
+        Args:
+            batch_size: Records per batch
+            
+        Returns:
+            Tuple of (total number of records, iterator over record lists)
+        """
+        df = self._get_cached_dataframe()
+        
+        def batches() -> Iterator[List[Dict[str, Any]]]:
+            for start in range(0, len(df), batch_size):
+                yield df.iloc[start:start + batch_size].to_dict(orient="records")
+        
+        return len(df), batches()
+    
+    def get_columnar(self, dictionary: bool = False) -> Dict[str, Any]:
+        """
+        Get all entities column by column, straight from the cached frame
+        
+        Args:
+            dictionary: Dictionary-encode low-cardinality text columns
+            
+        Returns:
+            Column-oriented data (see frame_to_columns)
+        """
+        return frame_to_columns(self._get_cached_dataframe(), dictionary=dictionary)
+    
+    def get_arrow_table(self) -> Any:
+        """
+        Get all entities as an Arrow table, cached per data version
+        
+        Returns:
+            pyarrow.Table converted from the cached frame
+            
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            RuntimeError: If pyarrow is not installed
+        """
+        return self._cache.get("arrow_table", self.get_data_version(),
+                               lambda: frame_to_arrow(self._get_cached_dataframe()))
+    
+    def _sync_change_log(self) -> None:
+        """Record row changes made since the change log last saw the data"""
+        version = self.get_data_version()
+        if self._change_log.synced_version == version:
+            return
+        df = self._get_cached_dataframe()
+        self._check_primary_key_exists(df)
+        self._change_log.sync(version, df, self.primary_key)
+    
+    def get_change_version(self) -> int:
+        """
+        Get current change version (the cursor for get_changes)
+        
+        Returns:
+            Change version of the current data
+            
+        Raises:
+            FileNotFoundError: If file doesn't exist
+        """
+        self._sync_change_log()
+        return self._change_log.version
+    
+    def get_change_epoch(self) -> int:
+        """
+        Get the first change version of this process
+        
+        Change versions restart with the process, so responses carrying one
+        must not be revalidated across restarts.
+        
+        Returns:
+            Change version the log started at
+        """
+        return self._change_log.epoch
+    
+    def get_changes(self, since: int) -> Dict[str, Any]:
+        """
+        Get rows inserted, updated or deleted after a change version
+        
+        Args:
+            since: Change version the client last synced to
+            
+        Returns:
+            Dictionary with "version" (the next cursor), "reset" (True when the
+            client must refetch the full list instead), "inserts" and "updates"
+            (current records) and "deletes" (primary keys)
+            
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            ValueError: If the primary key column is missing
+        """
+        self._sync_change_log()
+        changes = self._change_log.get_changes(since)
+        
+        changed_keys = changes["inserts"] + changes["updates"]
+        if changed_keys:
+            df = self._get_cached_dataframe()
+            index = self._get_primary_key_index()
+            # Keys changed again after the sync are left for the next poll
+            labels = {key: index[key] for key in changed_keys if key in index}
+            for bucket in ("inserts", "updates"):
+                keys = [key for key in changes[bucket] if key in labels]
+                changes[bucket] = df.loc[[labels[key] for key in keys]].to_dict(orient="records")
+        return changes
+    
     def get_by_id(self, key_value: str) -> Dict[str, Any]:
         """
         Get entity by primary key
@@ -153,24 +468,25 @@ class BaseService(ABC):
         """
         # Validate
         self._validate(entity_data, is_create=True)
-        
-        # Read existing
-        if os.path.exists(self.file_path):
-            df = self._get_dataframe()
-        else:
-            df = pd.DataFrame()
-        
-        # Check duplicate
-        if not df.empty and self.primary_key in df.columns:
-            if entity_data.get(self.primary_key) in df[self.primary_key].values:
-                raise ValueError(f"{self.entity_name.capitalize()} with this {self.primary_key} already exists")
-        
-        # Append
-        new_df = pd.DataFrame([entity_data])
-        df = pd.concat([df, new_df], ignore_index=True)
-        
-        # Save
-        self._save_dataframe(df)
+        with self._writing():
+            # Read existing
+            if os.path.exists(self.file_path):
+                df = self._get_stored_dataframe()
+            else:
+                df = pd.DataFrame()
+            
+            # Check duplicate
+            if not df.empty and self.primary_key in df.columns:
+                if entity_data.get(self.primary_key) in df[self.primary_key].values:
+                    raise ValueError(f"{self.entity_name.capitalize()} with this {self.primary_key} already exists")
+            
+            # Append
+            new_df = pd.DataFrame([entity_data])
+            df = pd.concat([df, new_df], ignore_index=True)
+            
+            # Save
+            self._save_dataframe(df)
+            self._invalidate_cache()
         print(f"[INFO] Created new {self.entity_name}: {entity_data.get(self.primary_key)}")
         
         return {"ok": True, "message": f"{self.entity_name.capitalize()} created successfully"}
@@ -186,17 +502,19 @@ class BaseService(ABC):
         Returns:
             Success response dictionary
         """
-        df = self._get_dataframe()
-        self._check_primary_key_exists(df)
-        idx = self._find_by_primary_key(df, key_value)
-        
-        # Update
-        for key, value in updated_data.items():
-            if key in df.columns:
-                df.at[idx, key] = value
-        
-        # Save
-        self._save_dataframe(df)
+        with self._writing():
+            df = self._get_stored_dataframe()
+            self._check_primary_key_exists(df)
+            idx = self._find_by_primary_key(df, key_value)
+            
+            # Update
+            for key, value in updated_data.items():
+                if key in df.columns:
+                    df.at[idx, key] = value
+            
+            # Save
+            self._save_dataframe(df)
+            self._invalidate_cache()
         print(f"[INFO] Updated {self.entity_name}: {key_value}")
         
         return {"ok": True, "message": f"{self.entity_name.capitalize()} updated successfully"}
@@ -211,15 +529,17 @@ class BaseService(ABC):
         Returns:
             Success response dictionary
         """
-        df = self._get_dataframe()
-        self._check_primary_key_exists(df)
-        self._find_by_primary_key(df, key_value)
-        
-        # Delete
-        df = df[df[self.primary_key] != key_value]
-        
-        # Save
-        self._save_dataframe(df)
+        with self._writing():
+            df = self._get_stored_dataframe()
+            self._check_primary_key_exists(df)
+            self._find_by_primary_key(df, key_value)
+            
+            # Delete
+            df = df[df[self.primary_key] != key_value]
+            
+            # Save
+            self._save_dataframe(df)
+            self._invalidate_cache()
         print(f"[INFO] Deleted {self.entity_name}: {key_value}")
         
         return {"ok": True, "message": f"{self.entity_name.capitalize()} deleted successfully"}
@@ -236,29 +556,30 @@ class BaseService(ABC):
         """
         if not entities_data:
             raise ValueError("No data provided")
-        
-        # Read existing
-        if os.path.exists(self.file_path):
-            df_existing = self._get_dataframe()
-        else:
-            df_existing = pd.DataFrame()
-        
-        # Create new dataframe
-        df_new = pd.DataFrame(entities_data)
-        
-        if df_existing.empty:
-            df_result = df_new
-        else:
-            # Merge: update existing, add new
-            if self.primary_key in df_existing.columns:
-                df_result = pd.concat([df_existing, df_new]).drop_duplicates(
-                    subset=[self.primary_key], keep='last'
-                )
+        with self._writing():
+            # Read existing
+            if os.path.exists(self.file_path):
+                df_existing = self._get_stored_dataframe()
             else:
-                df_result = pd.concat([df_existing, df_new], ignore_index=True)
-        
-        # Save
-        self._save_dataframe(df_result)
+                df_existing = pd.DataFrame()
+            
+            # Create new dataframe
+            df_new = pd.DataFrame(entities_data)
+            
+            if df_existing.empty:
+                df_result = df_new
+            else:
+                # Merge: update existing, add new
+                if self.primary_key in df_existing.columns:
+                    df_result = pd.concat([df_existing, df_new]).drop_duplicates(
+                        subset=[self.primary_key], keep='last'
+                    )
+                else:
+                    df_result = pd.concat([df_existing, df_new], ignore_index=True)
+            
+            # Save
+            self._save_dataframe(df_result)
+            self._invalidate_cache()
         print(f"[INFO] Bulk upserted {len(entities_data)} {self.entity_name}s")
         
         return {
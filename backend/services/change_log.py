@@ -0,0 +1,151 @@
+"""
+Change Log - Bounded in-memory log of row inserts, updates and deletes
+Each data version of a service's frame is diffed against the previous one
+(by per-row hash), so CRUD writes, stock movements and edits made to the CSV
+outside the app are all recorded
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+import pandas as pd
+
+# Row changes kept in memory for delta-syncing clients
+MAX_CHANGES = 5000
+
+
+def hash_rows(df: pd.DataFrame, primary_key: str) -> Dict[Any, int]:
+    """
+    Hash every row of a frame by primary key
+
+    Args:
+        df: Source frame
+        primary_key: Primary key column
+
+    Returns:
+        Dictionary mapping each primary key (first occurrence, nulls skipped) to its row hash
+    """
+    if df.empty:
+        return {}
+    try:
+        hashes = pd.util.hash_pandas_object(df, index=False)
+    except TypeError:
+        # Unhashable cell values: hash their text
+        hashes = pd.util.hash_pandas_object(df.astype(str), index=False)
+    keys = df[primary_key]
+    keep = keys.notna() & ~keys.duplicated(keep='first')
+    return dict(zip(keys[keep].tolist(), hashes[keep].tolist()))
+
+
+class ChangeLog:
+    """
+    Numbers row changes with a monotonically increasing change version
+
+    The log is primed with the row hashes of the first data version it sees;
+    after that, each new data version is diffed against the last one and
+    every changed key gets the next change version. Versions start at the
+    process start time in milliseconds, so a version from before a restart
+    is older than everything in the log and the client is told to reset.
+
+    Example:
+        >>> log = ChangeLog()
+        >>> log.sync(1, pd.DataFrame({"id": ["A"], "qty": [1]}), "id")
+        >>> start = log.version
+        >>> log.sync(2, pd.DataFrame({"id": ["A", "B"], "qty": [2, 1]}), "id")
+        >>> log.get_changes(start)["inserts"], log.get_changes(start)["updates"]
+        (['B'], ['A'])
+    """
+
+    def __init__(self, max_changes: int = MAX_CHANGES):
+        """
+        Initialize log
+
+        Args:
+            max_changes: Number of row changes kept
+        """
+        self.max_changes = max_changes
+        self._lock = threading.RLock()
+        self._hashes: Optional[Dict[Any, int]] = None
+        self._changes: deque = deque()
+        self._version = time.time_ns() // 1_000_000
+        # First version of this log; differs after every restart
+        self.epoch = self._version
+        # Oldest version a client can sync from (older ones must refetch)
+        self._floor = self._version
+        # Data version the hashes were last synced with
+        self.synced_version: Any = None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def sync(self, data_version: Any, df: pd.DataFrame, primary_key: str) -> None:
+        """
+        Record the rows that changed since the last synced data version
+
+        Args:
+            data_version: Version of df (the diff is skipped if already synced)
+            df: Current frame
+            primary_key: Primary key column
+        """
+        with self._lock:
+            if data_version == self.synced_version:
+                return
+            hashes = hash_rows(df, primary_key)
+            previous = self._hashes
+            self._hashes = hashes
+            self.synced_version = data_version
+            if previous is None:
+                return
+
+            changed = [(key, "insert" if key not in previous else "update")
+                       for key, row_hash in hashes.items() if previous.get(key) != row_hash]
+            changed.extend((key, "delete") for key in previous if key not in hashes)
+            for key, change_type in changed:
+                self._version += 1
+                self._changes.append((self._version, change_type, key))
+            while len(self._changes) > self.max_changes:
+                self._floor = self._changes.popleft()[0]
+
+    def get_changes(self, since: int) -> Dict[str, Any]:
+        """
+        Get keys changed after a change version, collapsed to one change per key
+
+        A key inserted and then deleted after since is left out; one inserted
+        and then updated is reported as an insert, and one deleted and then
+        inserted again as an update.
+
+        Args:
+            since: Last change version the client has applied
+
+        Returns:
+            Dictionary with "version", "reset" (True when since is too old or
+            from another process, and the client must refetch everything), and
+            "inserts", "updates" and "deletes" key lists
+        """
+        with self._lock:
+            result = {"version": self._version, "reset": False, "inserts": [], "updates": [], "deletes": []}
+            if since < self._floor or since > self._version:
+                result["reset"] = True
+                return result
+
+            first: Dict[Any, str] = {}
+            last: Dict[Any, str] = {}
+            for version, change_type, key in reversed(self._changes):
+                if version <= since:
+                    break
+                last.setdefault(key, change_type)
+                first[key] = change_type
+
+        buckets: Dict[str, List[Any]] = {"insert": result["inserts"], "update": result["updates"],
+                                         "delete": result["deletes"]}
+        for key, change_type in reversed(list(last.items())):
+            if first[key] == "insert":
+                # The client never had this row
+                if change_type == "delete":
+                    continue
+                change_type = "insert"
+            elif change_type != "delete":
+                change_type = "update"
+            buckets[change_type].append(key)
+        return result
@@ -0,0 +1,698 @@
+"""
+Geo Service - Nearest engineer / FSL lookups, machine coverage and SO load
+Keeps a KD-tree per point set (engineers, FSLs) and rebuilds it only when
+the underlying CSV changes; machine coverage is computed by a background job
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from backend.services.engineer_service import EngineerService
+from backend.services.fsl_service import FSLLocationService
+from backend.services.machine_service import MachineService, SOURCE_PROVINCE_CENTROID, machine_coordinates
+from backend.services.so_service import SOService
+from backend.utils.background_job import BackgroundJob
+from backend.utils.data_cache import VersionedCache
+from backend.utils.geo_utils import (
+    KDTree, chord_to_km, city_coordinates, coordinate_arrays,
+    find_coordinate_columns, km_to_chord, mercator_unit, nearest_points, to_unit_vectors,
+)
+
+NEAREST_TYPES = ("engineer", "fsl")
+
+# Distance buckets (upper bound in km), same ranges as the Decision page
+COVERAGE_BUCKETS = (("0-60km", 60), ("60-120km", 120), (">120km", np.inf))
+UNKNOWN_BUCKET = "unknown"
+
+# Map layers that can be clustered: (status column, region column)
+CLUSTER_LAYERS = {
+    "machine": ("machine_status", "region"),
+    "engineer": ("status", "region"),
+}
+MAX_CLUSTER_ZOOM = 18
+# Grid cells per tile side (4 -> 64px cells on 256px tiles)
+CLUSTER_CELL_BITS = 2
+
+
+class GeoService:
+    """Business logic for spatial queries over engineers and FSLs"""
+
+    def __init__(self, engineer_service: Optional[EngineerService] = None,
+                 fsl_service: Optional[FSLLocationService] = None,
+                 machine_service: Optional[MachineService] = None,
+                 so_service: Optional[SOService] = None):
+        self.engineer_service = engineer_service or EngineerService()
+        self.fsl_service = fsl_service or FSLLocationService()
+        self.machine_service = machine_service or MachineService()
+        self.so_service = so_service or SOService()
+        self._cache = VersionedCache()
+        self._coverage_job = BackgroundJob("geo-coverage", self.compute_coverage)
+
+    def _source(self, point_type: str):
+        """Get the data service behind a point set"""
+        if point_type not in NEAREST_TYPES:
+            raise ValueError(f"Invalid type '{point_type}'. Use one of: {', '.join(NEAREST_TYPES)}")
+        return self.engineer_service if point_type == "engineer" else self.fsl_service
+
+    def _build_points(self, point_type: str) -> Tuple[KDTree, List[Dict[str, Any]], np.ndarray, np.ndarray]:
+        """
+        Build KD-tree over the located rows of a point set
+
+        Engineers need latitude/longitude columns. FSLs use them when present
+        and otherwise fall back to the coordinates of their city; rows without
+        a usable location are left out.
+
+        Returns:
+            Tuple of (tree, records, latitudes, longitudes) aligned by position
+        """
+        service = self._source(point_type)
+        df = service._get_cached_dataframe()
+        records = service._get_search_records()
+
+        columns = find_coordinate_columns(df)
+        if columns is not None:
+            lat, lng, valid = coordinate_arrays(df[columns[0]], df[columns[1]])
+        else:
+            lat = np.full(len(df), np.nan)
+            lng = np.full(len(df), np.nan)
+            valid = np.zeros(len(df), dtype=bool)
+
+        if point_type == "fsl" and "fsl_city" in df.columns:
+            for pos in np.flatnonzero(~valid).tolist():
+                coords = city_coordinates(df["fsl_city"].iat[pos])
+                if coords is not None:
+                    lat[pos], lng[pos] = coords
+                    valid[pos] = True
+
+        positions = np.flatnonzero(valid)
+        tree = KDTree(to_unit_vectors(lat[positions], lng[positions]))
+        return tree, [records[pos] for pos in positions.tolist()], lat[positions], lng[positions]
+
+    def _get_points(self, point_type: str) -> Tuple[KDTree, List[Dict[str, Any]], np.ndarray, np.ndarray]:
+        """Get cached KD-tree of a point set (rebuilt when its CSV changes)"""
+        service = self._source(point_type)
+        return self._cache.get(point_type, service.get_data_version(), lambda: self._build_points(point_type))
+
+    def get_machine_location(self, wsid: str) -> Tuple[float, float]:
+        """
+        Get coordinates of a machine
+
+        Args:
+            wsid: Machine WSID
+
+        Returns:
+            Tuple of (latitude, longitude)
+
+        Raises:
+            ValueError: If machine is not found or has no valid location
+                (a province centroid is not one)
+        """
+        machine = self.machine_service.get_by_id(wsid)
+        if machine.get("coordinate_source") == SOURCE_PROVINCE_CENTROID:
+            raise ValueError(f"Machine '{wsid}' has no valid location (only its province centroid is known)")
+        lat, lng, valid = coordinate_arrays(
+            pd.Series([machine.get("latitude")]), pd.Series([machine.get("longitude")])
+        )
+        if not valid[0]:
+            raise ValueError(f"Machine '{wsid}' has no valid location")
+        return float(lat[0]), float(lng[0])
+
+    def nearest(self, lat: float, lng: float, k: int = 5, point_type: str = "engineer",
+                max_km: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Find the k nearest engineers or FSLs to a location
+
+        Args:
+            lat: Latitude in degrees
+            lng: Longitude in degrees
+            k: Number of results
+            point_type: "engineer" or "fsl"
+            max_km: Only return points within this great-circle distance
+
+        Returns:
+            Dictionary with query, indexed point count and results
+            (records with distance_km), nearest first
+
+        Raises:
+            ValueError: If coordinates, k, max_km or type are invalid
+        """
+        if not (-90 <= lat <= 90) or not (-180 <= lng <= 180):
+            raise ValueError("Latitude must be between -90 and 90 and longitude between -180 and 180")
+        if k <= 0:
+            raise ValueError("k must be positive")
+        if max_km is not None and max_km < 0:
+            raise ValueError("max_km must not be negative")
+
+        tree, records, _, _ = self._get_points(point_type)
+        query = to_unit_vectors([lat], [lng])[0]
+        max_chord = km_to_chord(max_km) if max_km is not None else None
+        distances, indices = tree.query(query, k=k, max_distance=max_chord)
+
+        results = [
+            {**records[i], "distance_km": round(float(km), 3)}
+            for km, i in zip(chord_to_km(distances).tolist(), indices.tolist())
+        ]
+        return {
+            "query": {"lat": lat, "lng": lng, "k": k, "type": point_type, "max_km": max_km},
+            "indexed": len(tree),
+            "results": results,
+        }
+
+    def _coverage_version(self) -> Tuple[Any, Any, Any]:
+        """Version of the inputs of the coverage analysis"""
+        return (self.machine_service.get_data_version(), self.engineer_service.get_data_version(),
+                self.fsl_service.get_data_version())
+
+    def _located_points(self, point_type: str) -> Tuple[List[Dict[str, Any]], np.ndarray, np.ndarray]:
+        """Get located records of a point set (empty if its CSV is missing)"""
+        try:
+            _, records, lat, lng = self._get_points(point_type)
+        except FileNotFoundError:
+            return [], np.empty(0), np.empty(0)
+        return records, lat, lng
+
+    @staticmethod
+    def _first_value(record: Dict[str, Any], fields: Tuple[str, ...]) -> Any:
+        """Get the first non-empty field of a record"""
+        return next((record[field] for field in fields if record.get(field) not in (None, "")), None)
+
+    @staticmethod
+    def _bucket(distances: np.ndarray) -> pd.Series:
+        """Label distances with COVERAGE_BUCKETS (NaN -> unknown)"""
+        bounds = [0] + [limit for _, limit in COVERAGE_BUCKETS]
+        labels = [label for label, _ in COVERAGE_BUCKETS]
+        buckets = pd.cut(distances, bins=bounds, labels=labels, include_lowest=True)
+        return pd.Series(buckets).astype(object).fillna(UNKNOWN_BUCKET)
+
+    @staticmethod
+    def _bucket_counts(buckets: pd.Series, groups: pd.Series) -> pd.DataFrame:
+        """Count buckets per group, with a column for every bucket"""
+        labels = [label for label, _ in COVERAGE_BUCKETS] + [UNKNOWN_BUCKET]
+        return pd.crosstab(groups, buckets).reindex(columns=labels, fill_value=0)
+
+    def compute_coverage(self) -> Dict[str, Any]:
+        """
+        Compute distance from every machine to its nearest engineer and FSL
+
+        Distances are great-circle, computed in vectorized blocks (see
+        nearest_points). Machines without a valid location are counted in the
+        "unknown" bucket, including those only placed at their province
+        centroid (also counted as "approximate" in the summary).
+
+        Returns:
+            Dictionary with version, computed_at, summary, area_groups and
+            machines (DataFrame, one row per machine, worst covered first)
+
+        Raises:
+            FileNotFoundError: If machine data doesn't exist
+        """
+        version = self._coverage_version()
+        df = self.machine_service._get_cached_dataframe()
+        lat, lng, valid, approximate = machine_coordinates(df)
+
+        def text(col: str) -> pd.Series:
+            if col not in df.columns:
+                return pd.Series("", index=df.index)
+            return df[col].astype(str).str.strip()
+
+        area_groups = text("area_group").replace("", "Unknown")
+        machines = pd.DataFrame({
+            "wsid": text(self.machine_service.primary_key).to_numpy(),
+            "area_group": area_groups.to_numpy(),
+            "region": text("region").to_numpy(),
+            "latitude": np.where(valid, lat, np.nan),
+            "longitude": np.where(valid, lng, np.nan),
+        })
+
+        # (point type, id fields, name fields), first non-empty field wins
+        targets = (
+            ("engineer", (self.engineer_service.primary_key, "ce_id"), ("name", "engineer_name")),
+            ("fsl", (self.fsl_service.primary_key, "fsl_id"), ("fsl_name", self.fsl_service.primary_key)),
+        )
+        for point_type, id_fields, name_fields in targets:
+            records, point_lat, point_lng = self._located_points(point_type)
+            nearest = np.full(len(df), -1, dtype=np.int64)
+            distances = np.full(len(df), np.nan)
+            nearest[valid], distances[valid] = nearest_points(lat[valid], lng[valid], point_lat, point_lng)
+            ids = [self._first_value(record, id_fields) for record in records]
+            names = [self._first_value(record, name_fields) for record in records]
+            machines[f"nearest_{point_type}_id"] = [ids[i] if i >= 0 else None for i in nearest.tolist()]
+            machines[f"nearest_{point_type}"] = [names[i] if i >= 0 else None for i in nearest.tolist()]
+            machines[f"{point_type}_km"] = np.round(distances, 3)
+            machines[f"{point_type}_bucket"] = self._bucket(distances).to_numpy()
+
+        engineer_counts = self._bucket_counts(machines["engineer_bucket"], machines["area_group"])
+        fsl_counts = self._bucket_counts(machines["fsl_bucket"], machines["area_group"])
+        stats = machines.groupby("area_group").agg(
+            machines=("wsid", "size"),
+            located=("latitude", "count"),
+            avg_engineer_km=("engineer_km", "mean"),
+            max_engineer_km=("engineer_km", "max"),
+            avg_fsl_km=("fsl_km", "mean"),
+        ).round(2)
+        stats = stats.astype(object).where(stats.notna(), None)
+
+        groups = [
+            {
+                "area_group": group,
+                **row,
+                "engineer_buckets": engineer_counts.loc[group].to_dict(),
+                "fsl_buckets": fsl_counts.loc[group].to_dict(),
+            }
+            for group, row in stats.to_dict(orient="index").items()
+        ]
+        groups.sort(key=lambda item: -item["engineer_buckets"][">120km"])
+
+        summary = {
+            "machines": len(machines),
+            "located": int(valid.sum()),
+            "approximate": int(approximate.sum()),
+            "engineer_buckets": {k: int(v) for k, v in engineer_counts.sum().items()},
+            "fsl_buckets": {k: int(v) for k, v in fsl_counts.sum().items()},
+        }
+        machines = machines.sort_values("engineer_km", ascending=False, na_position="first", kind="stable")
+        machines = machines.astype(object).where(machines.notna(), None).reset_index(drop=True)
+
+        return {
+            "version": version,
+            "computed_at": datetime.now().isoformat(timespec="seconds"),
+            "summary": summary,
+            "area_groups": groups,
+            "machines": machines,
+        }
+
+    def refresh_coverage(self, force: bool = False) -> bool:
+        """
+        Start the coverage job if the result is missing or stale
+
+        Args:
+            force: Start even if the stored result is current
+
+        Returns:
+            True if a job is running after the call
+        """
+        return self._coverage_job.refresh(self._coverage_version(), force=force)
+
+    def get_coverage(self, wait: float = 0) -> Dict[str, Any]:
+        """
+        Get the precomputed coverage analysis, refreshing it in the background
+
+        Args:
+            wait: Seconds to wait for a running job before answering
+
+        Returns:
+            Dictionary with status ("ready", "running" or "failed"), stale flag,
+            and summary/area_groups once a result exists
+        """
+        self.refresh_coverage()
+        job = self._coverage_job.snapshot(wait)
+        data: Dict[str, Any] = {"status": job["status"]}
+        if job["error"]:
+            data["error"] = job["error"]
+        result = job["result"]
+        if result is not None:
+            data.update({
+                "stale": job["key"] != self._coverage_version(),
+                "computed_at": result["computed_at"],
+                "buckets": [label for label, _ in COVERAGE_BUCKETS] + [UNKNOWN_BUCKET],
+                "summary": result["summary"],
+                "area_groups": result["area_groups"],
+            })
+        return data
+
+    def get_coverage_machines(self, area_group: Optional[str] = None, bucket: Optional[str] = None,
+                              target: str = "engineer") -> Optional[pd.DataFrame]:
+        """
+        Get per-machine nearest distances from the last coverage result
+
+        Args:
+            area_group: Filter by area group
+            bucket: Filter by distance bucket
+            target: Which bucket to filter on ("engineer" or "fsl")
+
+        Returns:
+            DataFrame of machines (worst covered first), or None if no result yet
+
+        Raises:
+            ValueError: If target or bucket is invalid
+        """
+        if target not in NEAREST_TYPES:
+            raise ValueError(f"Invalid target '{target}'. Use one of: {', '.join(NEAREST_TYPES)}")
+        labels = [label for label, _ in COVERAGE_BUCKETS] + [UNKNOWN_BUCKET]
+        if bucket and bucket not in labels:
+            raise ValueError(f"Invalid bucket '{bucket}'. Use one of: {', '.join(labels)}")
+
+        self.refresh_coverage()
+        result = self._coverage_job.snapshot()["result"]
+        if result is None:
+            return None
+        machines = result["machines"]
+        mask = np.ones(len(machines), dtype=bool)
+        if area_group:
+            mask &= (machines["area_group"] == area_group).to_numpy()
+        if bucket:
+            mask &= (machines[f"{target}_bucket"] == bucket).to_numpy()
+        return machines[mask]
+
+    def _layer_service(self, layer: str):
+        """Get the data service behind a map layer"""
+        if layer not in CLUSTER_LAYERS:
+            raise ValueError(f"Invalid layer '{layer}'. Use one of: {', '.join(CLUSTER_LAYERS)}")
+        return self.machine_service if layer == "machine" else self.engineer_service
+
+    def _build_grid(self, layer: str) -> Dict[str, Any]:
+        """
+        Build the spatial grid index of a layer
+
+        Every located point gets its integer grid cell at MAX_CLUSTER_ZOOM;
+        the cell at a lower zoom is the same value shifted right. Machines
+        only placed at their province centroid are left out and counted.
+
+        Returns:
+            Dictionary of aligned arrays (lat, lng, gx, gy, ids, status/region
+            codes) plus the status/region labels and the approximate count
+        """
+        service = self._layer_service(layer)
+        df = service._get_cached_dataframe()
+        if layer == "machine":
+            lat, lng, valid, approximate = machine_coordinates(df)
+        else:
+            columns = find_coordinate_columns(df)
+            if columns is None:
+                lat = lng = np.full(len(df), np.nan)
+                valid = np.zeros(len(df), dtype=bool)
+            else:
+                lat, lng, valid = coordinate_arrays(df[columns[0]], df[columns[1]])
+            approximate = np.zeros(len(df), dtype=bool)
+        df, lat, lng = df[valid], lat[valid], lng[valid]
+
+        cells = 1 << (MAX_CLUSTER_ZOOM + CLUSTER_CELL_BITS)
+        x, y = mercator_unit(lat, lng)
+        grid = {
+            "lat": lat,
+            "lng": lng,
+            "gx": (x * cells).astype(np.int64),
+            "gy": (y * cells).astype(np.int64),
+            "ids": df[service.primary_key].astype(str).to_numpy() if service.primary_key in df.columns
+            else np.full(len(df), None, dtype=object),
+            "approximate": int(approximate.sum()),
+        }
+        for name, col in zip(("status", "region"), CLUSTER_LAYERS[layer]):
+            values = df[col].astype(str).str.strip() if col in df.columns else pd.Series("", index=df.index)
+            codes, labels = pd.factorize(values.replace("", "Unknown"), sort=True)
+            grid[f"{name}_codes"] = codes
+            grid[f"{name}_labels"] = list(labels)
+        return grid
+
+    def _get_grid(self, layer: str) -> Dict[str, Any]:
+        """Get cached grid index of a layer (rebuilt when its CSV changes)"""
+        return self._cache.get(("grid", layer), self._layer_service(layer).get_data_version(),
+                               lambda: self._build_grid(layer))
+
+    @staticmethod
+    def _grid_cells(grid: Dict[str, Any], zoom: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Group grid points into their cells at one zoom level
+
+        Returns:
+            Tuple of (cell x, cell y, cell of every point, points per cell)
+        """
+        shift = MAX_CLUSTER_ZOOM - zoom
+        side = np.int64(1) << (zoom + CLUSTER_CELL_BITS)
+        keys, inverse = np.unique((grid["gx"] >> shift) * side + (grid["gy"] >> shift), return_inverse=True)
+        return keys // side, keys % side, inverse, np.bincount(inverse, minlength=len(keys))
+
+    @staticmethod
+    def _bbox_mask(cx: np.ndarray, cy: np.ndarray, zoom: int,
+                   bbox: Optional[Tuple[float, float, float, float]]) -> np.ndarray:
+        """
+        Select the grid cells intersecting a bounding box
+
+        Raises:
+            ValueError: If bbox is invalid
+        """
+        mask = np.ones(len(cx), dtype=bool)
+        if bbox is None:
+            return mask
+        west, south, east, north = bbox
+        if not (-90 <= south <= north <= 90) or not (-180 <= west <= 180 and -180 <= east <= 180):
+            raise ValueError("bbox must be west,south,east,north in degrees with south <= north")
+        cells = 1 << (zoom + CLUSTER_CELL_BITS)
+        (x_min, x_max), (y_max, y_min) = (
+            (values * cells).astype(np.int64) for values in mercator_unit([south, north], [west, east])
+        )
+        mask &= (cy >= y_min) & (cy <= y_max)
+        if west <= east:
+            mask &= (cx >= x_min) & (cx <= x_max)
+        else:
+            # Box crosses the antimeridian
+            mask &= (cx >= x_min) | (cx <= x_max)
+        return mask
+
+    def _build_clusters(self, layer: str, zoom: int) -> Dict[str, Any]:
+        """Aggregate a layer's grid into clusters at one zoom level"""
+        grid = self._get_grid(layer)
+        cx, cy, inverse, counts = self._grid_cells(grid, zoom)
+
+        first = np.zeros(len(cx), dtype=np.int64)
+        first[inverse[::-1]] = np.arange(len(inverse))[::-1]
+        clusters = {
+            "cx": cx,
+            "cy": cy,
+            "count": counts,
+            "lat": np.bincount(inverse, weights=grid["lat"], minlength=len(cx)) / np.maximum(counts, 1),
+            "lng": np.bincount(inverse, weights=grid["lng"], minlength=len(cx)) / np.maximum(counts, 1),
+            "first_id": grid["ids"][first] if len(cx) else np.empty(0, dtype=object),
+            "approximate": grid["approximate"],
+        }
+        for name in ("status", "region"):
+            labels = grid[f"{name}_labels"]
+            flat = inverse * len(labels) + grid[f"{name}_codes"]
+            clusters[name] = np.bincount(flat, minlength=len(cx) * len(labels)).reshape(len(cx), len(labels))
+            clusters[f"{name}_labels"] = labels
+        return clusters
+
+    def clusters(self, layer: str = "machine", zoom: int = 5,
+                 bbox: Optional[Tuple[float, float, float, float]] = None) -> Dict[str, Any]:
+        """
+        Get grid clusters of a map layer inside a bounding box
+
+        Clusters are aggregated once per layer and zoom (rebuilt when the
+        layer's CSV changes); a request only selects the cells that intersect
+        the box, so clusters stay stable while panning.
+
+        Args:
+            layer: "machine" or "engineer"
+            zoom: Map zoom level (clamped to 0..MAX_CLUSTER_ZOOM)
+            bbox: (west, south, east, north) in degrees, or None for everything
+
+        Returns:
+            Dictionary with zoom, cell size, totals, clusters (lat/lng of the
+            member mean, count, by_status, by_region; id for single points) and
+            the number of machines left out as approximate
+
+        Raises:
+            ValueError: If layer or bbox is invalid
+        """
+        service = self._layer_service(layer)
+        zoom = int(min(max(zoom, 0), MAX_CLUSTER_ZOOM))
+        data = self._cache.get(("clusters", layer, zoom), service.get_data_version(),
+                               lambda: self._build_clusters(layer, zoom))
+
+        mask = self._bbox_mask(data["cx"], data["cy"], zoom, bbox)
+
+        def breakdown(name: str, row: int) -> Dict[str, int]:
+            counts = data[name][row]
+            return {data[f"{name}_labels"][i]: int(counts[i]) for i in np.flatnonzero(counts)}
+
+        result = []
+        for row in np.flatnonzero(mask).tolist():
+            count = int(data["count"][row])
+            cluster = {
+                "lat": round(float(data["lat"][row]), 6),
+                "lng": round(float(data["lng"][row]), 6),
+                "count": count,
+                "by_status": breakdown("status", row),
+                "by_region": breakdown("region", row),
+            }
+            if count == 1:
+                cluster["id"] = data["first_id"][row]
+            result.append(cluster)
+        result.sort(key=lambda item: -item["count"])
+
+        return {
+            "layer": layer,
+            "zoom": zoom,
+            "cell_px": 256 >> CLUSTER_CELL_BITS,
+            "total": int(sum(item["count"] for item in result)),
+            "approximate": data["approximate"],
+            "clusters": result,
+        }
+
+    def _build_so_by_wsid(self) -> pd.DataFrame:
+        """
+        Aggregate service orders per machine
+
+        Returns:
+            DataFrame indexed by wsid with so_count, resolution_sum and
+            resolution_count (orders with a positive resolution time)
+        """
+        df = self.so_service._get_cached_dataframe()
+        if "wsid" not in df.columns:
+            return pd.DataFrame({"so_count": [], "resolution_sum": [], "resolution_count": []},
+                                index=pd.Index([], name="wsid"))
+        resolution = pd.to_numeric(df["resolution_time"], errors="coerce") if "resolution_time" in df.columns \
+            else pd.Series(np.nan, index=df.index)
+        orders = pd.DataFrame({
+            "wsid": df["wsid"].astype(str).str.strip(),
+            "resolution": resolution.where(resolution > 0),
+        })
+        grouped = orders[orders["wsid"] != ""].groupby("wsid", sort=False)["resolution"]
+        return pd.DataFrame({
+            "so_count": grouped.size(),
+            "resolution_sum": grouped.sum(),
+            "resolution_count": grouped.count(),
+        })
+
+    def _get_so_by_wsid(self) -> pd.DataFrame:
+        """Get cached SO aggregates per wsid (rebuilt when the SO CSV changes)"""
+        return self._cache.get("so_by_wsid", self.so_service.get_data_version(), self._build_so_by_wsid)
+
+    def _service_load_version(self) -> Tuple[Any, Any]:
+        return self.machine_service.get_data_version(), self.so_service.get_data_version()
+
+    def _build_service_load(self) -> Dict[str, Any]:
+        """
+        Join SO aggregates onto machines
+
+        Returns:
+            Dictionary with machines (DataFrame, one row per machine, most
+            orders first), grid (SO aggregates aligned with the machine grid
+            index) and SO totals
+        """
+        so = self._get_so_by_wsid()
+        df = self.machine_service._get_cached_dataframe()
+        pk = self.machine_service.primary_key
+        wsid = df[pk].astype(str).str.strip() if pk in df.columns else pd.Series("", index=df.index)
+        joined = so.reindex(wsid.to_numpy())
+        so_count = joined["so_count"].fillna(0).to_numpy(dtype=np.int64)
+        resolution_count = joined["resolution_count"].fillna(0).to_numpy()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg_resolution = joined["resolution_sum"].to_numpy() / resolution_count
+
+        lat, lng, valid, _ = machine_coordinates(df)
+
+        machines = pd.DataFrame({
+            "wsid": wsid.to_numpy(),
+            "area_group": df["area_group"].astype(str).to_numpy() if "area_group" in df.columns else "",
+            "latitude": np.where(valid, np.round(lat, 6), np.nan),
+            "longitude": np.where(valid, np.round(lng, 6), np.nan),
+            "so_count": so_count,
+            "avg_resolution_time": np.round(avg_resolution, 2),
+        }).sort_values("so_count", ascending=False, kind="stable")
+        machines = machines.astype(object).where(machines.notna(), None)
+
+        grid_ids = pd.Index(self._get_grid("machine")["ids"]).astype(str).str.strip()
+        grid_so = so.reindex(grid_ids).fillna(0)
+        matched = int(so["so_count"][so.index.isin(wsid)].sum())
+        return {
+            "machines": machines,
+            "grid": {name: grid_so[name].to_numpy(dtype=float) for name in so.columns},
+            "total_so": int(so["so_count"].sum()),
+            "matched_so": matched,
+        }
+
+    def _get_service_load(self) -> Dict[str, Any]:
+        return self._cache.get("service_load", self._service_load_version(), self._build_service_load)
+
+    def _build_service_load_cells(self, zoom: int) -> Dict[str, np.ndarray]:
+        """Aggregate the per-machine SO load into grid cells at one zoom level"""
+        grid = self._get_grid("machine")
+        load = self._get_service_load()["grid"]
+        cx, cy, inverse, counts = self._grid_cells(grid, zoom)
+
+        def total(values: np.ndarray) -> np.ndarray:
+            return np.bincount(inverse, weights=values, minlength=len(cx))
+
+        so_count = total(load["so_count"])
+        resolution_count = total(load["resolution_count"])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg_resolution = total(load["resolution_sum"]) / resolution_count
+        keep = so_count > 0
+        return {
+            "cx": cx[keep],
+            "cy": cy[keep],
+            "lat": (total(grid["lat"]) / np.maximum(counts, 1))[keep],
+            "lng": (total(grid["lng"]) / np.maximum(counts, 1))[keep],
+            "so_count": so_count[keep].astype(np.int64),
+            "machines": counts[keep],
+            "avg_resolution_time": avg_resolution[keep],
+        }
+
+    def service_load_heatmap(self, zoom: int = 5,
+                             bbox: Optional[Tuple[float, float, float, float]] = None) -> Dict[str, Any]:
+        """
+        Get SO load per map grid cell inside a bounding box
+
+        Service orders are joined to machine locations by wsid; the join and
+        the cells of each zoom level are cached until the machine or SO CSV
+        changes. Cells without orders are left out, and cells are returned as
+        rows of "fields" to keep the payload small.
+
+        Args:
+            zoom: Map zoom level (clamped to 0..MAX_CLUSTER_ZOOM)
+            bbox: (west, south, east, north) in degrees, or None for everything
+
+        Returns:
+            Dictionary with zoom, cell size, fields, cells (busiest first), SO
+            totals (total, matched to a machine, unmatched) and the number of
+            machines left out as approximate (province centroid only)
+
+        Raises:
+            ValueError: If bbox is invalid
+        """
+        zoom = int(min(max(zoom, 0), MAX_CLUSTER_ZOOM))
+        load = self._get_service_load()
+        data = self._cache.get(("service_load_cells", zoom), self._service_load_version(),
+                               lambda: self._build_service_load_cells(zoom))
+
+        rows = np.flatnonzero(self._bbox_mask(data["cx"], data["cy"], zoom, bbox))
+        rows = rows[np.argsort(-data["so_count"][rows], kind="stable")]
+        avg_resolution = np.round(data["avg_resolution_time"][rows], 2)
+        cells = [
+            [lat, lng, so_count, machines, None if resolution != resolution else resolution]
+            for lat, lng, so_count, machines, resolution in zip(
+                np.round(data["lat"][rows], 6).tolist(), np.round(data["lng"][rows], 6).tolist(),
+                data["so_count"][rows].tolist(), data["machines"][rows].tolist(), avg_resolution.tolist(),
+            )
+        ]
+        return {
+            "zoom": zoom,
+            "cell_px": 256 >> CLUSTER_CELL_BITS,
+            "fields": ["lat", "lng", "so_count", "machines", "avg_resolution_time"],
+            "cells": cells,
+            "max_so_count": cells[0][2] if cells else 0,
+            "total_so": load["total_so"],
+            "matched_so": load["matched_so"],
+            "unmatched_so": load["total_so"] - load["matched_so"],
+            "approximate": self._get_grid("machine")["approximate"],
+        }
+
+    def get_service_load_machines(self, area_group: Optional[str] = None,
+                                  min_so: int = 1) -> pd.DataFrame:
+        """
+        Get SO count and mean resolution time per machine, most orders first
+
+        Args:
+            area_group: Filter by area group
+            min_so: Minimum number of orders
+
+        Returns:
+            DataFrame with wsid, area_group, latitude, longitude, so_count and
+            avg_resolution_time
+        """
+        machines = self._get_service_load()["machines"]
+        mask = (machines["so_count"] >= min_so).to_numpy()
+        if area_group:
+            mask &= (machines["area_group"] == area_group).to_numpy()
+        return machines[mask]
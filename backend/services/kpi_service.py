@@ -0,0 +1,357 @@
+"""
+KPI Service - Live engineer KPI aggregates
+Keeps per-engineer running aggregates from so_apr_spt.csv and updates only
+the engineers touched by an SO delta instead of recomputing from the raw frame
+"""
+import threading
+from collections import Counter
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
+import pandas as pd
+from backend.services.so_service import SOService
+from backend.utils.csv_utils import float_column, text_column
+from backend.utils.helpers import to_snake
+
+# (engineer, wsid, area_group, branch_name, response_time, resolution_time)
+Contribution = Tuple[str, str, str, str, float, float]
+
+
+class EngineerKPIAggregate:
+    """Running KPI aggregates for a single engineer"""
+
+    # Response time zones in minutes (same boundaries as the leveling sheet)
+    ZONE_LIMITS = (90, 180, 1440)
+
+    def __init__(self):
+        self.closed_so = 0
+        self.machines: Counter = Counter()
+        self.areas: Counter = Counter()
+        self.branches: Counter = Counter()
+        self.response_sum = 0.0
+        self.response_count = 0
+        self.zone_sums = [0.0, 0.0, 0.0]
+        self.zone_counts = [0, 0, 0]
+        self.resolution_sum = 0.0
+        self.resolution_count = 0
+
+    @staticmethod
+    def _count(counter: Counter, key: str, sign: int) -> None:
+        """Add or remove one reference to key in a distinct-value counter"""
+        if not key:
+            return
+        counter[key] += sign
+        if counter[key] <= 0:
+            del counter[key]
+
+    def apply(self, contribution: Contribution, sign: int) -> None:
+        """
+        Add (sign=1) or remove (sign=-1) one closed SO from the aggregates
+
+        Args:
+            contribution: Contribution tuple of the SO
+            sign: 1 to add, -1 to remove
+        """
+        _, wsid, area, branch, response, resolution = contribution
+        self.closed_so += sign
+        self._count(self.machines, wsid, sign)
+        self._count(self.areas, area, sign)
+        self._count(self.branches, branch, sign)
+
+        if response > 0:
+            self.response_sum += sign * response
+            self.response_count += sign
+            for zone, limit in enumerate(self.ZONE_LIMITS):
+                if response <= limit:
+                    self.zone_sums[zone] += sign * response
+                    self.zone_counts[zone] += sign
+                    break
+
+        if resolution > 0:
+            self.resolution_sum += sign * resolution
+            self.resolution_count += sign
+
+    def is_empty(self) -> bool:
+        """Check whether no closed SO contributes to this engineer anymore"""
+        return self.closed_so <= 0
+
+
+class KPIService:
+    """Business logic for live engineer KPI maintenance"""
+
+    # KPI weights (from leveling.csv metadata)
+    WEIGHTS = {
+        'productivity': 40,
+        'response_time': 25,
+        'resolution_time': 25,
+    }
+    PRODUCTIVITY_TARGET = 500
+    RESOLUTION_TARGET_MINUTES = 60
+
+    def __init__(self, so_service: Optional[SOService] = None):
+        self.so_service = so_service or SOService()
+        self._lock = threading.RLock()
+        self._contributions: Dict[str, Contribution] = {}
+        self._aggregates: Dict[str, EngineerKPIAggregate] = {}
+        self._synced_version: Any = None
+        self._synced = False
+
+    def _so_numbers(self, df: pd.DataFrame) -> pd.Series:
+        """Get SO numbers as strings (numeric CSV columns come back as floats)"""
+        return text_column(df, 'so_number').str.replace(r'\.0$', '', regex=True)
+
+    def _build_contributions(self, df: pd.DataFrame) -> Dict[str, Contribution]:
+        """
+        Build contribution tuples for every closed SO in a frame
+
+        Args:
+            df: SO DataFrame with snake_case columns
+
+        Returns:
+            Dictionary of so_number -> contribution
+        """
+        if df.empty or 'so_number' not in df.columns:
+            return {}
+
+        engineer_col = 'ce_id' if 'ce_id' in df.columns else 'engineer'
+        engineers = text_column(df, engineer_col)
+        if engineer_col == 'ce_id':
+            engineers = engineers.str.upper()
+
+        valid = engineers != ""
+        # SO exports without a status column only contain finished orders
+        if 'so_status' in df.columns:
+            valid &= text_column(df, 'so_status').str.lower() == 'close'
+
+        so_numbers = self._so_numbers(df)
+        valid &= so_numbers != ""
+
+        rows = zip(
+            engineers[valid],
+            text_column(df, 'wsid')[valid],
+            text_column(df, 'area_group')[valid],
+            text_column(df, 'branch_name')[valid],
+            float_column(df, 'ce_response_time')[valid],
+            float_column(df, 'resolution_time')[valid],
+        )
+        return dict(zip(so_numbers[valid], rows))
+
+    def _set_contribution(self, so_number: str, contribution: Optional[Contribution],
+                          affected: Set[str]) -> None:
+        """
+        Replace the stored contribution of one SO and update its engineer(s)
+
+        Args:
+            so_number: SO number
+            contribution: New contribution, or None to drop the SO
+            affected: Set collecting engineers whose aggregates changed
+        """
+        old = self._contributions.get(so_number)
+        if old == contribution:
+            return
+
+        if old is not None:
+            aggregate = self._aggregates[old[0]]
+            aggregate.apply(old, -1)
+            if aggregate.is_empty():
+                del self._aggregates[old[0]]
+            affected.add(old[0])
+            del self._contributions[so_number]
+
+        if contribution is not None:
+            aggregate = self._aggregates.setdefault(contribution[0], EngineerKPIAggregate())
+            aggregate.apply(contribution, 1)
+            self._contributions[so_number] = contribution
+            affected.add(contribution[0])
+
+    def sync(self) -> Set[str]:
+        """
+        Reconcile aggregates with so_apr_spt.csv if the file changed
+
+        Only SOs whose contribution differs from the stored one touch the
+        aggregates, so a re-upload with a few changed rows stays cheap.
+
+        Returns:
+            Set of engineers whose aggregates changed
+        """
+        version = self.so_service.get_data_version()
+        with self._lock:
+            if self._synced and version == self._synced_version:
+                return set()
+
+            try:
+                df = self.so_service._get_dataframe()
+                df = df.loc[:, ~df.columns.duplicated()]
+            except FileNotFoundError:
+                df = pd.DataFrame()
+
+            latest = self._build_contributions(df)
+            affected: Set[str] = set()
+            for so_number in [so for so in self._contributions if so not in latest]:
+                self._set_contribution(so_number, None, affected)
+            for so_number, contribution in latest.items():
+                self._set_contribution(so_number, contribution, affected)
+
+            self._synced_version = version
+            self._synced = True
+            print(f"[INFO] KPI aggregates synced: {len(affected)} engineers updated")
+            return affected
+
+    def apply_so_delta(self, upserts: Optional[List[Dict[str, Any]]] = None,
+                       deletes: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Apply added, changed, closed or removed SOs to the running aggregates
+
+        Deltas are applied on top of the last synced file; the next change of
+        so_apr_spt.csv is reconciled against the file contents.
+
+        Args:
+            upserts: SO records (any column naming, e.g. "SO Number" or so_number)
+            deletes: SO numbers to drop
+
+        Returns:
+            Dictionary with affected engineers and their updated KPIs
+        """
+        upserts = upserts or []
+        deletes = [str(so).strip() for so in (deletes or []) if str(so).strip()]
+        deletes = [so[:-2] if so.endswith('.0') else so for so in deletes]
+        if not upserts and not deletes:
+            raise ValueError("No SO changes provided")
+
+        self.sync()
+
+        delta_df = pd.DataFrame(upserts)
+        delta_df.columns = [to_snake(c) for c in delta_df.columns]
+        if upserts and 'so_number' not in delta_df.columns:
+            raise ValueError("so_number is required for every SO record")
+
+        closed = self._build_contributions(delta_df)
+        touched = self._so_numbers(delta_df).tolist() if upserts else []
+
+        affected: Set[str] = set()
+        with self._lock:
+            for so_number in touched:
+                if so_number:
+                    self._set_contribution(so_number, closed.get(so_number), affected)
+            for so_number in deletes:
+                self._set_contribution(so_number, None, affected)
+
+            engineers = [self._engineer_kpi(eng) for eng in sorted(affected)]
+
+        print(f"[INFO] Applied SO delta ({len(touched)} upserts, {len(deletes)} deletes) to {len(affected)} engineers")
+        return {
+            "ok": True,
+            "affected_engineers": sorted(affected),
+            "engineers": engineers
+        }
+
+    def _engineer_kpi(self, engineer: str) -> Dict[str, Any]:
+        """
+        Compute KPI metrics for one engineer from its running aggregates
+
+        Args:
+            engineer: Engineer key (ce_id or engineer name)
+
+        Returns:
+            KPI dictionary (removed engineers report zero values)
+        """
+        agg = self._aggregates.get(engineer) or EngineerKPIAggregate()
+
+        # Productivity
+        total_ce_area = len(agg.areas)
+        total_so_area = len(agg.branches)
+        productivity_percentage = agg.closed_so / self.PRODUCTIVITY_TARGET * 100
+        productivity_index = min(5.0, productivity_percentage / 100 * 5)
+        productivity_kpi = min(self.WEIGHTS['productivity'],
+                               productivity_percentage / 100 * self.WEIGHTS['productivity'])
+
+        # Response time (zone distribution)
+        if agg.response_count > 0:
+            response_index = (
+                agg.zone_counts[0] * 1.0 +
+                agg.zone_counts[1] * 0.5 +
+                agg.zone_counts[2] * 0.25
+            ) / agg.response_count * 5
+            avg_response = agg.response_sum / agg.response_count
+        else:
+            response_index = 0.0
+            avg_response = 0.0
+        response_percentage = response_index / 5 * 100
+
+        # Resolution time (lower is better)
+        if agg.resolution_count > 0:
+            avg_resolution = agg.resolution_sum / agg.resolution_count
+            resolution_index = min(5.0, self.RESOLUTION_TARGET_MINUTES / avg_resolution * 5)
+            resolution_percentage = min(100.0, self.RESOLUTION_TARGET_MINUTES / avg_resolution * 100)
+        else:
+            avg_resolution = 0.0
+            resolution_index = 0.0
+            resolution_percentage = 0.0
+
+        return {
+            'engineer': engineer,
+            'productivity': {
+                'total_machine': len(agg.machines),
+                'total_ce_area': total_ce_area,
+                'total_so_area': total_so_area,
+                'so_area_per_ce_area': round(total_so_area / total_ce_area, 2) if total_ce_area else 0,
+                'total_so_individual': agg.closed_so,
+                'index': round(productivity_index, 2),
+                'score': int(round(productivity_index)),
+                'percentage': round(productivity_percentage, 2),
+                'kpi_achievement': round(productivity_kpi, 2),
+            },
+            'response_time': {
+                'avg_response_time': round(avg_response, 2),
+                'response_count': agg.response_count,
+                'zona_1_count': agg.zone_counts[0],
+                'zona_2_count': agg.zone_counts[1],
+                'zona_3_count': agg.zone_counts[2],
+                'zona_1_minutes': round(agg.zone_sums[0], 2),
+                'zona_2_minutes': round(agg.zone_sums[1], 2),
+                'zona_3_minutes': round(agg.zone_sums[2], 2),
+                'index': round(response_index, 2),
+                'score': int(round(response_index)),
+                'percentage': round(response_percentage, 2),
+                'kpi_achievement': round(response_percentage / 100 * self.WEIGHTS['response_time'], 2),
+            },
+            'resolution_time': {
+                'avg_resolution_time': round(avg_resolution, 2),
+                'resolution_count': agg.resolution_count,
+                'index': round(resolution_index, 2),
+                'score': int(round(resolution_index)),
+                'percentage': round(resolution_percentage, 2),
+                'kpi_achievement': round(resolution_percentage / 100 * self.WEIGHTS['resolution_time'], 2),
+            },
+        }
+
+    def get_all(self) -> List[Dict[str, Any]]:
+        """
+        Get live KPIs for all engineers with closed SOs
+
+        Returns:
+            List of KPI dictionaries sorted by engineer
+        """
+        self.sync()
+        with self._lock:
+            return [self._engineer_kpi(eng) for eng in sorted(self._aggregates)]
+
+    def get_by_engineer(self, engineer: str) -> Dict[str, Any]:
+        """
+        Get live KPIs for one engineer
+
+        Args:
+            engineer: Engineer key (ce_id or engineer name)
+
+        Returns:
+            KPI dictionary
+
+        Raises:
+            ValueError: If engineer has no closed SOs
+        """
+        self.sync()
+        key = str(engineer).strip()
+        with self._lock:
+            if key not in self._aggregates and key.upper() in self._aggregates:
+                key = key.upper()
+            if key not in self._aggregates:
+                raise ValueError(f"No closed SO found for engineer {engineer}")
+            return self._engineer_kpi(key)
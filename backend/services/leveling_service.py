@@ -30,20 +30,14 @@ class LevelingService(BaseService):
         # If needed in the future, add validation logic here
         pass
     
-    def _get_dataframe(self) -> pd.DataFrame:
+    def _load_dataframe(self) -> pd.DataFrame:
         """
-        Get normalized dataframe from leveling.csv
+        Read normalized dataframe from leveling.csv
         Skips first 3 metadata rows
         
         Returns:
             Normalized DataFrame
-            
-        Raises:
-            FileNotFoundError: If file doesn't exist
         """
-        if not os.path.exists(self.file_path):
-            raise FileNotFoundError(f"{self.entity_name.capitalize()} data not found")
-        
         # Read CSV with skiprows to skip metadata (first 3 rows)
         encodings = ["utf-8", "utf-8-sig", "latin1", "cp1252"]
         df = None
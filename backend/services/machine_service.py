@@ -1,8 +1,47 @@
-from typing import Dict, List, Any
+import os
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+import numpy as np
 import pandas as pd
 from backend.services.base_service import BaseService
+from backend.services.province_centroids import province_centroids
+from backend.utils.data_cache import get_file_version
+from backend.utils.geo_utils import coordinate_arrays, find_coordinate_columns
+from backend.utils.rollup import Rollup, RollupKey
 from backend.utils.validators import validate_machine
 
+# Where a machine's coordinates come from
+SOURCE_GPS = "gps"
+SOURCE_PROVINCE_CENTROID = "province_centroid"
+
+# Dimensions of the precomputed machine count rollup
+ROLLUP_DIMENSIONS = ("region", "area_group", "provinsi", "machine_status", "machine_type")
+
+
+def machine_coordinates(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Get machine coordinates for distance, cluster, heatmap and assignment computations
+    
+    Province centroids filled in for machines without a location are not
+    where the machine is, so those rows are not valid here; they are flagged
+    as approximate instead.
+    
+    Args:
+        df: Machine read view (see MachineService._enrich_coordinates)
+        
+    Returns:
+        Tuple of (latitudes, longitudes, valid mask, approximate mask)
+    """
+    columns = find_coordinate_columns(df)
+    if columns is None:
+        return np.full(len(df), np.nan), np.full(len(df), np.nan), np.zeros(len(df), dtype=bool), \
+            np.zeros(len(df), dtype=bool)
+    lat, lng, valid = coordinate_arrays(df[columns[0]], df[columns[1]])
+    if 'coordinate_source' in df.columns:
+        approximate = (df['coordinate_source'] == SOURCE_PROVINCE_CENTROID).to_numpy() & valid
+    else:
+        approximate = np.zeros(len(df), dtype=bool)
+    return lat, lng, valid & ~approximate, approximate
+
 
 class MachineService(BaseService):
     """Business logic for machine operations"""
@@ -13,20 +52,199 @@ class MachineService(BaseService):
             primary_key="wsid",
             entity_name="machine"
         )
+        self._centroids = province_centroids
+    
+    def _load_dataframe(self) -> pd.DataFrame:
+        """Read machines, dropping centroid coordinates that older versions saved into the CSV"""
+        df = super()._load_dataframe()
+        if 'coordinate_source' in df.columns:
+            lat_col, lng_col = find_coordinate_columns(df) or ('latitude', 'longitude')
+            derived = (df['coordinate_source'].astype(str) == SOURCE_PROVINCE_CENTROID).to_numpy()
+            for col in (lat_col, lng_col):
+                if col in df.columns:
+                    df.loc[derived, col] = np.nan
+            df = df.drop(columns='coordinate_source')
+        return df
+    
+    def _get_stored_frame(self) -> pd.DataFrame:
+        """Get machines as stored in the CSV, without derived coordinates (shared, must not be modified)"""
+        return self._cache.get("stored_dataframe", get_file_version(self.file_path), self._load_dataframe)
+    
+    def _get_stored_dataframe(self) -> pd.DataFrame:
+        """Get machines as stored, so writes don't save centroid coordinates as real ones"""
+        if not os.path.exists(self.file_path):
+            raise FileNotFoundError(f"{self.entity_name.capitalize()} data not found")
+        return self._get_stored_frame().copy()
+    
+    def _build_dataframe(self) -> pd.DataFrame:
+        """Build the shared read view: stored machines with missing coordinates filled in"""
+        return self._enrich_coordinates(self._get_stored_frame().copy())
+    
+    def _enrich_coordinates(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fill missing machine coordinates with the centroid of their province
+        
+        Rows with a valid location keep it (source "gps"); rows without one get
+        their province centroid (source "province_centroid"). Only the cached
+        read view is enriched; writes save the stored frame, and geo
+        computations leave centroid rows out (see machine_coordinates).
+        
+        Args:
+            df: Normalized machine DataFrame (modified in place)
+            
+        Returns:
+            DataFrame with latitude/longitude and coordinate_source columns
+        """
+        if 'provinsi' not in df.columns:
+            return df
+        lat_col, lng_col = find_coordinate_columns(df) or ('latitude', 'longitude')
+        for col in (lat_col, lng_col):
+            if col not in df.columns:
+                df[col] = ""
+        
+        _, _, valid = coordinate_arrays(df[lat_col], df[lng_col])
+        centroid_lat, centroid_lng = self._centroids.locate(df['provinsi'])
+        fill = ~valid & centroid_lat.notna().to_numpy()
+        
+        df[lat_col] = df[lat_col].astype(object)
+        df[lng_col] = df[lng_col].astype(object)
+        df.loc[fill, lat_col] = centroid_lat[fill]
+        df.loc[fill, lng_col] = centroid_lng[fill]
+        df['coordinate_source'] = np.select([valid, fill], [SOURCE_GPS, SOURCE_PROVINCE_CENTROID], default="")
+        return df
     
     def _validate(self, data: Dict[str, Any], is_create: bool = False) -> None:
         """Validate machine data"""
         validate_machine(data, is_create=is_create)
     
+    def get_rollup_table(self) -> Rollup:
+        """
+        Get machine counts by region x area_group x provinsi x status x type
+        
+        Built once per data version; writes through this service adjust it
+        instead of discarding it.
+        
+        Returns:
+            Rollup (shared, do not modify)
+        """
+        return self._cache.get("rollup", self.get_data_version(),
+                               lambda: Rollup.from_frame(self._get_cached_dataframe(), ROLLUP_DIMENSIONS))
+    
+    def _current_rollup(self) -> Optional[Rollup]:
+        """Get the rollup if it is built and matches the file (None otherwise)"""
+        if not os.path.exists(self.file_path):
+            return None
+        entry = self._cache.peek("rollup")
+        if entry is None or entry[0] != self.get_data_version():
+            return None
+        return entry[1]
+    
+    def _rollup_keys_for(self, rollup: Rollup, key_values: Iterable[Any]) -> List[RollupKey]:
+        """Get rollup keys of the current rows with the given primary keys"""
+        df = self._get_cached_dataframe()
+        return rollup.keys_from_frame(df[df[self.primary_key].isin(list(key_values))])
+    
+    def _store_rollup(self, rollup: Optional[Rollup], removed: List[RollupKey], records: List[Dict[str, Any]]) -> None:
+        """
+        Apply a write to a copy of the rollup and cache it for the new file version
+        
+        Args:
+            rollup: Rollup before the write (None = not built, nothing to do)
+            removed: Keys of rows removed or replaced by the write
+            records: Rows added by the write
+        """
+        if rollup is None:
+            return
+        added_columns = {col for record in records for col, value in record.items() if value not in (None, "")}
+        if (set(ROLLUP_DIMENSIONS) - rollup.present) & added_columns:
+            # A new dimension column appeared; rebuild on next read instead
+            return
+        updated = rollup.copy()
+        updated.add(removed, -1)
+        updated.add(rollup.key(record) for record in records)
+        self._cache.set("rollup", self.get_data_version(), updated)
+    
+    def create(self, entity_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create machine and count it in the rollup"""
+        rollup = self._current_rollup()
+        result = super().create(entity_data)
+        self._store_rollup(rollup, [], [entity_data])
+        return result
+    
+    def update(self, key_value: str, updated_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Update machine and move it between rollup cells"""
+        rollup = self._current_rollup()
+        if rollup is not None:
+            df = self._get_cached_dataframe()
+            rows = df[df[self.primary_key] == key_value]
+            removed = rollup.keys_from_frame(rows)
+            records = [
+                {**row, **{k: v for k, v in updated_data.items() if k in df.columns}}
+                for row in rows[[dim for dim in ROLLUP_DIMENSIONS if dim in df.columns]].to_dict(orient="records")
+            ]
+        result = super().update(key_value, updated_data)
+        if rollup is not None:
+            self._store_rollup(rollup, removed, records)
+        return result
+    
+    def delete(self, key_value: str) -> Dict[str, Any]:
+        """Delete machine and uncount it from the rollup"""
+        rollup = self._current_rollup()
+        removed = self._rollup_keys_for(rollup, [key_value]) if rollup is not None else []
+        result = super().delete(key_value)
+        self._store_rollup(rollup, removed, [])
+        return result
+    
+    def bulk_upsert(self, entities_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Bulk upsert machines and adjust the rollup for replaced and added rows"""
+        rollup = self._current_rollup()
+        if rollup is not None:
+            df = self._get_cached_dataframe()
+            if self.primary_key not in df.columns or not df[self.primary_key].is_unique:
+                # bulk_upsert would also collapse existing duplicates; rebuild instead
+                rollup = None
+            else:
+                latest = {entity.get(self.primary_key): entity for entity in entities_data}
+                removed = self._rollup_keys_for(rollup, latest)
+        result = super().bulk_upsert(entities_data)
+        if rollup is not None:
+            self._store_rollup(rollup, removed, list(latest.values()))
+        return result
+    
+    def get_rollup(self, group_by: Iterable[str] = (), filters: Optional[Dict[str, Iterable[str]]] = None
+                   ) -> Dict[str, Any]:
+        """
+        Drill down machine counts from the rollup
+        
+        Args:
+            group_by: Dimensions to group by (see ROLLUP_DIMENSIONS)
+            filters: Dimension -> accepted values
+            
+        Returns:
+            Dictionary with dimensions, total (after filters) and rows
+            
+        Raises:
+            ValueError: If a dimension is unknown
+        """
+        rollup = self.get_rollup_table()
+        rows = rollup.query(list(group_by), filters)
+        return {
+            "dimensions": list(ROLLUP_DIMENSIONS),
+            "group_by": list(group_by),
+            "filters": {dim: list(values) for dim, values in (filters or {}).items()},
+            "total": sum(row["count"] for row in rows),
+            "rows": rows,
+        }
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Get machine statistics"""
-        df = self._get_dataframe()
+        rollup = self.get_rollup_table()
         
         stats = {
-            "total_machines": len(df),
-            "by_region": df['region'].value_counts().to_dict() if 'region' in df.columns else {},
-            "by_status": df['machine_status'].value_counts().to_dict() if 'machine_status' in df.columns else {},
-            "by_type": df['machine_type'].value_counts().to_dict() if 'machine_type' in df.columns else {},
+            "total_machines": rollup.total,
+            "by_region": rollup.counts_by('region') if 'region' in rollup.present else {},
+            "by_status": rollup.counts_by('machine_status') if 'machine_status' in rollup.present else {},
+            "by_type": rollup.counts_by('machine_type') if 'machine_type' in rollup.present else {},
         }
         
-        return stats
\ No newline at end of file
+        return stats
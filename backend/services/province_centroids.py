@@ -0,0 +1,136 @@
+"""
+Province Centroids - Province centroid lookup for machine geo-enrichment
+Centroids are computed from the Indonesia provinces GeoJSON at build time
+(scripts/build_province_centroids.py) into centroid/province_centroids.csv,
+which is committed and shipped with the backend
+"""
+import csv
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+import pandas as pd
+from config import Config
+from backend.utils.data_cache import get_file_version
+from backend.utils.geo_utils import canonical_province_keys, polygon_centroid, province_key
+
+LOOKUP_COLUMNS = ["provinsi_key", "provinsi", "latitude", "longitude"]
+
+
+class ProvinceCentroids:
+    """
+    Province name -> centroid lookup
+
+    The lookup CSV is read once and kept in memory (re-read if it changes).
+    It is never written on the read path; if it is missing, centroids are
+    computed from the GeoJSON in memory, and a warning is logged.
+    """
+
+    def __init__(self, geojson_path: Optional[str] = None, lookup_path: Optional[str] = None,
+                 name_property: str = "Propinsi"):
+        """
+        Initialize lookup
+
+        Args:
+            geojson_path: Provinces GeoJSON (default: centroid/indonesia-prov.geojson)
+            lookup_path: Lookup CSV path (default: centroid/province_centroids.csv)
+            name_property: GeoJSON feature property holding the province name
+        """
+        self.geojson_path = geojson_path or os.path.join(Config.BASE_DIR, "centroid", "indonesia-prov.geojson")
+        self.lookup_path = lookup_path or os.path.join(Config.BASE_DIR, "centroid", "province_centroids.csv")
+        self.name_property = name_property
+        self._lock = threading.RLock()
+        self._version = None
+        self._lookup: Optional[Dict[str, Tuple[float, float]]] = None
+
+    def compute(self) -> List[List[Any]]:
+        """
+        Compute centroids from the GeoJSON
+
+        Returns:
+            Lookup rows (LOOKUP_COLUMNS)
+
+        Raises:
+            FileNotFoundError: If the GeoJSON doesn't exist
+        """
+        if not os.path.exists(self.geojson_path):
+            raise FileNotFoundError(f"Province GeoJSON not found: {self.geojson_path}")
+        with open(self.geojson_path, encoding="utf-8") as f:
+            features = json.load(f).get("features", [])
+
+        rows = []
+        for feature in features:
+            name = (feature.get("properties") or {}).get(self.name_property)
+            centroid = polygon_centroid(feature.get("geometry") or {})
+            if name and centroid is not None:
+                rows.append([province_key(name), name, round(centroid[0], 6), round(centroid[1], 6)])
+        return rows
+
+    def rebuild(self) -> Dict[str, Tuple[float, float]]:
+        """
+        Compute centroids from the GeoJSON and rewrite the lookup CSV (build step)
+
+        Returns:
+            Dictionary mapping province key to (latitude, longitude)
+
+        Raises:
+            FileNotFoundError: If the GeoJSON doesn't exist
+        """
+        rows = self.compute()
+        with self._lock:
+            tmp_path = self.lookup_path + ".tmp"
+            with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(LOOKUP_COLUMNS)
+                writer.writerows(rows)
+            os.replace(tmp_path, self.lookup_path)
+            print(f"[INFO] Computed {len(rows)} province centroids into {self.lookup_path}")
+            self._lookup = None
+            return self.get_lookup()
+
+    def get_lookup(self) -> Dict[str, Tuple[float, float]]:
+        """
+        Get province centroids
+
+        Returns:
+            Dictionary mapping province key to (latitude, longitude)
+            (empty, with an error logged, if neither lookup CSV nor GeoJSON exist)
+        """
+        with self._lock:
+            version = get_file_version(self.lookup_path)
+            if self._lookup is not None and self._version == version:
+                return self._lookup
+            if version is not None:
+                df = pd.read_csv(self.lookup_path, dtype={"provinsi_key": str})
+                rows = zip(df["provinsi_key"], df["latitude"], df["longitude"])
+            elif os.path.exists(self.geojson_path):
+                print(f"[WARNING] Province centroid lookup not found: {self.lookup_path}; computing it from "
+                      f"the GeoJSON (run scripts/build_province_centroids.py to ship it)")
+                rows = ((key, lat, lng) for key, _, lat, lng in self.compute())
+            else:
+                print(f"[ERROR] Province centroid lookup not found: {self.lookup_path} (and no GeoJSON at "
+                      f"{self.geojson_path}); machines without coordinates can't be placed")
+                rows = ()
+            self._lookup = {key: (float(lat), float(lng)) for key, lat, lng in rows}
+            self._version = version
+            return self._lookup
+
+    def locate(self, provinces: pd.Series) -> Tuple[pd.Series, pd.Series]:
+        """
+        Map province names to centroid coordinates (vectorized)
+
+        Args:
+            provinces: Province names as found in the data
+
+        Returns:
+            Tuple of (latitudes, longitudes) aligned with provinces; NaN if unknown
+        """
+        lookup = self.get_lookup()
+        keys = canonical_province_keys(provinces)
+        latitudes = keys.map({key: lat for key, (lat, _) in lookup.items()})
+        longitudes = keys.map({key: lng for key, (_, lng) in lookup.items()})
+        return latitudes.astype(float), longitudes.astype(float)
+
+
+# Shared lookup used by the machine service
+province_centroids = ProvinceCentroids()
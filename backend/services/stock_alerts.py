@@ -0,0 +1,293 @@
+"""
+Stock Alerts - Reorder thresholds and low-stock alert queue
+Thresholds are configured per part, per FSL, or as a default and stored in
+stock_thresholds.csv; crossings are queued in memory for polling or SSE
+"""
+import csv
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import pandas as pd
+from config import Config
+
+THRESHOLD_SCOPES = ("part", "fsl", "default")
+
+DEFAULT_THRESHOLD = 10
+
+# Alerts kept in memory for polling clients
+MAX_ALERTS = 1000
+
+
+def alert_key(part_number: Any, fsl: Any) -> Tuple[str, str]:
+    """
+    Get the key alert state is tracked by (a part may be stocked in several FSLs)
+
+    Args:
+        part_number: Part number
+        fsl: FSL holding the part
+
+    Returns:
+        Tuple of (part number, FSL name)
+    """
+    return str(part_number).strip(), "" if fsl is None or pd.isna(fsl) else str(fsl)
+
+
+class StockAlertEngine:
+    """
+    Tracks which parts are below their reorder threshold and queues crossings
+
+    State is kept per (part number, FSL), so the same part in two FSLs is
+    tracked (and alerted) separately. Effective threshold of a part: its own
+    threshold, else its FSL's, else the default. The engine is primed with the
+    current low/ok state of every part; after that, only parts touched by a
+    write are re-evaluated.
+    """
+
+    def __init__(self, thresholds_path: Optional[str] = None, max_alerts: int = MAX_ALERTS):
+        """
+        Initialize engine
+
+        Args:
+            thresholds_path: Thresholds CSV path (default: DATA_DIR/stock_thresholds.csv)
+            max_alerts: Number of alerts kept in the queue
+        """
+        self.thresholds_path = thresholds_path or os.path.join(Config.DATA_DIR, "stock_thresholds.csv")
+        self._condition = threading.Condition(threading.RLock())
+        self._thresholds: Optional[Dict[str, Any]] = None
+        self._states: Optional[Dict[Tuple[str, str], bool]] = None
+        self._alerts: deque = deque(maxlen=max_alerts)
+        self._last_id = 0
+        # Data version the states were last reconciled with (set by the service)
+        self.synced_version: Any = None
+
+    def _load_thresholds(self) -> Dict[str, Any]:
+        """Read thresholds CSV once"""
+        with self._condition:
+            if self._thresholds is None:
+                thresholds = {"default": DEFAULT_THRESHOLD, "fsl": {}, "part": {}}
+                if os.path.exists(self.thresholds_path):
+                    with open(self.thresholds_path, newline="", encoding="utf-8") as f:
+                        for row in csv.DictReader(f):
+                            value = float(row["threshold"])
+                            if row["scope"] == "default":
+                                thresholds["default"] = value
+                            elif row["scope"] in ("fsl", "part"):
+                                thresholds[row["scope"]][row["key"]] = value
+                self._thresholds = thresholds
+            return self._thresholds
+
+    def _save_thresholds(self) -> None:
+        """Rewrite thresholds CSV"""
+        thresholds = self._thresholds
+        tmp_path = self.thresholds_path + ".tmp"
+        with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["scope", "key", "threshold"])
+            writer.writerow(["default", "", thresholds["default"]])
+            for scope in ("fsl", "part"):
+                for key, value in thresholds[scope].items():
+                    writer.writerow([scope, key, value])
+        os.replace(tmp_path, self.thresholds_path)
+
+    def get_thresholds(self) -> Dict[str, Any]:
+        """
+        Get configured thresholds
+
+        Returns:
+            Dictionary with "default", "fsl" and "part" thresholds
+        """
+        with self._condition:
+            thresholds = self._load_thresholds()
+            return {"default": thresholds["default"], "fsl": dict(thresholds["fsl"]),
+                    "part": dict(thresholds["part"])}
+
+    def set_threshold(self, scope: str, key: Optional[str], threshold: Optional[float]) -> None:
+        """
+        Set or remove a threshold
+
+        Args:
+            scope: "part", "fsl" or "default"
+            key: Part number or FSL name (ignored for default)
+            threshold: Reorder threshold, or None to remove a part/FSL threshold
+
+        Raises:
+            ValueError: If scope, key or threshold is invalid
+        """
+        if scope not in THRESHOLD_SCOPES:
+            raise ValueError(f"Invalid scope '{scope}'. Use one of: {', '.join(THRESHOLD_SCOPES)}")
+        if scope != "default" and not key:
+            raise ValueError(f"key is required for {scope} thresholds")
+        if threshold is not None:
+            try:
+                threshold = float(threshold)
+            except (ValueError, TypeError):
+                raise ValueError("Threshold must be a number")
+            if threshold < 0:
+                raise ValueError("Threshold must not be negative")
+        elif scope == "default":
+            raise ValueError("Default threshold cannot be removed")
+
+        with self._condition:
+            thresholds = self._load_thresholds()
+            if scope == "default":
+                thresholds["default"] = threshold
+            elif threshold is None:
+                thresholds[scope].pop(str(key), None)
+            else:
+                thresholds[scope][str(key)] = threshold
+            self._save_thresholds()
+
+    def threshold_for(self, part_number: str, fsl: Any) -> float:
+        """
+        Get effective threshold of one part
+
+        Args:
+            part_number: Part number
+            fsl: Part's FSL
+
+        Returns:
+            Reorder threshold
+        """
+        thresholds = self._load_thresholds()
+        if part_number in thresholds["part"]:
+            return thresholds["part"][part_number]
+        return thresholds["fsl"].get(str(fsl), thresholds["default"])
+
+    def effective_thresholds(self, part_numbers: pd.Series, fsls: pd.Series) -> pd.Series:
+        """
+        Get effective thresholds for many parts (vectorized)
+
+        Args:
+            part_numbers: Part numbers as strings
+            fsls: FSL of each part
+
+        Returns:
+            Series of thresholds aligned with part_numbers
+        """
+        thresholds = self._load_thresholds()
+        result = part_numbers.map(thresholds["part"])
+        result = result.fillna(fsls.astype(str).map(thresholds["fsl"]))
+        return result.fillna(thresholds["default"]).astype(float)
+
+    @property
+    def is_primed(self) -> bool:
+        return self._states is not None
+
+    def get_state(self, key: Tuple[str, str]) -> Optional[bool]:
+        """
+        Get last known low-stock state of a part in one FSL
+
+        Args:
+            key: (part number, FSL) from alert_key()
+
+        Returns:
+            True if low, False if ok, None if unknown
+        """
+        with self._condition:
+            return (self._states or {}).get(key)
+
+    def prime(self, states: Dict[Tuple[str, str], bool]) -> None:
+        """
+        Set the baseline low-stock state of every part (no alerts are raised)
+
+        Args:
+            states: Dictionary mapping (part number, FSL) to whether it is low
+        """
+        with self._condition:
+            self._states = dict(states)
+
+    def evaluate(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Re-evaluate parts after a stock change and queue threshold crossings
+
+        Args:
+            rows: Dictionaries with part_number, part_name, fsl and qty
+
+        Returns:
+            Newly queued alerts
+        """
+        new_alerts = []
+        with self._condition:
+            if self._states is None:
+                self._states = {}
+            for row in rows:
+                key = alert_key(row["part_number"], row.get("fsl"))
+                part_number = key[0]
+                qty = row.get("qty")
+                threshold = self.threshold_for(part_number, row.get("fsl"))
+                low = bool(pd.notna(qty) and qty < threshold)
+                previous = self._states.get(key)
+                self._states[key] = low
+                if previous == low or (previous is None and not low):
+                    continue
+                self._last_id += 1
+                alert = {
+                    "id": self._last_id,
+                    "type": "low_stock" if low else "restocked",
+                    "part_number": part_number,
+                    "part_name": row.get("part_name"),
+                    "fsl": row.get("fsl"),
+                    "qty": qty,
+                    "threshold": threshold,
+                    "timestamp": datetime.now().isoformat(timespec="seconds"),
+                }
+                self._alerts.append(alert)
+                new_alerts.append(alert)
+            if new_alerts:
+                self._condition.notify_all()
+        return new_alerts
+
+    def forget(self, part_numbers: Iterable[Any], keep: Iterable[Tuple[str, str]] = ()) -> None:
+        """
+        Drop state of deleted parts
+
+        Args:
+            part_numbers: Part numbers whose state is dropped in every FSL
+            keep: (part number, FSL) keys that still exist and keep their state
+        """
+        part_numbers = {str(part_number).strip() for part_number in part_numbers}
+        keep = set(keep)
+        with self._condition:
+            if self._states:
+                for key in [key for key in self._states if key[0] in part_numbers and key not in keep]:
+                    del self._states[key]
+
+    @property
+    def last_id(self) -> int:
+        return self._last_id
+
+    def get_alerts(self, since: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get queued alerts newer than an alert id, oldest first
+
+        Args:
+            since: Last alert id the client has seen
+            limit: Maximum number of alerts
+
+        Returns:
+            List of alerts
+        """
+        with self._condition:
+            alerts = [dict(alert) for alert in self._alerts if alert["id"] > since]
+        return alerts[:limit] if limit is not None else alerts
+
+    def wait_for_alerts(self, since: int, timeout: float) -> List[Dict[str, Any]]:
+        """
+        Block until alerts newer than since are queued, or timeout
+
+        Args:
+            since: Last alert id the client has seen
+            timeout: Seconds to wait
+
+        Returns:
+            New alerts (empty on timeout)
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._last_id > since, timeout=timeout)
+            return self.get_alerts(since)
+
+
+# Shared engine used by the stock part service
+stock_alerts = StockAlertEngine()
@@ -0,0 +1,210 @@
+"""
+Stock Ledger - Append-only stock movement log
+Stores in/out/adjust movements in stock_movements.csv and keeps the
+not-yet-checkpointed deltas per item in memory
+"""
+import csv
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from config import Config
+
+MOVEMENT_TYPES = ("in", "out", "adjust")
+
+LEDGER_COLUMNS = [
+    "movement_id", "timestamp", "resource", "item", "bucket",
+    "movement_type", "quantity", "balance", "actor", "note",
+]
+
+
+class StockLedger:
+    """
+    Append-only ledger of stock movements
+
+    Movements are appended to the ledger CSV (never rewritten). Deltas recorded
+    after a resource's last checkpoint are "pending": they are overlaid on the
+    stock CSV when it is read and folded into it when the resource is
+    checkpointed (the checkpoint position is kept in a small JSON file).
+    """
+
+    def __init__(self, file_path: Optional[str] = None, checkpoint_path: Optional[str] = None):
+        """
+        Initialize ledger
+
+        Args:
+            file_path: Ledger CSV path (default: DATA_DIR/stock_movements.csv)
+            checkpoint_path: Checkpoint JSON path (default: next to the ledger)
+        """
+        self.file_path = file_path or os.path.join(Config.DATA_DIR, "stock_movements.csv")
+        self.checkpoint_path = checkpoint_path or os.path.splitext(self.file_path)[0] + "_checkpoint.json"
+        self.lock = threading.RLock()
+        self._loaded = False
+        self._movements: List[Dict[str, Any]] = []
+        self._checkpoints: Dict[str, int] = {}
+        self._pending: Dict[str, Dict[Tuple[str, str], int]] = {}
+        self._versions: Dict[str, int] = {}
+
+    def _load(self) -> None:
+        """Read ledger and checkpoint files once, replaying pending deltas"""
+        if self._loaded:
+            return
+        with self.lock:
+            if self._loaded:
+                return
+            if os.path.exists(self.checkpoint_path):
+                with open(self.checkpoint_path, encoding="utf-8") as f:
+                    self._checkpoints = {k: int(v) for k, v in json.load(f).items()}
+            if os.path.exists(self.file_path):
+                with open(self.file_path, newline="", encoding="utf-8") as f:
+                    for row in csv.DictReader(f):
+                        row["movement_id"] = int(row["movement_id"])
+                        row["quantity"] = int(row["quantity"])
+                        row["balance"] = int(row["balance"])
+                        self._track(row)
+            self._loaded = True
+
+    def _track(self, movement: Dict[str, Any]) -> None:
+        """Add a movement to the in-memory history and pending deltas"""
+        self._movements.append(movement)
+        resource = movement["resource"]
+        self._versions[resource] = movement["movement_id"]
+        if movement["movement_id"] > self._checkpoints.get(resource, 0):
+            pending = self._pending.setdefault(resource, {})
+            key = (movement["item"], movement["bucket"])
+            pending[key] = pending.get(key, 0) + movement["quantity"]
+
+    def get_version(self, resource: str) -> int:
+        """
+        Get id of the last movement recorded for a resource
+
+        Args:
+            resource: Resource name (e.g., "tools", "stock-parts")
+
+        Returns:
+            Movement id, or 0 if none
+        """
+        self._load()
+        return self._versions.get(resource, 0)
+
+    def get_pending(self, resource: str) -> Dict[Tuple[str, str], int]:
+        """
+        Get deltas recorded since the resource's last checkpoint
+
+        Args:
+            resource: Resource name
+
+        Returns:
+            Dictionary mapping (item, bucket) to summed quantity delta
+        """
+        self._load()
+        with self.lock:
+            return dict(self._pending.get(resource, {}))
+
+    def get_pending_delta(self, resource: str, item: str, bucket: str) -> int:
+        """
+        Get pending delta of one item bucket
+
+        Args:
+            resource: Resource name
+            item: Item key
+            bucket: Stock bucket
+
+        Returns:
+            Summed quantity delta since the last checkpoint
+        """
+        self._load()
+        with self.lock:
+            return self._pending.get(resource, {}).get((item, bucket), 0)
+
+    def append(self, resource: str, item: str, bucket: str, movement_type: str,
+               quantity: int, balance: int, actor: str = "", note: str = "") -> Dict[str, Any]:
+        """
+        Append a movement
+
+        Args:
+            resource: Resource name
+            item: Item key (tool name or part number)
+            bucket: Stock bucket (e.g., "new", "old", "qty")
+            movement_type: One of MOVEMENT_TYPES
+            quantity: Signed quantity delta
+            balance: Bucket balance after the movement
+            actor: Who made the change
+            note: Free-text note
+
+        Returns:
+            Recorded movement as dictionary
+        """
+        self._load()
+        with self.lock:
+            movement = {
+                "movement_id": (self._movements[-1]["movement_id"] if self._movements else 0) + 1,
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "resource": resource,
+                "item": item,
+                "bucket": bucket,
+                "movement_type": movement_type,
+                "quantity": int(quantity),
+                "balance": int(balance),
+                "actor": actor,
+                "note": note,
+            }
+            write_header = not os.path.exists(self.file_path)
+            with open(self.file_path, "a", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=LEDGER_COLUMNS)
+                if write_header:
+                    writer.writeheader()
+                writer.writerow(movement)
+            self._track(movement)
+            return dict(movement)
+
+    def mark_checkpoint(self, resource: str) -> int:
+        """
+        Record that all pending deltas of a resource were folded into its CSV
+
+        Args:
+            resource: Resource name
+
+        Returns:
+            Movement id of the checkpoint
+        """
+        self._load()
+        with self.lock:
+            self._checkpoints[resource] = self._versions.get(resource, 0)
+            self._pending.pop(resource, None)
+            tmp_path = self.checkpoint_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._checkpoints, f)
+            os.replace(tmp_path, self.checkpoint_path)
+            return self._checkpoints[resource]
+
+    def get_movements(self, resource: Optional[str] = None, item: Optional[str] = None,
+                      limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get movement history, newest first
+
+        Args:
+            resource: Filter by resource
+            item: Filter by item key
+            limit: Maximum number of movements
+
+        Returns:
+            List of movements
+        """
+        self._load()
+        with self.lock:
+            result = []
+            for movement in reversed(self._movements):
+                if resource and movement["resource"] != resource:
+                    continue
+                if item and movement["item"] != item:
+                    continue
+                result.append(dict(movement))
+                if limit is not None and len(result) >= limit:
+                    break
+            return result
+
+
+# Shared ledger used by all stock services
+stock_ledger = StockLedger()
@@ -0,0 +1,386 @@
+"""
+Stock Ledger Mixin - Ledger-backed stock for CSV services
+Overlays pending stock movements on the CSV contents and records movements
+as ledger appends; used by the tool and stock part services only
+"""
+import os
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import pandas as pd
+from backend.utils.data_cache import get_file_version
+from backend.services.stock_ledger import stock_ledger, MOVEMENT_TYPES, StockLedger
+
+# Separates item and scope in scoped ledger keys (e.g. "P-100@FSL Jakarta")
+LEDGER_SCOPE_SEPARATOR = "@"
+
+
+class StockLedgerMixin:
+    """
+    Stock tracking through the stock ledger for a BaseService subclass
+    
+    List it before BaseService in the class bases and set LEDGER_RESOURCE
+    and LEDGER_BUCKETS. When the same item can appear in several rows (a
+    part stocked in several FSLs), set LEDGER_SCOPE_COLUMN: ledger keys then
+    become "<item>@<scope>", and a movement for an item held in more than one
+    scope must name the scope.
+    """
+    
+    # Stock ledger resource name
+    LEDGER_RESOURCE: str = ""
+    
+    # Ledger bucket -> columns a movement adjusts (the first holds the bucket balance)
+    LEDGER_BUCKETS: Dict[str, tuple] = {}
+    
+    # Column that, with the item, identifies a row in the ledger (None if items are unique)
+    LEDGER_SCOPE_COLUMN: Optional[str] = None
+    
+    _ledger: StockLedger = stock_ledger
+    
+    def get_data_version(self) -> Any:
+        """
+        Get version stamp of the backing CSV file and the resource's last movement
+        
+        The last movement id is included so cached views refresh after each
+        stock movement.
+        
+        Returns:
+            Tuple of (CSV file version, last movement id)
+        """
+        return (get_file_version(self.file_path), self._ledger.get_version(self.LEDGER_RESOURCE))
+    
+    def get_data_files(self) -> List[str]:
+        """
+        Get paths of the files the data is read from
+        
+        Returns:
+            CSV path and stock ledger path
+        """
+        return [self.file_path, self._ledger.file_path]
+    
+    def _build_dataframe(self) -> pd.DataFrame:
+        """
+        Build the shared dataframe (CSV contents plus pending stock movements)
+        
+        Returns:
+            Normalized DataFrame
+        """
+        return self._apply_pending_movements(self._get_base_dataframe().copy())
+    
+    def _get_base_dataframe(self) -> pd.DataFrame:
+        """
+        Get CSV contents without pending stock movements (shared, must not be modified)
+        
+        Returns:
+            Normalized DataFrame, cached per file version
+        """
+        return self._cache.get("base_dataframe", get_file_version(self.file_path), self._load_dataframe)
+    
+    @staticmethod
+    def _parse_stock_value(value: Any) -> int:
+        """Parse a stock count, return 0 if invalid"""
+        try:
+            if pd.isna(value) or value == '':
+                return 0
+            return int(float(str(value).strip()))
+        except (ValueError, TypeError):
+            return 0
+    
+    def _ledger_key_column(self, df: pd.DataFrame) -> str:
+        """
+        Get column identifying items in the stock ledger
+        
+        Args:
+            df: Normalized DataFrame
+            
+        Returns:
+            Column name
+        """
+        return self.primary_key
+    
+    def _ledger_item_key(self, value: Any) -> str:
+        """
+        Normalize an item identifier for the stock ledger
+        
+        Args:
+            value: Raw item identifier
+            
+        Returns:
+            Ledger item key
+        """
+        return str(value).strip()
+    
+    @staticmethod
+    def _scope_value(scope: Any) -> Optional[str]:
+        """Normalize a scope value (None if missing or blank)"""
+        if scope is None or (not isinstance(scope, str) and pd.isna(scope)):
+            return None
+        return str(scope).strip() or None
+    
+    def ledger_item(self, item: Any, scope: Any = None) -> str:
+        """
+        Build the ledger key of an item, scoped when LEDGER_SCOPE_COLUMN is set
+        
+        Args:
+            item: Item identifier
+            scope: Value of LEDGER_SCOPE_COLUMN (e.g. FSL name)
+            
+        Returns:
+            Ledger item key
+        """
+        key = self._ledger_item_key(item)
+        scope = self._scope_value(scope) if self.LEDGER_SCOPE_COLUMN else None
+        return f"{key}{LEDGER_SCOPE_SEPARATOR}{scope}" if scope else key
+    
+    def _get_ledger_index(self) -> Tuple[Dict[str, Any], Dict[str, List[Tuple[str, Any]]]]:
+        """
+        Get hash indexes of the ledger keys in the CSV contents
+        
+        Returns:
+            Tuple of (ledger key -> row label of its first occurrence,
+            item key -> [(ledger key, scope value)] of every scope holding it)
+        """
+        def build() -> Tuple[Dict[str, Any], Dict[str, List[Tuple[str, Any]]]]:
+            df = self._get_base_dataframe()
+            column = self._ledger_key_column(df)
+            if column not in df.columns:
+                return {}, {}
+            scope_column = self.LEDGER_SCOPE_COLUMN
+            scopes = df[scope_column] if scope_column in df.columns else pd.Series(None, index=df.index)
+            labels: Dict[str, Any] = {}
+            by_item: Dict[str, List[Tuple[str, Any]]] = {}
+            for label, value, scope in zip(df.index, df[column], scopes):
+                if pd.isna(value):
+                    continue
+                key = self.ledger_item(value, scope)
+                if key not in labels:
+                    labels[key] = label
+                    by_item.setdefault(self._ledger_item_key(value), []).append((key, scope))
+            return labels, by_item
+        
+        return self._cache.get("ledger_index", get_file_version(self.file_path), build)
+    
+    def _get_ledger_item_labels(self) -> Dict[str, Any]:
+        """
+        Get hash index of ledger item key -> row label
+        
+        Returns:
+            Dictionary mapping each ledger key (first occurrence) to its row label
+        """
+        return self._get_ledger_index()[0]
+    
+    def _apply_pending_movements(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Overlay stock movements recorded since the last checkpoint
+        
+        Args:
+            df: DataFrame with CSV contents (modified in place)
+            
+        Returns:
+            DataFrame with current stock
+        """
+        pending = self._ledger.get_pending(self.LEDGER_RESOURCE)
+        if not pending or df.empty:
+            return df
+        labels = self._get_ledger_item_labels()
+        for (item, bucket), delta in pending.items():
+            label = labels.get(item)
+            if label is None:
+                # Item was removed from the CSV after the movement
+                continue
+            for column in self.LEDGER_BUCKETS.get(bucket, ()):
+                if column in df.columns:
+                    df.at[label, column] = self._parse_stock_value(df.at[label, column]) + delta
+        return df
+    
+    def _resolve_ledger_item(self, item: Any, scope: Optional[str] = None) -> Optional[str]:
+        """
+        Resolve an item identifier to its ledger key
+        
+        Args:
+            item: Item identifier (or ledger key) from the request
+            scope: Value of LEDGER_SCOPE_COLUMN, needed when the item is held in several scopes
+            
+        Returns:
+            Ledger item key, or None if the item doesn't exist
+            
+        Raises:
+            ValueError: If no scope is given and the item is held in several scopes
+        """
+        labels, by_item = self._get_ledger_index()
+        if scope:
+            key = self.ledger_item(item, scope)
+            return key if key in labels else None
+        key = self._ledger_item_key(item)
+        matches = by_item.get(key, []) if self.LEDGER_SCOPE_COLUMN else []
+        if len(matches) > 1:
+            scopes = ", ".join(str(value) for _, value in matches)
+            raise ValueError(f"{self.entity_name.capitalize()} '{item}' is stocked in several "
+                             f"{self.LEDGER_SCOPE_COLUMN} ({scopes}); specify {self.LEDGER_SCOPE_COLUMN}")
+        if matches:
+            return matches[0][0]
+        return key if key in labels else None
+    
+    def _check_scope(self, scope: Any) -> Optional[str]:
+        """
+        Normalize the scope of a request
+        
+        Args:
+            scope: Scope from the request (e.g. FSL name)
+            
+        Returns:
+            Scope, or None if not given
+            
+        Raises:
+            ValueError: If a scope is given but the resource isn't scoped
+        """
+        scope = self._scope_value(scope)
+        if scope and not self.LEDGER_SCOPE_COLUMN:
+            raise ValueError(f"{self.entity_name.capitalize()} stock is not tracked per location")
+        return scope
+    
+    def _current_bucket_value(self, key: str, bucket: str) -> int:
+        """Get current stock of one bucket (CSV value plus pending delta)"""
+        df = self._get_base_dataframe()
+        column = self.LEDGER_BUCKETS[bucket][0]
+        label = self._get_ledger_item_labels()[key]
+        pending = self._ledger.get_pending_delta(self.LEDGER_RESOURCE, key, bucket)
+        return self._parse_stock_value(df.at[label, column]) + pending
+    
+    def get_current_stock(self, item: Any, scope: Any = None) -> Dict[str, Any]:
+        """
+        Get current stock of an item from the materialized ledger view
+        
+        Args:
+            item: Item identifier
+            scope: Value of LEDGER_SCOPE_COLUMN (required if the item is held in several)
+            
+        Returns:
+            Dictionary with the ledger key, the scope (if scoped) and one balance per bucket
+            
+        Raises:
+            ValueError: If the item doesn't exist or is ambiguous
+        """
+        if not os.path.exists(self.file_path):
+            raise FileNotFoundError(f"{self.entity_name.capitalize()} data not found")
+        key = self._resolve_ledger_item(item, self._check_scope(scope))
+        if key is None:
+            raise ValueError(f"{self.entity_name.capitalize()} '{item}' not found")
+        df = self._get_base_dataframe()
+        columns = df.columns
+        stock = {"item": key}
+        if self.LEDGER_SCOPE_COLUMN in columns:
+            stock[self.LEDGER_SCOPE_COLUMN] = df.at[self._get_ledger_item_labels()[key], self.LEDGER_SCOPE_COLUMN]
+        for bucket, bucket_columns in self.LEDGER_BUCKETS.items():
+            if bucket_columns[0] in columns:
+                stock[bucket] = self._current_bucket_value(key, bucket)
+        return stock
+    
+    def record_movement(self, item: Any, movement_type: str, quantity: Any, bucket: Optional[str] = None,
+                        actor: str = "", note: str = "", scope: Any = None) -> Dict[str, Any]:
+        """
+        Record a stock movement as a ledger append (the CSV file is not rewritten)
+        
+        Args:
+            item: Item identifier
+            movement_type: "in", "out" or "adjust"
+            quantity: Positive quantity for in/out, signed delta for adjust
+            bucket: Stock bucket (default: first of LEDGER_BUCKETS)
+            actor: Who made the change
+            note: Free-text note
+            scope: Value of LEDGER_SCOPE_COLUMN (required if the item is held in several)
+            
+        Returns:
+            Recorded movement, including the bucket balance after it
+            
+        Raises:
+            ValueError: If the movement is invalid, the item is ambiguous, or
+                the movement would make stock negative
+        """
+        if movement_type not in MOVEMENT_TYPES:
+            raise ValueError(f"Invalid movement type '{movement_type}'. Use one of: {', '.join(MOVEMENT_TYPES)}")
+        bucket = bucket or next(iter(self.LEDGER_BUCKETS))
+        if bucket not in self.LEDGER_BUCKETS:
+            raise ValueError(f"Invalid bucket '{bucket}'. Use one of: {', '.join(self.LEDGER_BUCKETS)}")
+        try:
+            quantity = int(str(quantity).strip())
+        except (ValueError, TypeError):
+            raise ValueError("Quantity must be a whole number")
+        if movement_type in ("in", "out") and quantity <= 0:
+            raise ValueError("Quantity must be greater than 0")
+        if movement_type == "adjust" and quantity == 0:
+            raise ValueError("Adjustment quantity must not be 0")
+        delta = -quantity if movement_type == "out" else quantity
+        scope = self._check_scope(scope)
+        
+        if not os.path.exists(self.file_path):
+            raise FileNotFoundError(f"{self.entity_name.capitalize()} data not found")
+        if self.LEDGER_BUCKETS[bucket][0] not in self._get_base_dataframe().columns:
+            raise ValueError(f"Bucket '{bucket}' is not available in {self.entity_name} data")
+        
+        with self._ledger.lock:
+            key = self._resolve_ledger_item(item, scope)
+            if key is None:
+                raise ValueError(f"{self.entity_name.capitalize()} '{item}' not found")
+            balance = self._current_bucket_value(key, bucket) + delta
+            if balance < 0:
+                raise ValueError(f"Insufficient stock for '{key}' ({bucket}): {balance - delta} available")
+            return self._ledger.append(self.LEDGER_RESOURCE, key, bucket, movement_type,
+                                       delta, balance, actor=actor, note=note)
+    
+    def checkpoint_stock(self) -> Dict[str, Any]:
+        """
+        Fold pending stock movements into the CSV file
+        
+        Returns:
+            Dictionary with the number of folded (item, bucket) balances
+        """
+        with self._ledger.lock:
+            pending = self._ledger.get_pending(self.LEDGER_RESOURCE)
+            if not pending:
+                return {"ok": True, "folded": 0}
+            df = self._get_stored_dataframe()
+            self._save_dataframe(df)
+            checkpoint = self._ledger.mark_checkpoint(self.LEDGER_RESOURCE)
+            self._invalidate_cache()
+        print(f"[INFO] Checkpointed {len(pending)} {self.entity_name} stock balances at movement {checkpoint}")
+        return {"ok": True, "folded": len(pending), "checkpoint": checkpoint}
+    
+    def replace_file(self, save: Callable[[str], None]) -> int:
+        """
+        Replace the CSV file with new contents (e.g. an upload), dropping pending movements
+        
+        The new file holds absolute stock counts, so movements recorded
+        before it must not be applied on top of it.
+        
+        Args:
+            save: Function writing the new contents to the given path
+            
+        Returns:
+            Number of discarded (item, bucket) deltas
+        """
+        with self._ledger.lock:
+            discarded = self._ledger.get_pending(self.LEDGER_RESOURCE)
+            if discarded:
+                # Checkpoint first so no read applies them to the new file
+                self._ledger.mark_checkpoint(self.LEDGER_RESOURCE)
+            save(self.file_path)
+            self._invalidate_cache()
+        if discarded:
+            print(f"[INFO] Discarded {len(discarded)} pending {self.entity_name} stock movements on file replace")
+        return len(discarded)
+    
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        """
+        Hold the ledger while a CRUD write reads, changes and rewrites the CSV file
+        
+        The frame being rewritten already includes pending movements, so that
+        single write folds them; they are checkpointed once it succeeds.
+        """
+        with self._ledger.lock:
+            folded = self._ledger.get_pending(self.LEDGER_RESOURCE)
+            yield
+            if folded:
+                self._ledger.mark_checkpoint(self.LEDGER_RESOURCE)
+                # Drop frames a concurrent read built with the movements applied twice
+                self._invalidate_cache()
@@ -1,36 +1,202 @@
-from typing import Dict, List, Any
+import os
+from typing import Dict, List, Any, Iterable, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
 from backend.services.base_service import BaseService
+from backend.services.stock_ledger_mixin import StockLedgerMixin
 from backend.utils.validators import validate_stock_part
 from backend.utils.helpers import count_by
+from backend.utils.csv_utils import paginate_frame
+from backend.services.stock_alerts import alert_key, stock_alerts
 
-class StockPartService(BaseService):
+class StockPartService(StockLedgerMixin, BaseService):
     """Business logic for stock part operations"""
     
+    SEARCH_FIELDS = ("part_number", "part_name", "fsl")
+    FUZZY_FIELDS = ("part_number", "part_name")
+    
+    LEDGER_RESOURCE = "stock-parts"
+    LEDGER_BUCKETS = {"qty": ("qty",)}
+    # A part number can be stocked in several FSLs
+    LEDGER_SCOPE_COLUMN = "fsl"
+    
     def __init__(self):
         super().__init__(
             file_name="stok_part.csv",
             primary_key="part_number",
             entity_name="stock part"
         )
+        self._alerts = stock_alerts
     
     def _validate(self, data: Dict[str, Any], is_create: bool = False) -> None:
         """Validate stock part data"""
         validate_stock_part(data, is_create=is_create)
     
+    def query(self, search: str = '', fsl: str = '', region: str = '', sort_by: Optional[str] = None,
+              descending: bool = False, page: Optional[int] = None,
+              per_page: Optional[int] = None) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Filter, sort and paginate stock parts on the cached frame
+        
+        Filtering runs vectorized and only the returned rows are converted
+        to records.
+        
+        Args:
+            search: Search text (ranked by relevance unless sort_by is given)
+            fsl: Exact FSL name
+            region: Exact region
+            sort_by: Column to sort by
+            descending: Sort in descending order
+            page: Page number (1-indexed); paginates when given with per_page
+            per_page: Items per page
+            
+        Returns:
+            List of stock parts, or a paginate()-shaped dictionary when paging
+            
+        Raises:
+            ValueError: If sort_by is not a stock part column
+        """
+        df = self._get_cached_dataframe()
+        if sort_by and sort_by not in df.columns:
+            raise ValueError(f"Cannot sort by '{sort_by}'. Available columns: {', '.join(map(str, df.columns))}")
+        
+        if search:
+            df = df.iloc[self.search_positions(search)]
+        
+        mask = np.ones(len(df), dtype=bool)
+        for column, value in (('fsl', fsl), ('region', region)):
+            if value:
+                if column not in df.columns:
+                    mask[:] = False
+                    break
+                mask &= (df[column] == value).to_numpy()
+        if not mask.all():
+            df = df[mask]
+        
+        if sort_by:
+            try:
+                df = df.sort_values(sort_by, ascending=not descending, kind='mergesort')
+            except TypeError:
+                # Mixed types: compare as text
+                df = df.sort_values(sort_by, ascending=not descending, kind='mergesort',
+                                    key=lambda col: col.astype(str))
+        
+        if page and per_page:
+            return paginate_frame(df, page, per_page)
+        return df.to_dict(orient="records")
+    
+    def _qty_values(self, df: pd.DataFrame) -> np.ndarray:
+        """Get qty column as floats (NaN if missing or invalid)"""
+        if 'qty' not in df.columns:
+            return np.full(len(df), np.nan)
+        return pd.to_numeric(df['qty'], errors='coerce').to_numpy(dtype=float)
+    
+    def _get_fsl_partitions(self) -> Dict[Any, Dict[str, Any]]:
+        """
+        Get stock parts grouped by FSL, rebuilt only when the data changes
+        
+        Each partition holds the FSL's rows (file order), their positions in
+        ascending qty order, the sorted quantities and the total quantity.
+        
+        Returns:
+            Dictionary mapping FSL name to its partition
+        """
+        def build() -> Dict[Any, Dict[str, Any]]:
+            df = self._get_cached_dataframe()
+            if 'fsl' not in df.columns:
+                return {}
+            qty = self._qty_values(df)
+            partitions = {}
+            for fsl, positions in df.groupby('fsl', sort=False).indices.items():
+                part_qty = qty[positions]
+                order = np.argsort(part_qty, kind='stable')
+                partitions[fsl] = {
+                    "frame": df.iloc[positions],
+                    "qty_order": order,
+                    "sorted_qty": part_qty[order],
+                    "total_quantity": int(np.nansum(part_qty)),
+                }
+            return partitions
+        
+        return self._cache.get("fsl_partitions", self.get_data_version(), build)
+    
+    def _get_qty_order(self) -> Dict[str, Any]:
+        """
+        Get all stock parts' positions in ascending qty order
+        
+        Returns:
+            Dictionary with "qty_order" positions and "sorted_qty" values
+        """
+        def build() -> Dict[str, Any]:
+            qty = self._qty_values(self._get_cached_dataframe())
+            order = np.argsort(qty, kind='stable')
+            return {"qty_order": order, "sorted_qty": qty[order]}
+        
+        return self._cache.get("qty_order", self.get_data_version(), build)
+    
+    @staticmethod
+    def _count_below(sorted_qty: np.ndarray, threshold: float) -> int:
+        """Count quantities below threshold in an ascending array (NaN sorted last)"""
+        return int(np.searchsorted(sorted_qty, threshold, side='left'))
+    
     def get_by_fsl(self, fsl_name: str) -> List[Dict[str, Any]]:
         """Get all stock parts for specific FSL"""
-        df = self._get_dataframe()
+        df = self._get_cached_dataframe()
         
         if 'fsl' not in df.columns:
             raise ValueError("FSL column not found in data")
         
-        fsl_parts = df[df['fsl'] == fsl_name]
+        partition = self._get_fsl_partitions().get(fsl_name)
         
-        if fsl_parts.empty:
+        if partition is None:
             return []
         
-        return fsl_parts.to_dict(orient="records")
+        return partition["frame"].to_dict(orient="records")
+    
+    def _summarize_partition(self, fsl: Any, partition: Dict[str, Any], threshold: float) -> Dict[str, Any]:
+        """Build per-FSL summary from a partition"""
+        return {
+            "fsl": fsl,
+            "part_count": len(partition["frame"]),
+            "total_quantity": partition["total_quantity"],
+            "low_stock_count": self._count_below(partition["sorted_qty"], threshold),
+        }
+    
+    def get_fsl_summary(self, threshold: float = 10) -> List[Dict[str, Any]]:
+        """
+        Get part count, total quantity and low-stock count per FSL
+        
+        Args:
+            threshold: Quantity below which a part counts as low stock
+            
+        Returns:
+            List of per-FSL summaries
+        """
+        return [
+            self._summarize_partition(fsl, partition, threshold)
+            for fsl, partition in self._get_fsl_partitions().items()
+        ]
+    
+    def get_fsl_stock(self, fsl_name: str, threshold: float = 10) -> Dict[str, Any]:
+        """
+        Get one FSL's summary and parts from its partition
+        
+        Args:
+            fsl_name: FSL name
+            threshold: Quantity below which a part counts as low stock
+            
+        Returns:
+            Per-FSL summary with a "parts" list
+            
+        Raises:
+            ValueError: If the FSL has no stock parts
+        """
+        partition = self._get_fsl_partitions().get(fsl_name)
+        if partition is None:
+            raise ValueError(f"No stock parts found for FSL '{fsl_name}'")
+        summary = self._summarize_partition(fsl_name, partition, threshold)
+        summary["parts"] = partition["frame"].to_dict(orient="records")
+        return summary
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get stock part statistics"""
@@ -57,21 +223,225 @@ class StockPartService(BaseService):
         # Total quantity and low stock
         if 'qty' in df.columns:
             stats["total_quantity"] = int(df['qty'].sum())
-            stats["low_stock_count"] = len(df[df['qty'] < 10])
+            stats["low_stock_count"] = int(self._low_stock_mask(df).sum())
         
         return stats
     
-    def get_low_stock_parts(self, threshold: int = 10) -> List[Dict[str, Any]]:
-        """Get parts with stock below threshold"""
-        df = self._get_dataframe()
+    def get_low_stock_parts(self, threshold: int = 10, fsl: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get parts with stock below threshold, lowest first
+        
+        Args:
+            threshold: Quantity threshold
+            fsl: Only this FSL's parts (answered from its partition)
+            
+        Returns:
+            List of low-stock parts sorted by qty ascending
+        """
+        df = self._get_cached_dataframe()
         
         if 'qty' not in df.columns:
             return []
         
-        # Filter low stock
-        low_stock_df = df[df['qty'] < threshold]
+        if fsl:
+            partition = self._get_fsl_partitions().get(fsl)
+            if partition is None:
+                return []
+            df = partition["frame"]
+            ordering = partition
+        else:
+            ordering = self._get_qty_order()
+        
+        count = self._count_below(ordering["sorted_qty"], threshold)
+        return df.iloc[ordering["qty_order"][:count]].to_dict(orient="records")
+
+    
+    # ------------------------------------------------------------------
+    # Reorder thresholds and low-stock alerts
+    # ------------------------------------------------------------------
+    
+    def _low_stock_mask(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Evaluate every row against its reorder threshold (vectorized)
+        
+        Args:
+            df: Stock parts DataFrame
+            
+        Returns:
+            Boolean array, True where the row is below its threshold
+        """
+        if self.primary_key not in df.columns:
+            return np.zeros(len(df), dtype=bool)
+        part_numbers = df[self.primary_key].astype(str).str.strip()
+        fsls = df['fsl'] if 'fsl' in df.columns else pd.Series('', index=df.index)
+        thresholds = self._alerts.effective_thresholds(part_numbers, fsls).to_numpy()
+        return self._qty_values(df) < thresholds
+    
+    def _low_stock_states(self, df: pd.DataFrame) -> Dict[Tuple[str, str], bool]:
+        """
+        Get low-stock state of every part in every FSL
+        
+        Args:
+            df: Stock parts DataFrame
+            
+        Returns:
+            Dictionary mapping (part number, FSL) to whether it is below threshold
+        """
+        if self.primary_key not in df.columns:
+            return {}
+        fsls = df['fsl'] if 'fsl' in df.columns else pd.Series(None, index=df.index)
+        keys = [alert_key(part_number, fsl) for part_number, fsl in zip(df[self.primary_key], fsls)]
+        return dict(zip(keys, self._low_stock_mask(df).tolist()))
+    
+    def _alert_rows(self, part_numbers: Iterable[Any]) -> List[Dict[str, Any]]:
+        """
+        Get current part_number/part_name/fsl/qty of parts in every FSL holding them
+        
+        Parts (or FSL rows) that no longer exist are forgotten.
+        
+        Args:
+            part_numbers: Part numbers to look up
+            
+        Returns:
+            List of rows for StockAlertEngine.evaluate()
+        """
+        df = self._get_cached_dataframe()
+        wanted = {str(part_number).strip() for part_number in part_numbers if part_number is not None}
+        rows = []
+        if wanted and self.primary_key in df.columns:
+            matches = df[df[self.primary_key].astype(str).str.strip().isin(wanted)]
+            qty_values = self._qty_values(matches)
+            for position, (label, part_number) in enumerate(matches[self.primary_key].items()):
+                qty = qty_values[position]
+                rows.append({
+                    "part_number": str(part_number).strip(),
+                    "part_name": df.at[label, 'part_name'] if 'part_name' in df.columns else None,
+                    "fsl": df.at[label, 'fsl'] if 'fsl' in df.columns else None,
+                    "qty": None if pd.isna(qty) else (int(qty) if float(qty).is_integer() else float(qty)),
+                })
+        self._alerts.forget(wanted, keep=[alert_key(row["part_number"], row["fsl"]) for row in rows])
+        return rows
+    
+    def _sync_alerts(self) -> None:
+        """
+        Prime alert state, or reconcile it after the CSV changed outside this service
+        """
+        if not os.path.exists(self.file_path):
+            return
+        version = self.get_data_version()
+        if self._alerts.synced_version == version:
+            return
+        states = self._low_stock_states(self._get_cached_dataframe())
+        if not self._alerts.is_primed:
+            self._alerts.prime(states)
+        else:
+            changed = {key[0] for key, low in states.items() if self._alerts.get_state(key) != low}
+            self._alerts.evaluate(self._alert_rows(changed))
+        self._alerts.synced_version = version
+    
+    def _evaluate_alerts(self, part_numbers: Iterable[Any]) -> None:
+        """
+        Re-evaluate only the parts touched by a write
+        
+        Args:
+            part_numbers: Changed part numbers
+        """
+        if not os.path.exists(self.file_path):
+            return
+        self._alerts.evaluate(self._alert_rows(part_numbers))
+        self._alerts.synced_version = self.get_data_version()
+    
+    def create(self, entity_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create stock part and raise an alert if it starts below threshold"""
+        self._sync_alerts()
+        result = super().create(entity_data)
+        self._evaluate_alerts([entity_data.get(self.primary_key)])
+        return result
+    
+    def update(self, key_value: str, updated_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Update stock part and evaluate its reorder threshold"""
+        self._sync_alerts()
+        result = super().update(key_value, updated_data)
+        self._evaluate_alerts([key_value, updated_data.get(self.primary_key, key_value)])
+        return result
+    
+    def delete(self, key_value: str) -> Dict[str, Any]:
+        """Delete stock part and drop its alert state"""
+        result = super().delete(key_value)
+        self._alerts.forget([key_value])
+        return result
+    
+    def bulk_upsert(self, entities_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Bulk upsert stock parts and evaluate the upserted parts' thresholds"""
+        self._sync_alerts()
+        result = super().bulk_upsert(entities_data)
+        self._evaluate_alerts(entity.get(self.primary_key) for entity in entities_data)
+        return result
+    
+    def record_movement(self, item: Any, movement_type: str, quantity: Any, bucket: Optional[str] = None,
+                        actor: str = "", note: str = "", scope: Any = None) -> Dict[str, Any]:
+        """Record stock movement and evaluate the part's reorder threshold"""
+        self._sync_alerts()
+        movement = super().record_movement(item, movement_type, quantity, bucket=bucket, actor=actor, note=note,
+                                           scope=scope)
+        label = self._get_ledger_item_labels()[movement["item"]]
+        self._evaluate_alerts([self._get_base_dataframe().at[label, self.primary_key]])
+        return movement
+    
+    def get_thresholds(self) -> Dict[str, Any]:
+        """
+        Get reorder thresholds
+        
+        Returns:
+            Dictionary with "default", "fsl" and "part" thresholds
+        """
+        return self._alerts.get_thresholds()
+    
+    def set_threshold(self, scope: str, key: Optional[str], threshold: Optional[float]) -> Dict[str, Any]:
+        """
+        Set or remove a reorder threshold and re-evaluate all parts
         
-        # Sort by quantity ascending
-        low_stock_df = low_stock_df.sort_values('qty')
+        Args:
+            scope: "part", "fsl" or "default"
+            key: Part number or FSL name
+            threshold: Threshold, or None to remove a part/FSL threshold
+            
+        Returns:
+            Updated thresholds
+            
+        Raises:
+            ValueError: If the threshold is invalid
+        """
+        self._sync_alerts()
+        self._alerts.set_threshold(scope, key, threshold)
+        # Invalidate the synced version so all parts are reconciled
+        self._alerts.synced_version = None
+        self._sync_alerts()
+        return self._alerts.get_thresholds()
+    
+    def get_alerts(self, since: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get queued low-stock alerts newer than an alert id
+        
+        Args:
+            since: Last alert id the client has seen
+            limit: Maximum number of alerts
+            
+        Returns:
+            Dictionary with "alerts" (oldest first) and "last_id"
+        """
+        self._sync_alerts()
+        return {"alerts": self._alerts.get_alerts(since, limit), "last_id": self._alerts.last_id}
+    
+    def wait_for_alerts(self, since: int, timeout: float = 15) -> List[Dict[str, Any]]:
+        """
+        Block until new alerts are queued (used by the SSE stream)
         
-        return low_stock_df.to_dict(orient="records")
\ No newline at end of file
+        Args:
+            since: Last alert id the client has seen
+            timeout: Seconds to wait
+            
+        Returns:
+            New alerts (empty on timeout)
+        """
+        return self._alerts.wait_for_alerts(since, timeout)
@@ -3,14 +3,36 @@ Tool Service - Manages tools inventory data
 Handles CRUD operations for stock_detail.csv
 """
 import os
-import unicodedata
 from backend.services.base_service import BaseService
-from typing import Dict, Any
+from backend.services.stock_ledger_mixin import StockLedgerMixin
+from backend.utils.name_index import NameIndex, normalize_name
+from backend.utils.csv_utils import text_column, int_column
+from backend.utils.data_cache import get_file_version
+from typing import Dict, Any, List, Optional
 import pandas as pd
 
-class ToolService(BaseService):
+class ToolService(StockLedgerMixin, BaseService):
     """Service for managing tools inventory"""
     
+    # Output columns of get_all(), including legacy CSV-named duplicates
+    NORMALIZED_COLUMNS = (
+        "id", "tools_name", "current_stock", "stock_new", "stock_old", "stock_detail",
+        "photo", "uom", "remark", "description", "location",
+        "Part Name", "Detail Specification", "Picture", "Total", "NEW", "OLD", "UOM", "Remark",
+    )
+    
+    # Output columns of get_all_compact() (each field once, no legacy duplicates)
+    COMPACT_COLUMNS = (
+        "tools_name", "current_stock", "stock_new", "stock_old", "stock_detail",
+        "photo", "uom", "remark", "location",
+    )
+    
+    SEARCH_FIELDS = ("tools_name", "stock_detail", "remark")
+    FUZZY_FIELDS = ("tools_name",)
+    
+    LEDGER_RESOURCE = "tools"
+    LEDGER_BUCKETS = {"new": ("new", "total"), "old": ("old", "total")}
+    
     def __init__(self):
         super().__init__(
             file_name="stock_detail.csv",
@@ -46,122 +68,151 @@ class ToolService(BaseService):
             except (ValueError, AttributeError, TypeError):
                 raise ValueError("Total stock must be a valid number")
     
+    def _get_search_records(self) -> list[Dict[str, Any]]:
+        """
+        Get normalized records (shared, must not be modified)
+        
+        Returns:
+            List of records, cached per file version
+        """
+        def build() -> list[Dict[str, Any]]:
+            return self._get_normalized_frame().to_dict(orient="records")
+        
+        return self._cache.get("normalized_records", self.get_data_version(), build)
+    
     def get_all(self) -> list[Dict[str, Any]]:
         """
         Get all tools with normalized column names from stock_detail.csv
         
+        Records are built once per file version and shared between requests,
+        so callers must not modify them.
+        
         Returns:
             List of all tools as dictionaries
         """
         try:
-            df = self._get_dataframe()
+            return self._get_search_records()
         except FileNotFoundError as e:
             print(f"[ERROR ToolService] File not found: {e}")
-            import traceback
-            traceback.print_exc()
             return []
         except Exception as e:
-            print(f"[ERROR ToolService] Failed to read CSV: {e}")
+            print(f"[ERROR ToolService] Failed to load tools: {e}")
             import traceback
             traceback.print_exc()
             return []
+    
+    def get_all_compact(self, fields: Optional[List[str]] = None, search: str = '') -> List[Dict[str, Any]]:
+        """
+        Get all tools in the compact profile (each field emitted once)
         
-        # Check if DataFrame is empty
-        if df.empty:
-            print(f"[WARNING ToolService] DataFrame is empty")
-            return []
+        Unfiltered results are cached per file version and projection, so
+        callers must not modify them.
         
-        # Debug: Print available columns
-        print(f"[DEBUG ToolService] Available columns: {list(df.columns)}")
-        print(f"[DEBUG ToolService] DataFrame shape: {df.shape}")
-        if not df.empty:
-            print(f"[DEBUG ToolService] First row sample: {df.iloc[0].to_dict()}")
+        Args:
+            fields: Columns to include (default: all COMPACT_COLUMNS)
+            search: Search text matched against SEARCH_FIELDS (ranked results)
+            
+        Returns:
+            List of tools as dictionaries
+            
+        Raises:
+            ValueError: If fields contains an unknown column
+        """
+        columns = list(fields) if fields else list(self.COMPACT_COLUMNS)
+        unknown = [col for col in columns if col not in self.COMPACT_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+        
+        if search:
+            positions = self.search_positions(search)
+            return self._get_normalized_frame()[columns].iloc[positions].to_dict(orient="records")
+        
+        def build() -> List[Dict[str, Any]]:
+            return self._get_normalized_frame()[columns].to_dict(orient="records")
+        
+        return self._cache.get(("compact_records", tuple(columns)), self.get_data_version(), build)
+    
+    def _find_part_name_column(self, df: pd.DataFrame) -> Optional[str]:
+        """
+        Find the Part Name column for listing, with loose fallbacks
         
+        Args:
+            df: Tools DataFrame
+            
+        Returns:
+            Column name, or None if nothing looks like a part name
+        """
         # Columns are normalized to snake_case by read_csv_normalized
         # "Part Name" -> "part_name", "Detail Specification" -> "detail_specification", etc.
-        # Empty columns become "unnamed_1", "unnamed_2", etc.
-        part_name_col = "part_name"
-        
-        # Check if column exists
-        if part_name_col not in df.columns:
-            # Try to find the column (case-insensitive or with variations)
-            possible_names = [col for col in df.columns if 'part' in col.lower() and 'name' in col.lower()]
-            if possible_names:
-                part_name_col = possible_names[0]
-                print(f"[DEBUG ToolService] Found part_name column: {part_name_col}")
-            else:
-                # Try to find any column that might contain part name
-                # Check common variations
-                for col in df.columns:
-                    if 'part' in col.lower() or 'name' in col.lower() or 'tool' in col.lower():
-                        part_name_col = col
-                        print(f"[WARNING ToolService] Using alternative column '{col}' as part_name")
-                        break
-                else:
-                    # Return empty if column not found
-                    print(f"[ERROR ToolService] Column 'part_name' not found in stock_detail.csv.")
-                    print(f"[ERROR ToolService] Available columns: {list(df.columns)}")
-                    return []
-        
-        # Filter out empty rows (rows where part_name is empty or NaN)
-        try:
-            df = df[df[part_name_col].notna()]
-            df = df[df[part_name_col].astype(str).str.strip() != '']
-        except Exception as e:
-            print(f"[ERROR ToolService] Error filtering rows: {e}")
-            import traceback
-            traceback.print_exc()
-            return []
+        if "part_name" in df.columns:
+            return "part_name"
         
-        print(f"[DEBUG ToolService] After filtering empty rows: {df.shape}")
+        possible_names = [col for col in df.columns if 'part' in col.lower() and 'name' in col.lower()]
+        if possible_names:
+            return possible_names[0]
         
-        # Convert to list of dictionaries
-        try:
-            tools = df.to_dict(orient="records")
-        except Exception as e:
-            print(f"[ERROR ToolService] Error converting to dict: {e}")
-            import traceback
-            traceback.print_exc()
-            return []
+        for col in df.columns:
+            if 'part' in col.lower() or 'name' in col.lower() or 'tool' in col.lower():
+                print(f"[WARNING ToolService] Using alternative column '{col}' as part_name")
+                return col
         
-        # Normalize column names and add computed fields
-        normalized_tools = []
-        for tool in tools:
-            try:
-                # Use snake_case column names (normalized by read_csv_normalized)
-                part_name = str(tool.get(part_name_col, "")).strip()
-                if not part_name or part_name == 'nan':  # Skip empty part names
-                    continue
-                    
-                normalized = {
-                    "id": part_name,  # Use Part Name as ID
-                    "tools_name": part_name,
-                    "current_stock": self._parse_number(tool.get("total", 0)),
-                    "stock_new": self._parse_number(tool.get("new", 0)),
-                    "stock_old": self._parse_number(tool.get("old", 0)),
-                    "stock_detail": str(tool.get("detail_specification", "")).strip(),  # Detail Specification
-                    "photo": str(tool.get("picture", "")).strip(),  # Picture column
-                    "uom": str(tool.get("uom", "Pcs")).strip(),  # Unit of Measure
-                    "remark": str(tool.get("remark", "")).strip(),  # Remark
-                    "description": str(tool.get("detail_specification", "")).strip(),  # Detail Specification as description
-                    "location": str(tool.get("location", "")).strip(),  # Location
-                    # Keep original columns for compatibility (using original CSV names)
-                    "Part Name": part_name,
-                    "Detail Specification": str(tool.get("detail_specification", "")).strip(),
-                    "Picture": str(tool.get("picture", "")).strip(),
-                    "Total": self._parse_number(tool.get("total", 0)),
-                    "NEW": self._parse_number(tool.get("new", 0)),
-                    "OLD": self._parse_number(tool.get("old", 0)),
-                    "UOM": str(tool.get("uom", "Pcs")).strip(),
-                    "Remark": str(tool.get("remark", "")).strip(),
-                }
-                normalized_tools.append(normalized)
-            except Exception as e:
-                print(f"[WARNING ToolService] Error processing tool row: {e}")
-                continue
+        print(f"[ERROR ToolService] Column 'part_name' not found in stock_detail.csv. Available columns: {list(df.columns)}")
+        return None
+    
+    def _get_normalized_frame(self) -> pd.DataFrame:
+        """
+        Get tools frame with normalized output columns, built with vectorized
+        column operations once per stock_detail.csv version
         
-        print(f"[DEBUG ToolService] Returning {len(normalized_tools)} tools")
-        return normalized_tools
+        Returns:
+            DataFrame with one row per tool (shared, must not be modified)
+        """
+        def build() -> pd.DataFrame:
+            df = self._get_cached_dataframe()
+            part_name_col = self._find_part_name_column(df) if not df.empty else None
+            if part_name_col is None:
+                return pd.DataFrame(columns=list(self.NORMALIZED_COLUMNS))
+            
+            # Filter out empty rows (rows where part_name is empty or NaN)
+            part_name = text_column(df, part_name_col)
+            keep = (part_name != "") & (part_name != "nan")
+            df = df[keep]
+            part_name = part_name[keep]
+            
+            total = int_column(df, "total")
+            new = int_column(df, "new")
+            old = int_column(df, "old")
+            detail = text_column(df, "detail_specification")
+            picture = text_column(df, "picture")
+            uom = text_column(df, "uom", "Pcs")
+            remark = text_column(df, "remark")
+            
+            normalized = pd.DataFrame({
+                "id": part_name,  # Use Part Name as ID
+                "tools_name": part_name,
+                "current_stock": total,
+                "stock_new": new,
+                "stock_old": old,
+                "stock_detail": detail,
+                "photo": picture,
+                "uom": uom,
+                "remark": remark,
+                "description": detail,  # Detail Specification as description
+                "location": text_column(df, "location"),
+                # Keep original columns for compatibility (using original CSV names)
+                "Part Name": part_name,
+                "Detail Specification": detail,
+                "Picture": picture,
+                "Total": total,
+                "NEW": new,
+                "OLD": old,
+                "UOM": uom,
+                "Remark": remark,
+            }, columns=list(self.NORMALIZED_COLUMNS))
+            print(f"[INFO] Normalized {len(normalized)} tool records")
+            return normalized
+        
+        return self._cache.get("normalized_frame", self.get_data_version(), build)
     
     def _parse_number(self, value) -> int:
         """Parse number from string, return 0 if invalid"""
@@ -335,64 +386,20 @@ class ToolService(BaseService):
         Raises:
             ValueError: If tool not found
         """
-        df = self._get_dataframe()
+        df = self._get_cached_dataframe()
+        part_name_col = self._get_lookup_column(df)
         
-        # Columns are normalized to snake_case
-        part_name_col = "part_name"
-        
-        if part_name_col not in df.columns:
-            # Try to find the column
-            possible_names = [col for col in df.columns if 'part' in col.lower() and 'name' in col.lower()]
-            if possible_names:
-                part_name_col = possible_names[0]
-            else:
-                raise ValueError(f"Part Name column not found in data. Available columns: {list(df.columns)}")
-        
-        # Filter out empty rows
-        df = df[df[part_name_col].notna()]
-        df = df[df[part_name_col].astype(str).str.strip() != '']
-        
-        # Normalize for comparison: strip whitespace, normalize unicode, and convert to string
         search_name = str(tools_name).strip()
-        # Normalize unicode characters (handles different unicode representations)
-        search_name_normalized = unicodedata.normalize('NFKC', search_name)
-        
-        # Normalize all part names in dataframe for comparison
-        df['_normalized_part_name'] = df[part_name_col].astype(str).str.strip().apply(
-            lambda x: unicodedata.normalize('NFKC', x) if pd.notna(x) else ''
-        )
-        
-        # Try exact match first (case-sensitive, but normalized)
-        matching = df[df['_normalized_part_name'] == search_name_normalized]
-        
-        # If not found, try case-insensitive match
-        if matching.empty:
-            matching = df[df['_normalized_part_name'].str.lower() == search_name_normalized.lower()]
-        
-        # Debug: print available part names if not found
-        if matching.empty:
-            available_names = df[part_name_col].astype(str).str.strip().tolist()[:10]  # First 10 for debugging
-            available_normalized = df['_normalized_part_name'].tolist()[:10]
-            print(f"[DEBUG ToolService] Tool '{search_name}' (normalized: '{search_name_normalized}') not found.")
-            print(f"[DEBUG ToolService] Available names (first 10): {available_names}")
-            print(f"[DEBUG ToolService] Available normalized (first 10): {available_normalized}")
-            print(f"[DEBUG ToolService] Search name type: {type(search_name)}, length: {len(search_name)}")
-            print(f"[DEBUG ToolService] Search name repr: {repr(search_name)}")
-            print(f"[DEBUG ToolService] Search name bytes: {search_name.encode('utf-8')}")
-            # Check if there's a similar match (fuzzy) - check if search_name is contained in any part name
-            similar_matches = df[df['_normalized_part_name'].str.contains(search_name_normalized, case=False, na=False, regex=False)]
-            if not similar_matches.empty:
-                similar_names = similar_matches[part_name_col].astype(str).str.strip().tolist()
-                print(f"[DEBUG ToolService] Similar matches found (contains '{search_name_normalized}'): {similar_names}")
-            # Also check reverse - if any part name is contained in search_name
-            reverse_matches = df[df['_normalized_part_name'].apply(lambda x: search_name_normalized in x if pd.notna(x) else False)]
-            if not reverse_matches.empty:
-                reverse_names = reverse_matches[part_name_col].astype(str).str.strip().tolist()
-                print(f"[DEBUG ToolService] Reverse matches found (search_name contains part_name): {reverse_names}")
+        idx = self._get_name_index().lookup(search_name)
+        if idx is None:
+            print(f"[DEBUG ToolService] Tool '{search_name}' (normalized: '{normalize_name(search_name)}') not found.")
+            suggestions = [match["name"] for match in self.fuzzy_search(search_name, limit=3)]
+            if suggestions:
+                raise ValueError(f"Tool with part_name '{search_name}' not found. Did you mean: {', '.join(suggestions)}?")
             raise ValueError(f"Tool with part_name '{search_name}' not found")
         
-        # Get the tool data before cleaning up
-        tool = matching.to_dict(orient="records")[0]
+        # Get the tool data
+        tool = df.loc[idx].to_dict()
         part_name = str(tool.get(part_name_col, "")).strip()
         
         # Normalize using snake_case column names
@@ -418,19 +425,78 @@ class ToolService(BaseService):
             "Remark": str(tool.get("remark", "")).strip(),
         }
     
-    def update_by_tools_name(self, tools_name: str, updated_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _get_lookup_column(self, df: pd.DataFrame) -> str:
+        """
+        Find the Part Name column used for lookups
+        
+        Args:
+            df: Tools DataFrame
+            
+        Returns:
+            Column name
+            
+        Raises:
+            ValueError: If no Part Name column exists
+        """
+        # Columns are normalized to snake_case
+        if "part_name" in df.columns:
+            return "part_name"
+        possible_names = [col for col in df.columns if 'part' in col.lower() and 'name' in col.lower()]
+        if possible_names:
+            return possible_names[0]
+        raise ValueError(f"Part Name column not found in data. Available columns: {list(df.columns)}")
+    
+    def _ledger_key_column(self, df: pd.DataFrame) -> str:
+        """Tools are identified in the stock ledger by Part Name"""
+        return self._get_lookup_column(df)
+    
+    def _ledger_item_key(self, value: Any) -> str:
+        """Normalize Part Name for the stock ledger"""
+        return normalize_name(value)
+    
+    def _resolve_ledger_item(self, item: Any, scope: Optional[str] = None) -> Optional[str]:
+        """Resolve a tool name (case-insensitive) to its ledger key"""
+        idx = self._get_name_index().lookup(item)
+        if idx is None:
+            return None
+        df = self._get_base_dataframe()
+        return self._ledger_item_key(df.at[idx, self._get_lookup_column(df)])
+    
+    def _get_name_index(self) -> NameIndex:
+        """
+        Get NFKC-normalized, casefolded Part Name index, rebuilt only when stock_detail.csv changes
+        
+        Returns:
+            NameIndex over the Part Name column
+        """
+        def build() -> NameIndex:
+            # Names don't depend on pending stock movements, so index the CSV contents
+            df = self._get_base_dataframe()
+            return NameIndex(df[self._get_lookup_column(df)])
+        
+        if not os.path.exists(self.file_path):
+            raise FileNotFoundError(f"{self.entity_name.capitalize()} data not found")
+        return self._cache.get("name_index", get_file_version(self.file_path), build)
+    
+    def update_by_tools_name(self, tools_name: str, updated_data: Dict[str, Any], actor: str = "") -> Dict[str, Any]:
         """
         Update tool by Part Name
         
+        Changes to NEW/OLD stock are recorded as "adjust" movements in the
+        stock ledger (Total follows them); the CSV file is rewritten only
+        when other fields change.
+        
         Args:
             tools_name: Part Name to find
             updated_data: Data to update
+            actor: Who made the change (recorded with stock movements)
             
         Returns:
-            Success response dictionary with 'no_changes' flag if no changes detected
+            Success response dictionary with 'no_changes' flag if no changes detected,
+            and the recorded stock movements
             
         Raises:
-            ValueError: If no changes detected (to avoid unnecessary file writes)
+            ValueError: If the tool doesn't exist or a stock change would make stock negative
         """
         # Find the tool first to get the exact Part Name and current data
         try:
@@ -507,20 +573,38 @@ class ToolService(BaseService):
                     "no_changes": True
                 }
         
-        # There are changes, proceed with update
-        csv_data = {
-            "part_name": new_data["part_name"],
-            "brand": "",  # Keep Brand column but empty
-            "detail_specification": new_data["detail_specification"],
-            "picture": new_data["picture"],
-            "total": new_data["total"],
-            "new": new_data["new"],
-            "old": new_data["old"],
-            "uom": new_data["uom"],
-            "remark": new_data["remark"],
-        }
-        
-        return super().update(part_name, csv_data)
+        if not tool:
+            # Not found: let update() raise
+            return super().update(part_name, {"part_name": new_data["part_name"]})
+        
+        # Stock buckets change through the ledger, so the CSV isn't rewritten for them
+        for bucket in self.LEDGER_BUCKETS:
+            if new_data[bucket] < 0:
+                raise ValueError(f"{bucket.upper()} stock must not be negative")
+        movements = []
+        for bucket in self.LEDGER_BUCKETS:
+            delta = new_data[bucket] - current_data[bucket]
+            if delta:
+                movements.append(self.record_movement(part_name, "adjust", delta, bucket=bucket,
+                                                      actor=actor, note="Tool edit"))
+        derived_total = current_data["total"] + sum(movement["quantity"] for movement in movements)
+        
+        csv_fields = ("part_name", "detail_specification", "picture", "uom", "remark")
+        rewrite = any(normalize_value(current_data[field]) != normalize_value(new_data[field])
+                      for field in csv_fields)
+        if not rewrite and new_data["total"] == derived_total:
+            print(f"[INFO] Recorded {len(movements)} stock movements for {self.entity_name}: {part_name}")
+            return {"ok": True, "message": f"{self.entity_name.capitalize()} updated successfully",
+                    "movements": movements}
+        
+        csv_data = {field: new_data[field] for field in csv_fields}
+        csv_data["brand"] = ""  # Keep Brand column but empty
+        if new_data["total"] != derived_total:
+            # Total edited independently of NEW/OLD
+            csv_data["total"] = new_data["total"]
+        result = super().update(part_name, csv_data)
+        result["movements"] = movements
+        return result
     
     def delete_by_tools_name(self, tools_name: str) -> Dict[str, Any]:
         """
@@ -4,10 +4,14 @@ import pandas as pd
 from io import BytesIO
 from config import Config
 from backend.utils.csv_utils import read_csv_normalized
+from backend.services.stock_service import StockPartService
 
 class UploadService:
     """Service for file upload and export operations"""
     
+    def __init__(self):
+        self._stock_parts = StockPartService()
+    
     def upload_csv(self, file: Any, target: str) -> Dict[str, Any]:
         """Upload and save CSV file"""
         # Determine destination
@@ -16,7 +20,7 @@ class UploadService:
         elif target == "engineers":
             dest = os.path.join(Config.DATA_DIR, "data_ce.csv")
         elif target == "stock-parts":
-            dest = os.path.join(Config.DATA_DIR, "stok_part.csv")
+            dest = self._stock_parts.file_path
         elif target == "so":
             dest = os.path.join(Config.DATA_DIR, "so_apr_spt.csv")
         elif target == "monthly-machines":
@@ -29,7 +33,11 @@ class UploadService:
             raise ValueError(f"Invalid target: {target}")
         
         # Save file
-        file.save(dest)
+        if target == "stock-parts":
+            # Uploaded counts replace the stock, so pending ledger movements are dropped
+            self._stock_parts.replace_file(file.save)
+        else:
+            file.save(dest)
         
         # Validate by reading
         try:
@@ -86,3 +86,41 @@ def sample_stock_part_data():
         'max_stock': 200
     }
 
+
+@pytest.fixture
+def stock_part_service(tmp_path):
+    """StockPartService backed by a temporary stok_part.csv and stock ledger"""
+    import pandas as pd
+    from backend.services.stock_alerts import StockAlertEngine
+    from backend.services.stock_ledger import StockLedger
+    from backend.services.stock_service import StockPartService
+    
+    pd.DataFrame([
+        {'part_number': 'P1', 'part_name': 'Belt', 'fsl': 'FSL A', 'region': 'R1', 'qty': 10},
+        {'part_number': 'P2', 'part_name': 'Card Reader', 'fsl': 'FSL B', 'region': 'R2', 'qty': 4},
+        {'part_number': 'P3', 'part_name': 'Belt Motor', 'fsl': 'FSL A', 'region': 'R1', 'qty': 7},
+        # P1 is stocked in two FSLs
+        {'part_number': 'P1', 'part_name': 'Belt', 'fsl': 'FSL B', 'region': 'R2', 'qty': 6},
+    ]).to_csv(tmp_path / 'stok_part.csv', index=False)
+    service = StockPartService()
+    service.file_path = str(tmp_path / 'stok_part.csv')
+    service._ledger = StockLedger(str(tmp_path / 'stock_movements.csv'))
+    service._alerts = StockAlertEngine(str(tmp_path / 'stock_thresholds.csv'))
+    return service
+
+
+@pytest.fixture
+def tool_service(tmp_path):
+    """ToolService backed by a temporary stock_detail.csv and stock ledger"""
+    import pandas as pd
+    from backend.services.stock_ledger import StockLedger
+    from backend.services.tool_service import ToolService
+    
+    pd.DataFrame([
+        {'Part Name': 'Tang Kombinasi', 'Brand': '', 'Detail Specification': '8 inch', 'Picture': '',
+         'Total': 5, 'NEW': 3, 'OLD': 2, 'UOM': 'Pcs', 'Remark': ''},
+    ]).to_csv(tmp_path / 'stock_detail.csv', index=False)
+    service = ToolService()
+    service.file_path = str(tmp_path / 'stock_detail.csv')
+    service._ledger = StockLedger(str(tmp_path / 'stock_movements.csv'))
+    return service
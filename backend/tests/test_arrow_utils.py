@@ -0,0 +1,38 @@
+"""
+Unit tests for backend/utils/arrow_utils.py
+"""
+import pandas as pd
+import pytest
+from flask import Flask, request
+from backend.utils import arrow_utils
+from backend.utils.arrow_utils import ARROW_STREAM_MEDIA_TYPE, frame_to_arrow, wants_arrow
+
+app = Flask(__name__)
+
+
+class TestArrowOutput:
+    """Test Arrow negotiation and conversion"""
+
+    def test_negotiation(self):
+        with app.test_request_context('/rows', headers={'Accept': ARROW_STREAM_MEDIA_TYPE}):
+            assert wants_arrow(request)
+        with app.test_request_context('/rows?format=arrow'):
+            assert wants_arrow(request)
+        with app.test_request_context('/rows'):
+            assert not wants_arrow(request)
+
+    def test_requires_pyarrow(self, monkeypatch):
+        monkeypatch.setattr(arrow_utils, 'pa', None)
+        with pytest.raises(RuntimeError):
+            frame_to_arrow(pd.DataFrame({'a': [1]}))
+
+    def test_stream_round_trip(self):
+        pa = pytest.importorskip('pyarrow')
+        df = pd.DataFrame({'wsid': ['W1', 'W2', 'W3'], 'qty': [1, 2, 3], 'lat': [1.5, '', 2.5]})
+        with app.app_context():
+            response = arrow_utils.arrow_stream_response(frame_to_arrow(df), batch_size=2)
+            body = response.get_data()
+        result = pa.ipc.open_stream(body).read_all().to_pandas()
+        assert result['wsid'].tolist() == ['W1', 'W2', 'W3']
+        assert result['qty'].tolist() == [1, 2, 3]
+        assert result['lat'].tolist() == ['1.5', '', '2.5']
@@ -0,0 +1,30 @@
+"""
+Unit tests for backend/utils/assignment.py
+"""
+import numpy as np
+from backend.utils.assignment import assign_with_capacity
+
+
+class TestAssignWithCapacity:
+    """Test capacity-constrained assignment"""
+
+    def test_swap_improves_greedy(self):
+        # Greedy gives row 0 column 0 and leaves row 1 the expensive column 1
+        assigned, costs = assign_with_capacity(
+            np.array([[0, 1], [0, 1]]), np.array([[1.0, 2.0], [2.0, 10.0]]), np.array([1, 1]))
+        assert assigned.tolist() == [1, 0]
+        assert costs.sum() == 4
+
+    def test_capacity_respected(self):
+        candidates = np.array([[0, 1]] * 5)
+        costs = np.array([[1.0, 5.0]] * 5)
+        assigned, _ = assign_with_capacity(candidates, costs, np.array([2, 2]))
+        assert np.bincount(assigned[assigned >= 0]).tolist() == [2, 2]
+        assert (assigned < 0).sum() == 1
+
+    def test_fallback_outside_candidates(self):
+        assigned, costs = assign_with_capacity(
+            np.array([[0], [0]]), np.array([[1.0], [2.0]]), np.array([1, 1]),
+            fallback_costs=lambda row: np.array([2.0, 7.0]))
+        assert assigned.tolist() == [0, 1]
+        assert costs.tolist() == [1.0, 7.0]
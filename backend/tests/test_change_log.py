@@ -0,0 +1,48 @@
+"""
+Unit tests for backend/services/change_log.py and service delta sync
+"""
+import pandas as pd
+from backend.services.change_log import ChangeLog
+
+
+def frame(rows):
+    return pd.DataFrame(rows, columns=['id', 'qty'])
+
+
+class TestChangeLog:
+    """Test change versions and collapsed change sets"""
+
+    def test_collapses_changes_per_key(self):
+        log = ChangeLog()
+        log.sync(1, frame([('A', 1), ('B', 2), ('C', 3)]), 'id')
+        start = log.version
+        log.sync(2, frame([('A', 5), ('C', 3), ('D', 1)]), 'id')
+        log.sync(3, frame([('A', 6), ('C', 3), ('E', 1), ('B', 2)]), 'id')
+        changes = log.get_changes(start)
+        # D was inserted and deleted again; B was deleted and re-inserted
+        assert changes == {'version': start + 7, 'reset': False, 'inserts': ['E'],
+                           'updates': ['A', 'B'], 'deletes': []}
+        assert log.get_changes(changes['version'])['updates'] == []
+
+    def test_reset_outside_log(self):
+        log = ChangeLog(max_changes=2)
+        log.sync(1, frame([('A', 1)]), 'id')
+        start = log.version
+        log.sync(2, frame([('A', 1), ('B', 1), ('C', 1), ('D', 1)]), 'id')
+        assert log.get_changes(start)['reset']
+        assert not log.get_changes(start + 1)['reset']
+        # Versions from an earlier process are older than the log
+        assert log.get_changes(0)['reset']
+
+
+class TestServiceChanges:
+    """Test get_changes on a ledger-backed service"""
+
+    def test_writes_and_movements(self, stock_part_service):
+        since = stock_part_service.get_change_version()
+        stock_part_service.record_movement('P1', 'out', 3, scope='FSL A')
+        stock_part_service.delete('P2')
+        changes = stock_part_service.get_changes(since)
+        assert [row['qty'] for row in changes['updates']] == [7]
+        assert changes['deletes'] == ['P2'] and changes['inserts'] == []
+        assert stock_part_service.get_changes(changes['version'])['updates'] == []
@@ -0,0 +1,41 @@
+"""
+Unit tests for backend/utils/columnar.py
+"""
+import pandas as pd
+import pytest
+from flask import Flask, request
+from backend.utils.columnar import frame_to_columns, get_columnar_format
+
+app = Flask(__name__)
+FRAME = pd.DataFrame({
+    'wsid': ['W1', 'W2', 'W3', 'W4'],
+    'region': ['R1', 'R1', 'R2', 'R1'],
+    'qty': [1, 2, 3, 4],
+})
+
+
+class TestFrameToColumns:
+    """Test column-oriented conversion"""
+
+    def test_plain_columns(self):
+        result = frame_to_columns(FRAME)
+        assert result['columns'] == ['wsid', 'region', 'qty']
+        assert result['data']['qty'] == [1, 2, 3, 4] and result['total'] == 4
+        assert 'dictionaries' not in result
+
+    def test_dictionary_encodes_low_cardinality_text(self):
+        result = frame_to_columns(FRAME, dictionary=True)
+        assert result['dictionaries'] == {'region': ['R1', 'R2']}
+        assert result['data']['region'] == [0, 0, 1, 0]
+        # Unique ids and numbers are left as they are
+        assert result['data']['wsid'] == ['W1', 'W2', 'W3', 'W4']
+        assert result['data']['qty'] == [1, 2, 3, 4]
+
+    def test_format_parameter(self):
+        with app.test_request_context('/rows?format=dict'):
+            assert get_columnar_format(request) == 'dict'
+        with app.test_request_context('/rows'):
+            assert get_columnar_format(request) is None
+        with app.test_request_context('/rows?format=xml'):
+            with pytest.raises(ValueError):
+                get_columnar_format(request)
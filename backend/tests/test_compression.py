@@ -0,0 +1,86 @@
+"""
+Unit tests for backend/utils/compression.py
+"""
+import gzip
+import json
+import zlib
+from types import SimpleNamespace
+import pytest
+from flask import Flask, Response, jsonify, request
+from backend.utils import compression
+from backend.utils.compression import init_compression, precompressed_sibling
+
+app = Flask(__name__)
+init_compression(app)
+
+
+@app.route('/rows')
+def rows():
+    return jsonify([{'id': i, 'name': f'row {i}'} for i in range(200)])
+
+
+@app.route('/small')
+def small():
+    return jsonify({'ok': True})
+
+
+@app.route('/stream')
+def stream():
+    return Response((f'{{"id": {i}}}\n' for i in range(500)), mimetype='application/x-ndjson')
+
+
+# Stand-in for the optional brotli package (zlib-framed, so tests can decode it)
+fake_brotli = SimpleNamespace(compress=lambda body, quality: zlib.compress(body))
+
+
+@pytest.fixture
+def with_brotli(monkeypatch):
+    monkeypatch.setattr(compression, 'brotli', fake_brotli)
+
+
+class TestCompression:
+    """Test Accept-Encoding negotiation on responses"""
+
+    def test_gzip_json(self):
+        response = app.test_client().get('/rows', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert len(json.loads(gzip.decompress(response.data))) == 200
+
+    def test_identity_and_small_bodies(self):
+        client = app.test_client()
+        assert 'Content-Encoding' not in client.get('/rows').headers
+        assert 'Content-Encoding' not in client.get('/small', headers={'Accept-Encoding': 'gzip'}).headers
+
+    def test_streamed_body(self):
+        response = app.test_client().get('/stream', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert len(gzip.decompress(response.data).splitlines()) == 500
+
+    def test_brotli_preferred_when_installed(self, with_brotli):
+        client = app.test_client()
+        response = client.get('/rows', headers={'Accept-Encoding': 'gzip, br'})
+        assert response.headers['Content-Encoding'] == 'br'
+        assert len(json.loads(zlib.decompress(response.data))) == 200
+        assert client.get('/rows', headers={'Accept-Encoding': 'gzip'}).headers['Content-Encoding'] == 'gzip'
+        # Streamed bodies stay gzip
+        assert client.get('/stream', headers={'Accept-Encoding': 'br, gzip'}).headers['Content-Encoding'] == 'gzip'
+
+    def test_gzip_without_brotli(self, monkeypatch):
+        monkeypatch.setattr(compression, 'brotli', None)
+        response = app.test_client().get('/rows', headers={'Accept-Encoding': 'br, gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+
+
+class TestPrecompressedSibling:
+    """Test static .br/.gz lookup"""
+
+    def test_prefers_brotli_when_accepted(self, tmp_path):
+        for name in ('app.js', 'app.js.gz', 'app.js.br'):
+            (tmp_path / name).write_bytes(b'x')
+        with app.test_request_context('/app.js', headers={'Accept-Encoding': 'gzip, br'}):
+            assert precompressed_sibling(str(tmp_path), 'app.js', request) == ('app.js.br', 'br')
+        with app.test_request_context('/app.js', headers={'Accept-Encoding': 'gzip'}):
+            assert precompressed_sibling(str(tmp_path), 'app.js', request) == ('app.js.gz', 'gzip')
+        with app.test_request_context('/app.js'):
+            assert precompressed_sibling(str(tmp_path), 'app.js', request) is None
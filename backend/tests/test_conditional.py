@@ -0,0 +1,72 @@
+"""
+Unit tests for backend/utils/conditional.py
+"""
+import pytest
+from flask import Blueprint, Flask, jsonify
+from backend.utils.conditional import init_conditional_requests, track_data_versions
+from backend.utils.data_cache import get_file_version
+
+
+class FileSource:
+    """Minimal file-backed data source"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def get_data_version(self):
+        return get_file_version(self.path)
+
+    def get_data_files(self):
+        return [self.path]
+
+
+@pytest.fixture
+def setup(tmp_path):
+    data_file = tmp_path / 'items.csv'
+    data_file.write_text('id\n1\n')
+    calls = []
+
+    tracked = Blueprint('tracked', __name__)
+    track_data_versions(tracked, FileSource(str(data_file)))
+
+    @tracked.route('/items')
+    def items():
+        calls.append('items')
+        return jsonify([{'id': 1}])
+
+    untracked = Blueprint('untracked', __name__)
+
+    @untracked.route('/status')
+    def status():
+        return jsonify({'ok': True})
+
+    app = Flask(__name__)
+    app.register_blueprint(tracked, url_prefix='/api')
+    app.register_blueprint(untracked, url_prefix='/api')
+    init_conditional_requests(app)
+    return app.test_client(), data_file, calls
+
+
+class TestConditionalRequests:
+    """Test ETag / Last-Modified handling"""
+
+    def test_version_etag_skips_view(self, setup):
+        client, _, calls = setup
+        first = client.get('/api/items')
+        assert first.headers['ETag'] and first.headers['Last-Modified']
+        second = client.get('/api/items', headers={'If-None-Match': first.headers['ETag']})
+        assert second.status_code == 304 and second.data == b''
+        assert calls == ['items']
+
+    def test_etag_changes_with_data_and_query(self, setup):
+        client, data_file, _ = setup
+        etag = client.get('/api/items').headers['ETag']
+        assert client.get('/api/items?page=2').headers['ETag'] != etag
+        data_file.write_text('id\n1\n2\n')
+        response = client.get('/api/items', headers={'If-None-Match': etag})
+        assert response.status_code == 200 and response.headers['ETag'] != etag
+
+    def test_body_hash_fallback(self, setup):
+        client, _, _ = setup
+        etag = client.get('/api/status').headers['ETag']
+        assert client.get('/api/status', headers={'If-None-Match': etag}).status_code == 304
@@ -0,0 +1,43 @@
+"""
+Unit tests for backend/utils/fuzzy_index.py
+"""
+from backend.utils.fuzzy_index import FuzzyIndex, bounded_edit_distance, edit_distance
+
+
+class TestEditDistance:
+    """Test bit-parallel edit distance"""
+
+    def test_edit_distance(self):
+        assert edit_distance('kitten', 'sitting') == 3
+        assert edit_distance('', 'abc') == 3
+        assert edit_distance('obeng', 'obeng') == 0
+
+    def test_bounded(self):
+        assert bounded_edit_distance('tang', 'tank', 1) == 1
+        assert bounded_edit_distance('tang', 'multimeter', 2) is None
+
+
+class TestFuzzyIndex:
+    """Test typo-tolerant lookups"""
+
+    def setup_method(self):
+        self.index = FuzzyIndex([
+            (0, 'Obeng Plus'), (1, 'Tang Potong'), (2, 'Multimeter Digital'),
+            (3, 'P-1020'), (3, 'Card Reader'),
+        ])
+
+    def test_typo(self):
+        key, name, score = self.index.search('multimetr digitl')[0]
+        assert (key, name) == (2, 'Multimeter Digital')
+        assert 0 < score < 1
+
+    def test_partial_name(self):
+        assert self.index.search('tang pot')[0][0] == 1
+
+    def test_one_result_per_key(self):
+        results = self.index.search('card reder p-1020')
+        assert [key for key, _, _ in results].count(3) == 1
+
+    def test_limit_and_no_match(self):
+        assert len(self.index.search('o', limit=1)) <= 1
+        assert self.index.search('zzzzzz') == []
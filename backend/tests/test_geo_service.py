@@ -0,0 +1,175 @@
+"""
+Unit tests for backend/services/geo_service.py
+"""
+import os
+import pandas as pd
+import pytest
+from backend.services.assignment_service import AssignmentService
+from backend.services.engineer_service import EngineerService
+from backend.services.fsl_service import FSLLocationService
+from backend.services.geo_service import GeoService
+from backend.services.machine_service import MachineService
+from backend.services.province_centroids import ProvinceCentroids
+from backend.services.so_service import SOService
+
+
+@pytest.fixture
+def geo_service(tmp_path):
+    """GeoService over temporary machine, engineer and FSL CSVs"""
+    pd.DataFrame([
+        {'wsid': 'W1', 'area_group': 'Jakarta', 'region': 'R1', 'machine_status': 'Active',
+         'latitude': -6.20, 'longitude': 106.84},
+        {'wsid': 'W2', 'area_group': 'Jakarta', 'region': 'R1', 'machine_status': 'Inactive',
+         'latitude': -6.21, 'longitude': 106.85},
+        {'wsid': 'W3', 'area_group': 'Medan', 'region': 'R2', 'machine_status': 'Active',
+         'latitude': 3.59, 'longitude': 98.67},
+        {'wsid': 'W4', 'area_group': 'Medan', 'region': 'R2', 'machine_status': 'Active',
+         'latitude': '', 'longitude': ''},
+    ]).to_csv(tmp_path / 'data_mesin.csv', index=False)
+    pd.DataFrame([
+        {'id': 'E1', 'name': 'Budi', 'latitude': -6.30, 'longitude': 106.80},
+    ]).to_csv(tmp_path / 'data_ce.csv', index=False)
+    pd.DataFrame([
+        {'fsl_id': 1, 'fsl_name': 'FSL Medan', 'fsl_city': 'Medan'},
+    ]).to_csv(tmp_path / 'alamat_fsl.csv', index=False)
+    pd.DataFrame([
+        {'so_number': 'SO1', 'wsid': 'W1', 'resolution_time': 2.0},
+        {'so_number': 'SO2', 'wsid': 'W1', 'resolution_time': 4.0},
+        {'so_number': 'SO3', 'wsid': 'W2', 'resolution_time': ''},
+        {'so_number': 'SO4', 'wsid': 'W3', 'resolution_time': 6.0},
+        {'so_number': 'SO5', 'wsid': 'W9', 'resolution_time': 1.0},
+    ]).to_csv(tmp_path / 'so_apr_spt.csv', index=False)
+
+    services = [MachineService(), EngineerService(), FSLLocationService(), SOService()]
+    file_names = ['data_mesin.csv', 'data_ce.csv', 'alamat_fsl.csv', 'so_apr_spt.csv']
+    for service, file_name in zip(services, file_names):
+        service.file_path = str(tmp_path / file_name)
+    machine_service, engineer_service, fsl_service, so_service = services
+    return GeoService(engineer_service=engineer_service, fsl_service=fsl_service,
+                      machine_service=machine_service, so_service=so_service)
+
+
+class TestNearest:
+    """Test nearest engineer / FSL queries"""
+
+    def test_nearest_fsl_by_city(self, geo_service):
+        data = geo_service.nearest(3.5, 98.6, k=3, point_type='fsl')
+        assert [item['fsl_name'] for item in data['results']] == ['FSL Medan']
+        assert data['results'][0]['distance_km'] < 15
+
+    def test_max_km(self, geo_service):
+        assert geo_service.nearest(3.5, 98.6, k=3, max_km=50)['results'] == []
+
+
+class TestCoverage:
+    """Test machine coverage analysis"""
+
+    def test_buckets(self, geo_service):
+        data = geo_service.get_coverage(wait=10)
+        assert data['status'] == 'ready' and not data['stale']
+        assert data['summary']['engineer_buckets'] == {'0-60km': 2, '60-120km': 0, '>120km': 1, 'unknown': 1}
+        assert data['summary']['fsl_buckets']['0-60km'] == 1
+
+        machines = geo_service.get_coverage_machines(bucket='>120km')
+        assert machines['wsid'].tolist() == ['W3']
+
+
+class TestClusters:
+    """Test grid clustering"""
+
+    def test_zoom_levels(self, geo_service):
+        low = geo_service.clusters(layer='machine', zoom=3)
+        assert low['total'] == 3
+        jakarta = next(item for item in low['clusters'] if item['count'] == 2)
+        assert jakarta['by_status'] == {'Active': 1, 'Inactive': 1}
+
+        high = geo_service.clusters(layer='machine', zoom=18)
+        assert len(high['clusters']) == 3
+        assert {item['id'] for item in high['clusters']} == {'W1', 'W2', 'W3'}
+
+    def test_bbox(self, geo_service):
+        data = geo_service.clusters(layer='machine', zoom=10, bbox=(106, -7, 107, -6))
+        assert data['total'] == 2
+
+
+class TestAssignment:
+    """Test the assignment optimizer service"""
+
+    def test_capacity_and_summary(self, geo_service):
+        service = AssignmentService(machine_service=geo_service.machine_service,
+                                    engineer_service=geo_service.engineer_service)
+        data = service.get_assignment(capacity=5, wait=10)
+        assert data['status'] == 'ready'
+        assert data['summary']['assigned'] == 3 and data['summary']['unassigned'] == 0
+        assert data['engineers'][0]['load'] == 3
+
+        machines = service.get_assignment_machines(engineer='E1')
+        assert sorted(machines['wsid']) == ['W1', 'W2', 'W3']
+
+
+class TestServiceLoad:
+    """Test the SO service-load join"""
+
+    def test_heatmap_cells(self, geo_service):
+        data = geo_service.service_load_heatmap(zoom=3)
+        assert data['total_so'] == 5 and data['unmatched_so'] == 1
+        cells = [dict(zip(data['fields'], cell)) for cell in data['cells']]
+        assert [(cell['so_count'], cell['machines']) for cell in cells] == [(3, 2), (1, 1)]
+        assert cells[0]['avg_resolution_time'] == 3.0
+
+    def test_bbox_and_machines(self, geo_service):
+        data = geo_service.service_load_heatmap(zoom=3, bbox=(95, 0, 100, 5))
+        assert [cell[2] for cell in data['cells']] == [1]
+        machines = geo_service.get_service_load_machines()
+        assert machines['wsid'].tolist() == ['W1', 'W2', 'W3']
+
+
+class TestMachineCoordinates:
+    """Test province centroid enrichment of machines"""
+
+    def test_writes_keep_centroids_out_of_csv(self, tmp_path):
+        lookup = tmp_path / 'province_centroids.csv'
+        lookup.write_text('provinsi_key,provinsi,latitude,longitude\ndkijakarta,DKI JAKARTA,-6.2,106.84\n')
+        pd.DataFrame([
+            {'wsid': 'W1', 'provinsi': 'DKI Jakarta', 'region': 'R1', 'latitude': '', 'longitude': ''},
+            {'wsid': 'W2', 'provinsi': 'DKI Jakarta', 'region': 'R1', 'latitude': -6.3, 'longitude': 106.9},
+        ]).to_csv(tmp_path / 'data_mesin.csv', index=False)
+        service = MachineService()
+        service.file_path = str(tmp_path / 'data_mesin.csv')
+        service._centroids = ProvinceCentroids(str(tmp_path / 'missing.geojson'), str(lookup))
+        assert [row['coordinate_source'] for row in service.get_all()] == ['province_centroid', 'gps']
+
+        service.update('W1', {'region': 'R2'})
+        saved = pd.read_csv(service.file_path)
+        assert 'coordinate_source' not in saved.columns
+        assert saved['latitude'].isna().tolist() == [True, False]
+        machine = service.get_by_id('W1')
+        assert (machine['region'], machine['latitude'], machine['coordinate_source']) == ('R2', -6.2, 'province_centroid')
+
+    def test_lookup_is_read_only(self, tmp_path):
+        shipped = ProvinceCentroids()
+        assert os.path.exists(shipped.lookup_path) and len(shipped.get_lookup()) == 34
+
+        # Missing lookup: computed from the GeoJSON in memory, nothing written
+        lookup = ProvinceCentroids(shipped.geojson_path, str(tmp_path / 'province_centroids.csv'))
+        assert lookup.get_lookup() == shipped.get_lookup()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_geo_skips_centroid_placeholders(self, geo_service, tmp_path):
+        machines = pd.read_csv(tmp_path / 'data_mesin.csv')
+        machines['provinsi'] = ['DKI Jakarta', 'DKI Jakarta', 'Sumatera Utara', 'Sumatera Utara']
+        machines.to_csv(tmp_path / 'data_mesin.csv', index=False)
+        lookup = tmp_path / 'province_centroids.csv'
+        lookup.write_text('provinsi_key,provinsi,latitude,longitude\nsumaterautara,SUMATERA UTARA,2.19,99.06\n')
+        geo_service.machine_service._centroids = ProvinceCentroids(str(tmp_path / 'missing.geojson'), str(lookup))
+        assert geo_service.machine_service.get_by_id('W4')['coordinate_source'] == 'province_centroid'
+
+        # W4 is only placed at its province centroid: no distance, cluster or assignment
+        summary = geo_service.get_coverage(wait=10)['summary']
+        assert (summary['engineer_buckets']['unknown'], summary['approximate']) == (1, 1)
+        clusters = geo_service.clusters(zoom=0)
+        assert (clusters['total'], clusters['approximate']) == (3, 1)
+        assignment = AssignmentService(geo_service.machine_service, geo_service.engineer_service)
+        assert assignment.compute_assignment()['summary']['located'] == 3
+        with pytest.raises(ValueError):
+            geo_service.get_machine_location('W4')
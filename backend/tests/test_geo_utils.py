@@ -0,0 +1,97 @@
+"""
+Unit tests for backend/utils/geo_utils.py
+"""
+import numpy as np
+import pandas as pd
+from backend.utils.geo_utils import (
+    KDTree,
+    canonical_province_keys,
+    chord_to_km,
+    city_coordinates,
+    haversine_km,
+    km_to_chord,
+    nearest_points,
+    polygon_centroid,
+    province_key,
+    to_unit_vectors,
+)
+
+
+class TestDistances:
+    """Test distance conversions"""
+
+    def test_haversine(self):
+        assert abs(float(haversine_km(-6.2088, 106.8456, -6.9175, 107.6191)) - 116.2) < 0.1
+        assert float(haversine_km(0, 0, 0, 0)) == 0
+
+    def test_chord_matches_haversine(self):
+        points = to_unit_vectors([-6.2088, 3.5952], [106.8456, 98.6722])
+        chord = np.linalg.norm(points[0] - points[1])
+        expected = float(haversine_km(-6.2088, 106.8456, 3.5952, 98.6722))
+        assert abs(float(chord_to_km(chord)) - expected) < 1e-6
+        assert abs(km_to_chord(expected) - chord) < 1e-9
+
+    def test_city_lookup(self):
+        assert city_coordinates(' surabaya ') == (-7.2575, 112.7521)
+        assert city_coordinates('Atlantis') is None
+
+
+class TestKDTree:
+    """Test k-nearest queries against brute force"""
+
+    def setup_method(self):
+        rng = np.random.default_rng(7)
+        self.lat = rng.uniform(-11, 6, 500)
+        self.lng = rng.uniform(95, 141, 500)
+        self.tree = KDTree(to_unit_vectors(self.lat, self.lng), leaf_size=8)
+
+    def test_matches_brute_force(self):
+        for lat, lng in [(-6.2, 106.8), (3.6, 98.7), (-2.6, 140.7)]:
+            distances, indices = self.tree.query(to_unit_vectors([lat], [lng])[0], k=5)
+            expected = np.argsort(haversine_km(lat, lng, self.lat, self.lng))[:5]
+            assert indices.tolist() == expected.tolist()
+            assert np.all(np.diff(distances) >= 0)
+
+    def test_max_distance(self):
+        query = to_unit_vectors([-6.2], [106.8])[0]
+        distances, indices = self.tree.query(query, k=500, max_distance=km_to_chord(300))
+        within = np.flatnonzero(haversine_km(-6.2, 106.8, self.lat, self.lng) <= 300)
+        assert sorted(indices.tolist()) == sorted(within.tolist())
+
+    def test_empty(self):
+        distances, indices = KDTree(np.empty((0, 3))).query(np.zeros(3), k=3)
+        assert len(distances) == 0 and len(indices) == 0
+
+
+class TestNearestPoints:
+    """Test blocked brute-force nearest search"""
+
+    def test_matches_full_matrix(self):
+        rng = np.random.default_rng(3)
+        lat, lng = rng.uniform(-11, 6, 300), rng.uniform(95, 141, 300)
+        point_lat, point_lng = rng.uniform(-11, 6, 40), rng.uniform(95, 141, 40)
+        indices, distances = nearest_points(lat, lng, point_lat, point_lng, max_block=100)
+        matrix = haversine_km(lat[:, None], lng[:, None], point_lat[None, :], point_lng[None, :])
+        assert indices.tolist() == matrix.argmin(axis=1).tolist()
+        assert np.allclose(distances, matrix.min(axis=1))
+
+    def test_no_points(self):
+        indices, distances = nearest_points([1.0], [100.0], [], [])
+        assert indices.tolist() == [-1] and np.isnan(distances[0])
+
+
+class TestProvinceCentroids:
+    """Test centroid computation and province name matching"""
+
+    def test_square_with_hole(self):
+        square = [[[100, -1], [102, -1], [102, 1], [100, 1], [100, -1]]]
+        lat, lng = polygon_centroid({'type': 'Polygon', 'coordinates': square})
+        assert abs(lat) < 1e-9 and abs(lng - 101) < 1e-9
+
+        hole = [[101, -1], [102, -1], [102, 1], [101, 1], [101, -1]]
+        lat, lng = polygon_centroid({'type': 'Polygon', 'coordinates': square + [hole]})
+        assert abs(lng - 100.5) < 1e-9
+
+    def test_aliases(self):
+        keys = canonical_province_keys(pd.Series(['Aceh', 'sumatra Utara', 'nan', 'Jawa Tengah']))
+        assert keys.tolist() == [province_key('DI. ACEH'), province_key('SUMATERA UTARA'), None, 'jawatengah']
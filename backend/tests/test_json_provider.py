@@ -0,0 +1,45 @@
+"""
+Unit tests for backend/utils/json_provider.py
+"""
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from flask import Flask
+from backend.utils import json_provider
+from backend.utils.json_provider import FastJSONProvider
+
+app = Flask(__name__)
+provider = FastJSONProvider(app)
+
+PAYLOAD = {
+    'count': np.int64(3),
+    'ratio': np.float32(0.5),
+    'missing': float('nan'),
+    'values': np.array([1, 2]),
+    'when': pd.NaT,
+    'flag': np.bool_(True),
+}
+EXPECTED = {'count': 3, 'ratio': 0.5, 'missing': None, 'values': [1, 2], 'when': None, 'flag': True}
+
+
+@pytest.fixture(params=['orjson', 'stdlib'])
+def encoder(request, monkeypatch):
+    if request.param == 'orjson':
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr(json_provider, 'orjson', None)
+    return request.param
+
+
+class TestFastJSONProvider:
+    """Test encoding with and without orjson"""
+
+    def test_numpy_pandas_and_nan(self, encoder):
+        assert json.loads(provider.dumps(PAYLOAD)) == EXPECTED
+
+    def test_response_matches_flask_layout(self, encoder):
+        with app.app_context():
+            response = provider.response({'b': 1, 'a': [np.int32(2)]})
+        assert response.get_data() == b'{"a":[2],"b":1}\n'
+        assert response.mimetype == 'application/json'
@@ -0,0 +1,81 @@
+"""
+Unit tests for backend/services/kpi_service.py
+"""
+import pandas as pd
+from backend.services.kpi_service import KPIService
+
+
+class FakeSOService:
+    """Stand-in for SOService serving an in-memory frame"""
+
+    def __init__(self, df):
+        self.df = df
+        self.version = (1, 1)
+
+    def get_data_version(self):
+        return self.version
+
+    def _get_dataframe(self):
+        return self.df.copy()
+
+
+def make_service():
+    df = pd.DataFrame([
+        {'so_number': 'SO1', 'engineer': 'Budi', 'wsid': 'W1', 'area_group': 'Jakarta 1',
+         'branch_name': 'B1', 'ce_response_time': 60, 'resolution_time': 120},
+        {'so_number': 'SO2', 'engineer': 'Budi', 'wsid': 'W2', 'area_group': 'Jakarta 1',
+         'branch_name': 'B2', 'ce_response_time': 150, 'resolution_time': 60},
+        {'so_number': 'SO3', 'engineer': 'Sari', 'wsid': 'W3', 'area_group': 'Bandung',
+         'branch_name': 'B3', 'ce_response_time': 30, 'resolution_time': 30},
+    ])
+    return KPIService(so_service=FakeSOService(df))
+
+
+class TestKPIService:
+    """Test incremental KPI aggregates"""
+
+    def test_initial_sync(self):
+        service = make_service()
+        budi = service.get_by_engineer('Budi')
+        assert budi['productivity']['total_so_individual'] == 2
+        assert budi['productivity']['total_machine'] == 2
+        assert budi['productivity']['total_ce_area'] == 1
+        assert budi['response_time']['zona_1_count'] == 1
+        assert budi['response_time']['zona_2_count'] == 1
+        assert budi['resolution_time']['avg_resolution_time'] == 90.0
+
+    def test_delta_only_touches_affected_engineers(self):
+        service = make_service()
+        service.get_all()
+        result = service.apply_so_delta(upserts=[
+            {'SO Number': 'SO4', 'Engineer': 'Sari', 'WSID': 'W3', 'Area Group': 'Bandung',
+             'Branch Name': 'B3', 'CE Response Time': 200, 'Resolution Time': 90},
+        ])
+        assert result['affected_engineers'] == ['Sari']
+        sari = service.get_by_engineer('Sari')
+        assert sari['productivity']['total_so_individual'] == 2
+        # Same machine twice still counts as one distinct machine
+        assert sari['productivity']['total_machine'] == 1
+        assert sari['response_time']['zona_3_count'] == 1
+
+    def test_delta_moves_and_removes_sos(self):
+        service = make_service()
+        service.apply_so_delta(upserts=[
+            {'so_number': 'SO2', 'engineer': 'Sari', 'wsid': 'W2', 'area_group': 'Bandung',
+             'branch_name': 'B2', 'ce_response_time': 150, 'resolution_time': 60},
+        ], deletes=['SO3'])
+        budi = service.get_by_engineer('Budi')
+        sari = service.get_by_engineer('Sari')
+        assert budi['productivity']['total_so_individual'] == 1
+        assert budi['productivity']['total_so_area'] == 1
+        assert sari['productivity']['total_so_individual'] == 1
+        assert sari['productivity']['total_machine'] == 1
+
+    def test_file_change_is_reconciled(self):
+        service = make_service()
+        service.get_all()
+        fake = service.so_service
+        fake.df = fake.df[fake.df['so_number'] != 'SO3']
+        fake.version = (2, 1)
+        assert service.sync() == {'Sari'}
+        assert [e['engineer'] for e in service.get_all()] == ['Budi']
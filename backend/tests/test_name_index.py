@@ -0,0 +1,41 @@
+"""
+Unit tests for backend/utils/name_index.py
+"""
+import pandas as pd
+from backend.utils.name_index import NameIndex, normalize_name, fold_name
+
+
+class TestNormalizeName:
+    """Test name normalization helpers"""
+    
+    def test_strip_and_nfkc(self):
+        assert normalize_name("  Obeng ＋ ") == "Obeng +"
+    
+    def test_none(self):
+        assert normalize_name(None) == ""
+    
+    def test_fold(self):
+        assert fold_name("Kunci  L") == "kunci  l"
+
+
+class TestNameIndex:
+    """Test NameIndex lookups"""
+    
+    def setup_method(self):
+        self.index = NameIndex(pd.Series(["Screw Driver (+)", "", "Kunci L", "kunci l", "Tang＋"],
+                                         index=[10, 11, 12, 13, 14]))
+    
+    def test_exact_match_preferred(self):
+        assert self.index.lookup("kunci l") == 13
+        assert self.index.lookup("Kunci L") == 12
+    
+    def test_case_insensitive_fallback(self):
+        assert self.index.lookup("SCREW DRIVER (+)") == 10
+    
+    def test_unicode_normalized(self):
+        assert self.index.lookup(" Tang+ ") == 14
+    
+    def test_missing_and_empty(self):
+        assert self.index.lookup("Palu") is None
+        assert self.index.lookup("") is None
+        assert len(self.index) == 4
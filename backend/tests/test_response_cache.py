@@ -0,0 +1,79 @@
+"""
+Unit tests for backend/utils/response_cache.py
+"""
+import gzip
+import json
+import threading
+from flask import Flask
+from backend.utils.response_cache import ResponseCache, cached_json_response, response_cache
+
+app = Flask(__name__)
+state = {"version": 1, "builds": 0}
+
+
+@app.route('/rows')
+def rows():
+    def build():
+        state["builds"] += 1
+        return [{"id": i, "name": f"row {i}"} for i in range(200)]
+    return cached_json_response(state["version"], build)
+
+
+class TestCachedJsonResponse:
+    """Test response body caching"""
+
+    def setup_method(self):
+        response_cache.invalidate()
+        state.update(version=1, builds=0)
+
+    def test_hit_until_version_changes(self):
+        client = app.test_client()
+        first = client.get('/rows')
+        second = client.get('/rows')
+        assert (first.headers['X-Cache'], second.headers['X-Cache']) == ('MISS', 'HIT')
+        assert first.data == second.data and state["builds"] == 1
+
+        state["version"] = 2
+        assert client.get('/rows').headers['X-Cache'] == 'MISS'
+        assert state["builds"] == 2
+
+    def test_query_string_is_part_of_key(self):
+        client = app.test_client()
+        client.get('/rows')
+        assert client.get('/rows?page=2').headers['X-Cache'] == 'MISS'
+
+    def test_gzip(self):
+        response = app.test_client().get('/rows', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert len(json.loads(gzip.decompress(response.data))) == 200
+
+
+class TestResponseCache:
+    """Test concurrent builds"""
+
+    def test_build_does_not_block_other_keys(self):
+        cache = ResponseCache()
+        started, release = threading.Event(), threading.Event()
+        results = []
+
+        def slow_build():
+            started.set()
+            release.wait(5)
+            return b"slow"
+
+        def fetch_slow():
+            results.append(cache.get("slow", 1, slow_build))
+
+        slow = [threading.Thread(target=fetch_slow) for _ in range(2)]
+        slow[0].start()
+        assert started.wait(5)
+        slow[1].start()
+        # Served while "slow" is still building
+        assert cache.get("fast", 1, lambda: b"fast")[0].body == b"fast"
+
+        release.set()
+        for thread in slow:
+            thread.join(5)
+        # The second request waited for the first build instead of repeating it
+        assert sorted(hit for _, hit in results) == [False, True]
+        assert results[0][0] is results[1][0]
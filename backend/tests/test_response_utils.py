@@ -0,0 +1,42 @@
+"""
+Unit tests for backend/utils/response_utils.py
+"""
+import pytest
+from flask import Flask, request
+from backend.utils.response_utils import (
+    PROFILE_COMPACT,
+    PROFILE_LEGACY,
+    get_response_profile,
+    parse_fields
+)
+
+app = Flask(__name__)
+
+
+class TestResponseProfile:
+    """Test response profile negotiation"""
+
+    def test_default_is_legacy(self):
+        with app.test_request_context('/api/tools'):
+            assert get_response_profile(request) == PROFILE_LEGACY
+
+    def test_query_parameter(self):
+        with app.test_request_context('/api/tools?profile=compact'):
+            assert get_response_profile(request) == PROFILE_COMPACT
+
+    def test_accept_header(self):
+        with app.test_request_context(
+                '/api/tools', headers={'Accept': 'application/vnd.rocdashboard.v2+json'}):
+            assert get_response_profile(request) == PROFILE_COMPACT
+
+
+class TestParseFields:
+    """Test fields= projection parsing"""
+
+    def test_parse_fields(self):
+        assert parse_fields(None, ['a', 'b']) is None
+        assert parse_fields('b, a,b', ['a', 'b']) == ['b', 'a']
+
+    def test_unknown_field(self):
+        with pytest.raises(ValueError):
+            parse_fields('a,c', ['a', 'b'])
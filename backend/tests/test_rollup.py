@@ -0,0 +1,51 @@
+"""
+Unit tests for backend/utils/rollup.py and the machine rollup
+"""
+import pandas as pd
+from backend.routes import machines
+from backend.services.machine_service import MachineService, ROLLUP_DIMENSIONS
+from backend.utils.rollup import Rollup
+
+
+class TestRollup:
+    """Test rollup queries"""
+
+    def test_query(self):
+        df = pd.DataFrame({'region': ['R1', 'R1', 'R2'], 'status': ['Active', 'Down', 'Active']})
+        rollup = Rollup.from_frame(df, ['region', 'status', 'type'])
+        assert rollup.present == {'region', 'status'}
+        assert rollup.query([], {'status': ['Active']}) == [{'count': 2}]
+        assert rollup.query(['type']) == [{'type': '', 'count': 3}]
+
+
+class TestMachineRollup:
+    """Test rollup maintenance on machine writes"""
+
+    def test_writes_match_rebuild(self, tmp_path):
+        pd.DataFrame([
+            {'wsid': 'W1', 'branch_name': 'B', 'region': 'R1', 'machine_status': 'Active', 'machine_type': 'T1'},
+            {'wsid': 'W2', 'branch_name': 'B', 'region': 'R2', 'machine_status': 'Down', 'machine_type': 'T1'},
+        ]).to_csv(tmp_path / 'data_mesin.csv', index=False)
+        service = MachineService()
+        service.file_path = str(tmp_path / 'data_mesin.csv')
+        assert service.get_statistics()['by_region'] == {'R1': 1, 'R2': 1}
+
+        service.create({'wsid': 'W3', 'branch_name': 'B', 'region': 'R1', 'machine_status': 'Active'})
+        service.update('W2', {'region': 'R1'})
+        service.delete('W1')
+        service.bulk_upsert([{'wsid': 'W4', 'branch_name': 'B', 'region': 'R3'}])
+
+        maintained = service.get_rollup_table()
+        rebuilt = Rollup.from_frame(service._get_cached_dataframe(), ROLLUP_DIMENSIONS)
+        assert maintained.query(list(ROLLUP_DIMENSIONS)) == rebuilt.query(list(ROLLUP_DIMENSIONS))
+        assert service.get_statistics()['by_region'] == {'R1': 2, 'R3': 1}
+
+    def test_route_ignores_unrelated_params(self, client, tmp_path, monkeypatch):
+        pd.DataFrame([
+            {'wsid': 'W1', 'branch_name': 'B', 'region': 'R1', 'machine_status': 'Active'},
+            {'wsid': 'W2', 'branch_name': 'B', 'region': 'R2', 'machine_status': 'Active'},
+        ]).to_csv(tmp_path / 'data_mesin.csv', index=False)
+        monkeypatch.setattr(machines.service, 'file_path', str(tmp_path / 'data_mesin.csv'))
+        response = client.get('/api/machines/rollup?group_by=region&region=R1&_=1700000000')
+        assert response.status_code == 200
+        assert response.get_json()['rows'] == [{'region': 'R1', 'count': 1}]
@@ -0,0 +1,35 @@
+"""
+Unit tests for backend/utils/search_index.py
+"""
+from backend.utils.search_index import SearchIndex
+
+RECORDS = [
+    {'name': 'Kunci Pas 10mm', 'remark': 'Tang cadangan'},
+    {'name': 'Tang Potong', 'remark': ''},
+    {'name': 'Obeng Plus', 'remark': 'Untuk tang'},
+    {'name': 'Multimeter', 'remark': None},
+]
+
+
+class TestSearchIndex:
+    """Test token/trigram search"""
+
+    def test_substring_match(self):
+        index = SearchIndex(RECORDS, ['name', 'remark'])
+        assert index.search('meter') == [3]
+        assert index.search('METER') == [3]
+
+    def test_ranking_prefers_earlier_field_and_token(self):
+        index = SearchIndex(RECORDS, ['name', 'remark'])
+        assert index.search('tang') == [1, 0, 2]
+
+    def test_short_terms_match_word_prefix(self):
+        index = SearchIndex(RECORDS, ['name', 'remark'])
+        assert index.search('ob') == [2]
+        assert index.search('bo') == []
+
+    def test_all_terms_must_match(self):
+        index = SearchIndex(RECORDS, ['name', 'remark'])
+        assert index.search('tang pot') == [1]
+        assert index.search('tang xyz') == []
+        assert index.search('tang', limit=1) == [1]
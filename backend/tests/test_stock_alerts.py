@@ -0,0 +1,57 @@
+"""
+Unit tests for backend/services/stock_alerts.py and stock part alerting
+"""
+import pytest
+
+
+class TestStockAlerts:
+    """Test reorder thresholds and alert queue"""
+
+    def test_update_crossing_raises_alert(self, stock_part_service):
+        stock_part_service.update('P1', {'qty': 3})
+        alerts = stock_part_service.get_alerts()['alerts']
+        assert [(a['type'], a['part_number'], a['qty']) for a in alerts] == [('low_stock', 'P1', 3)]
+
+        # Staying below threshold doesn't repeat the alert; going back up restocks
+        stock_part_service.update('P1', {'qty': 2})
+        stock_part_service.update('P1', {'qty': 15})
+        alerts = stock_part_service.get_alerts(since=alerts[-1]['id'])['alerts']
+        assert [a['type'] for a in alerts] == ['restocked']
+
+    def test_bulk_upsert_and_movements(self, stock_part_service):
+        stock_part_service.bulk_upsert([
+            {'part_number': 'P3', 'part_name': 'Belt Motor', 'fsl': 'FSL A', 'region': 'R1', 'qty': 12},
+            {'part_number': 'P4', 'part_name': 'Fan', 'fsl': 'FSL B', 'region': 'R2', 'qty': 1},
+        ])
+        stock_part_service.record_movement('P2', 'in', 10)
+        alerts = stock_part_service.get_alerts()['alerts']
+        assert [(a['type'], a['part_number']) for a in alerts] == [
+            ('restocked', 'P3'), ('low_stock', 'P4'), ('restocked', 'P2')]
+
+    def test_thresholds_by_fsl_and_part(self, stock_part_service):
+        stock_part_service.set_threshold('fsl', 'FSL A', 12)
+        assert [a['part_number'] for a in stock_part_service.get_alerts()['alerts']] == ['P1']
+        stock_part_service.set_threshold('part', 'P1', 5)
+        assert stock_part_service.get_alerts()['alerts'][-1]['type'] == 'restocked'
+        assert stock_part_service.get_thresholds()['part'] == {'P1': 5.0}
+        assert stock_part_service.get_statistics()['low_stock_count'] == 2
+        with pytest.raises(ValueError):
+            stock_part_service.set_threshold('region', 'R1', 3)
+
+    def test_low_stock_count_per_row(self, stock_part_service):
+        # P1 stocked in two FSLs, both low
+        stock_part_service.update('P1', {'qty': 4})
+        assert stock_part_service.get_statistics()['low_stock_count'] == len(
+            stock_part_service.get_low_stock_parts(10)) == 4
+
+    def test_same_part_in_two_fsls(self, stock_part_service):
+        stock_part_service.set_threshold('fsl', 'FSL A', 12)
+        stock_part_service.set_threshold('fsl', 'FSL B', 5)
+        stock_part_service.set_threshold('fsl', 'FSL A', None)
+        alerts = stock_part_service.get_alerts()['alerts']
+        assert [(a['type'], a['part_number'], a['fsl']) for a in alerts] == [
+            ('low_stock', 'P1', 'FSL A'), ('restocked', 'P1', 'FSL B'), ('restocked', 'P1', 'FSL A')]
+
+        # Deleting the part drops its state in both FSLs
+        stock_part_service.delete('P1')
+        assert stock_part_service._alerts.get_state(('P1', 'FSL B')) is None
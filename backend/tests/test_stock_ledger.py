@@ -0,0 +1,89 @@
+"""
+Unit tests for backend/services/stock_ledger.py and ledger-backed stock services
+"""
+import os
+import pandas as pd
+import pytest
+from backend.services.stock_ledger import StockLedger
+
+
+class TestStockLedger:
+    """Test append-only stock movements"""
+
+    def test_movements_append_without_rewriting_csv(self, stock_part_service):
+        before = os.stat(stock_part_service.file_path).st_mtime_ns
+        stock_part_service.record_movement('P1', 'out', 3, actor='budi', scope='FSL A')
+        movement = stock_part_service.record_movement('P1@FSL A', 'in', 5)
+        assert movement['balance'] == 12
+        assert os.stat(stock_part_service.file_path).st_mtime_ns == before
+        assert stock_part_service.get_current_stock('P1', scope='FSL A') == {'item': 'P1@FSL A', 'fsl': 'FSL A',
+                                                                             'qty': 12}
+        qty = [(row['part_number'], row['fsl'], row['qty']) for row in stock_part_service.get_all()]
+        assert qty == [('P1', 'FSL A', 12), ('P2', 'FSL B', 4), ('P3', 'FSL A', 7), ('P1', 'FSL B', 6)]
+
+    def test_rejects_negative_stock(self, stock_part_service):
+        with pytest.raises(ValueError):
+            stock_part_service.record_movement('P2', 'out', 5)
+        with pytest.raises(ValueError):
+            stock_part_service.record_movement('P9', 'in', 1)
+
+    def test_part_in_several_fsls(self, stock_part_service):
+        # P1 is stocked in FSL A and FSL B: the FSL must be named
+        with pytest.raises(ValueError, match='specify fsl'):
+            stock_part_service.record_movement('P1', 'in', 1)
+        stock_part_service.record_movement('P1', 'out', 2, scope='FSL B')
+        qty = [(row['fsl'], row['qty']) for row in stock_part_service.get_all() if row['part_number'] == 'P1']
+        assert qty == [('FSL A', 10), ('FSL B', 4)]
+        with pytest.raises(ValueError):
+            stock_part_service.record_movement('P1', 'in', 1, scope='FSL X')
+        # Unique part numbers don't need one
+        assert stock_part_service.record_movement('P3', 'in', 1)['item'] == 'P3@FSL A'
+
+    def test_checkpoint_and_replay(self, stock_part_service):
+        stock_part_service.record_movement('P2', 'adjust', -1)
+        assert stock_part_service.checkpoint_stock()['folded'] == 1
+        assert pd.read_csv(stock_part_service.file_path)['qty'].tolist() == [10, 3, 7, 6]
+
+        # Movements after the checkpoint are replayed from the ledger file on restart
+        stock_part_service.record_movement('P2', 'in', 2)
+        stock_part_service._ledger = StockLedger(stock_part_service._ledger.file_path)
+        stock_part_service._invalidate_cache()
+        assert stock_part_service.get_current_stock('P2')['qty'] == 5
+        assert len(stock_part_service._ledger.get_movements(item='P2@FSL B')) == 2
+
+    def test_write_folds_pending_movements_once(self, stock_part_service):
+        stock_part_service.record_movement('P1', 'in', 1, scope='FSL A')
+        stock_part_service.update('P1', {'part_name': 'Belt V'})
+        assert stock_part_service.get_current_stock('P1', scope='FSL A')['qty'] == 11
+        assert stock_part_service._ledger.get_pending('stock-parts') == {}
+
+    def test_tool_edit_records_movements(self, tool_service):
+        before = os.stat(tool_service.file_path).st_mtime_ns
+        tool = tool_service.get_by_tools_name('Tang Kombinasi')
+        result = tool_service.update_by_tools_name('Tang Kombinasi', {**tool, 'stock_new': 4, 'stock_old': 1},
+                                                   actor='budi')
+        assert [(m['bucket'], m['quantity'], m['actor']) for m in result['movements']] == [
+            ('new', 1, 'budi'), ('old', -1, 'budi')]
+        assert os.stat(tool_service.file_path).st_mtime_ns == before
+        assert tool_service.get_current_stock('tang kombinasi') == {'item': 'Tang Kombinasi', 'new': 4, 'old': 1}
+
+        # Other fields rewrite the CSV once, keeping the movements
+        tool = tool_service.get_by_tools_name('Tang Kombinasi')
+        tool_service.update_by_tools_name('Tang Kombinasi', {**tool, 'remark': 'Rusak 1'})
+        saved = pd.read_csv(tool_service.file_path)
+        assert saved[['Total', 'NEW', 'OLD', 'Remark']].values.tolist() == [[5, 4, 1, 'Rusak 1']]
+        assert tool_service._ledger.get_pending('tools') == {}
+
+    def test_upload_discards_pending_movements(self, stock_part_service):
+        from io import BytesIO
+        from werkzeug.datastructures import FileStorage
+        from backend.services.upload_service import UploadService
+
+        stock_part_service.record_movement('P1', 'out', 3, scope='FSL A')
+        assert stock_part_service.get_current_stock('P1', scope='FSL A')['qty'] == 7
+        upload = UploadService()
+        upload._stock_parts = stock_part_service
+        csv = b'part_number,part_name,fsl,region,qty\nP1,Belt,FSL A,R1,7\nP2,Card Reader,FSL B,R2,4\n'
+        upload.upload_csv(FileStorage(BytesIO(csv), filename='stok_part.csv'), 'stock-parts')
+        assert stock_part_service.get_current_stock('P1')['qty'] == 7
+        assert stock_part_service._ledger.get_pending('stock-parts') == {}
@@ -0,0 +1,50 @@
+"""
+Unit tests for backend/services/stock_service.py
+"""
+import pytest
+
+
+class TestStockPartQuery:
+    """Test filtering, sorting and paging on the cached frame"""
+
+    def test_filters(self, stock_part_service):
+        parts = stock_part_service.query(fsl='FSL A', region='R1')
+        assert [p['part_number'] for p in parts] == ['P1', 'P3']
+        assert stock_part_service.query(fsl='FSL X') == []
+
+    def test_search_sort_and_page(self, stock_part_service):
+        parts = stock_part_service.query(search='belt', sort_by='qty', descending=True)
+        assert [(p['part_number'], p['fsl']) for p in parts] == [('P1', 'FSL A'), ('P3', 'FSL A'), ('P1', 'FSL B')]
+
+        result = stock_part_service.query(sort_by='qty', page=2, per_page=3)
+        assert [p['part_number'] for p in result['items']] == ['P1']
+        assert result['total'] == 4
+        assert result['total_pages'] == 2
+        assert result['has_prev'] and not result['has_next']
+
+    def test_invalid_sort_column(self, stock_part_service):
+        with pytest.raises(ValueError):
+            stock_part_service.query(sort_by='missing')
+
+
+class TestFSLPartitions:
+    """Test per-FSL partitions"""
+
+    def test_fsl_summary(self, stock_part_service):
+        summary = {s['fsl']: s for s in stock_part_service.get_fsl_summary(threshold=8)}
+        assert summary['FSL A'] == {'fsl': 'FSL A', 'part_count': 2, 'total_quantity': 17, 'low_stock_count': 1}
+        assert summary['FSL B'] == {'fsl': 'FSL B', 'part_count': 2, 'total_quantity': 10, 'low_stock_count': 2}
+
+    def test_low_stock(self, stock_part_service):
+        parts = stock_part_service.get_low_stock_parts(threshold=8)
+        assert [(p['part_number'], p['fsl']) for p in parts] == [('P2', 'FSL B'), ('P1', 'FSL B'), ('P3', 'FSL A')]
+        parts = stock_part_service.get_low_stock_parts(threshold=8, fsl='FSL A')
+        assert [p['part_number'] for p in parts] == ['P3']
+
+    def test_partitions_follow_stock_movements(self, stock_part_service):
+        stock_part_service.record_movement('P1', 'out', 5, scope='FSL A')
+        stock = stock_part_service.get_fsl_stock('FSL A', threshold=8)
+        assert stock['total_quantity'] == 12
+        assert stock['low_stock_count'] == 2
+        with pytest.raises(ValueError):
+            stock_part_service.get_fsl_stock('FSL X')
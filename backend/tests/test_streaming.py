@@ -0,0 +1,41 @@
+"""
+Unit tests for backend/utils/streaming.py
+"""
+import json
+import pytest
+from flask import Flask, request
+from backend.utils.json_provider import FastJSONProvider
+from backend.utils.streaming import get_stream_format, stream_records
+
+app = Flask(__name__)
+app.json = FastJSONProvider(app)
+RECORDS = [{'id': i, 'name': f'row {i}'} for i in range(5)]
+
+
+def batches():
+    for start in range(0, len(RECORDS), 2):
+        yield RECORDS[start:start + 2]
+
+
+class TestStreamRecords:
+    """Test NDJSON and chunked JSON output"""
+
+    def test_ndjson(self):
+        with app.app_context():
+            response = stream_records(len(RECORDS), batches(), 'ndjson')
+            assert response.is_streamed and response.mimetype == 'application/x-ndjson'
+            lines = response.get_data().decode().splitlines()
+        assert [json.loads(line) for line in lines] == RECORDS
+
+    def test_json_with_envelope(self):
+        with app.app_context():
+            response = stream_records(len(RECORDS), batches(), 'json', envelope='data')
+            assert json.loads(response.get_data()) == {'data': RECORDS, 'total': 5}
+            assert json.loads(stream_records(0, iter([]), 'json').get_data()) == []
+
+    def test_format_negotiation(self):
+        with app.test_request_context('/rows', headers={'Accept': 'application/x-ndjson'}):
+            assert get_stream_format(request) == 'ndjson'
+        with app.test_request_context('/rows?stream=xml'):
+            with pytest.raises(ValueError):
+                get_stream_format(request)
@@ -2,7 +2,7 @@
 Utility functions for the application
 """
 
-from .csv_utils import to_snake, read_csv_normalized
+from .csv_utils import to_snake, read_csv_normalized, text_column, int_column, float_column, paginate_frame
 from .validators import (
     validate_engineer,
     validate_machine,
@@ -38,6 +38,10 @@ __all__ = [
     # CSV Utils
     'to_snake',
     'read_csv_normalized',
+    'text_column',
+    'int_column',
+    'float_column',
+    'paginate_frame',
     
     # Validators
     'validate_engineer',
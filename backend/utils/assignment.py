@@ -0,0 +1,112 @@
+"""
+Capacity-constrained assignment heuristic (greedy construction + local search)
+"""
+from typing import Callable, List, Optional, Set, Tuple
+import numpy as np
+
+# Minimum cost decrease for a move or swap to count as an improvement
+IMPROVEMENT_EPSILON = 1e-9
+
+
+def assign_with_capacity(candidates: np.ndarray, costs: np.ndarray, capacity: np.ndarray,
+                         fallback_costs: Optional[Callable[[int], np.ndarray]] = None,
+                         max_passes: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Assign every row (e.g., machine) to a column (e.g., engineer) with limited capacity,
+    minimizing total cost
+
+    Each row only considers its candidate columns (typically its k nearest).
+    Construction is greedy over all candidate pairs, cheapest first; rows whose
+    candidates are all full fall back to the cheapest column with spare
+    capacity (if fallback_costs is given). Local search then repeatedly moves
+    a row to a cheaper candidate with spare capacity, or swaps it with a row
+    of a full candidate when that lowers the summed cost of both rows.
+
+    Args:
+        candidates: Candidate column indices, shape (rows, k), cheapest first
+        costs: Costs of the candidates, shape (rows, k)
+        capacity: Maximum rows per column, shape (columns,)
+        fallback_costs: Function returning the costs of one row to every column
+        max_passes: Maximum local search passes
+
+    Returns:
+        Tuple of (assigned column per row, cost per row); -1 and NaN for rows
+        that could not be assigned because every column is full
+
+    Example:
+        >>> assigned, _ = assign_with_capacity(
+        ...     np.array([[0, 1], [0, 1]]), np.array([[1.0, 2.0], [2.0, 10.0]]), np.array([1, 1]))
+        >>> assigned.tolist()
+        [1, 0]
+    """
+    rows, k = candidates.shape
+    capacity = np.asarray(capacity, dtype=np.int64)
+    assigned = np.full(rows, -1, dtype=np.int64)
+    current = np.full(rows, np.nan)
+    load = np.zeros(len(capacity), dtype=np.int64)
+    cand_list = candidates.tolist()
+    cost_list = costs.tolist()
+
+    # Greedy construction over all candidate pairs, cheapest first
+    for flat in np.argsort(costs, axis=None, kind="stable").tolist():
+        row, rank = divmod(flat, k)
+        if assigned[row] >= 0:
+            continue
+        col = cand_list[row][rank]
+        if load[col] < capacity[col]:
+            assigned[row], current[row] = col, cost_list[row][rank]
+            load[col] += 1
+
+    if fallback_costs is not None:
+        for row in np.flatnonzero(assigned < 0).tolist():
+            row_costs = np.where(load < capacity, fallback_costs(row), np.inf)
+            col = int(np.argmin(row_costs)) if len(row_costs) else -1
+            if col >= 0 and np.isfinite(row_costs[col]):
+                assigned[row], current[row] = col, row_costs[col]
+                load[col] += 1
+
+    members: List[Set[int]] = [set() for _ in range(len(capacity))]
+    candidate_of: List[Set[int]] = [set() for _ in range(len(capacity))]
+    for row in range(rows):
+        if assigned[row] >= 0:
+            members[assigned[row]].add(row)
+        for col in cand_list[row]:
+            candidate_of[col].add(row)
+    cost_of = [dict(zip(cand_list[row], cost_list[row])) for row in range(rows)]
+
+    def place(row: int, col: int, cost: float) -> None:
+        members[assigned[row]].discard(row)
+        load[assigned[row]] -= 1
+        members[col].add(row)
+        load[col] += 1
+        assigned[row], current[row] = col, cost
+
+    for _ in range(max_passes):
+        improved = False
+        for row in range(rows):
+            col = assigned[row]
+            if col < 0:
+                continue
+            for other_col, cost in zip(cand_list[row], cost_list[row]):
+                if cost >= current[row] - IMPROVEMENT_EPSILON:
+                    break
+                if load[other_col] < capacity[other_col]:
+                    place(row, other_col, cost)
+                    improved = True
+                    break
+                # Swap with a row of the full column that can take our place
+                best_row, best_gain = -1, IMPROVEMENT_EPSILON
+                for other_row in members[other_col] & candidate_of[col]:
+                    gain = current[row] + current[other_row] - cost - cost_of[other_row][col]
+                    if gain > best_gain:
+                        best_row, best_gain = other_row, gain
+                if best_row >= 0:
+                    swap_cost = cost_of[best_row][col]
+                    place(best_row, col, swap_cost)
+                    place(row, other_col, cost)
+                    improved = True
+                    break
+        if not improved:
+            break
+
+    return assigned, current
@@ -0,0 +1,99 @@
+"""
+Background computation with a cached last result
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class BackgroundJob:
+    """
+    Runs one computation at a time in a daemon thread and keeps its last result
+
+    Each run is tagged with a key describing its inputs (e.g. data versions
+    and parameters); callers compare it with the current key to tell whether
+    the stored result is stale.
+
+    Example:
+        >>> job = BackgroundJob("square", lambda x: x * x)
+        >>> job.refresh(("v1", 3), 3)
+        True
+        >>> job.snapshot(wait=5)["result"]
+        9
+    """
+
+    def __init__(self, name: str, compute: Callable[..., Any]):
+        """
+        Initialize job
+
+        Args:
+            name: Thread name (also used in log messages)
+            compute: Function producing the result
+        """
+        self.name = name
+        self._compute = compute
+        self._lock = threading.RLock()
+        self._thread: Optional[threading.Thread] = None
+        self._running_key: Hashable = None
+        self._result: Any = None
+        self._result_key: Hashable = None
+        self._error: Optional[str] = None
+
+    def _run(self, key: Hashable, args: tuple) -> None:
+        try:
+            result = self._compute(*args)
+            with self._lock:
+                self._result, self._result_key, self._error = result, key, None
+        except Exception as e:
+            print(f"[ERROR] {self.name} job failed: {e}")
+            with self._lock:
+                self._error = str(e)
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def refresh(self, key: Hashable, *args: Any, force: bool = False) -> bool:
+        """
+        Start a run unless one is in progress or the result for key exists
+
+        Args:
+            key: Inputs of the run
+            *args: Arguments passed to compute
+            force: Start even if the stored result matches key
+
+        Returns:
+            True if a run is in progress after the call
+        """
+        with self._lock:
+            if self.is_running:
+                return True
+            if not force and self._result is not None and self._result_key == key:
+                return False
+            self._error = None
+            self._running_key = key
+            self._thread = threading.Thread(target=self._run, args=(key, args), name=self.name, daemon=True)
+            self._thread.start()
+            return True
+
+    def snapshot(self, wait: float = 0) -> Dict[str, Any]:
+        """
+        Get job state
+
+        Args:
+            wait: Seconds to wait for a run in progress
+
+        Returns:
+            Dictionary with status ("ready", "running", "failed" or "idle"),
+            error, result and the key the result was computed for
+        """
+        thread = self._thread
+        if wait > 0 and thread is not None:
+            thread.join(wait)
+        with self._lock:
+            if self.is_running:
+                status = "running"
+            elif self._error:
+                status = "failed"
+            else:
+                status = "ready" if self._result is not None else "idle"
+            return {"status": status, "error": self._error, "result": self._result, "key": self._result_key}
@@ -0,0 +1,71 @@
+"""
+Column-oriented JSON output for list endpoints
+"""
+from typing import Any, Dict, Optional
+import pandas as pd
+from flask import Request
+
+# ?format= values: plain columns, or columns with dictionary-encoded categoricals
+COLUMNAR_FORMATS = ("columns", "dict")
+# Columns with at most this share of distinct values are dictionary-encoded
+DICTIONARY_MAX_RATIO = 0.5
+
+
+def get_columnar_format(req: Request) -> Optional[str]:
+    """
+    Determine requested columnar format from ?format=
+
+    Args:
+        req: Flask request
+
+    Returns:
+        "columns", "dict", or None for the row-oriented default
+
+    Raises:
+        ValueError: If format has an unknown value
+    """
+    value = req.args.get('format', '').strip().lower()
+    if not value or value == 'rows':
+        return None
+    if value not in COLUMNAR_FORMATS:
+        raise ValueError(f"Invalid format '{value}'. Use one of: rows, {', '.join(COLUMNAR_FORMATS)}")
+    return value
+
+
+def frame_to_columns(df: pd.DataFrame, dictionary: bool = False) -> Dict[str, Any]:
+    """
+    Convert a frame to column-oriented JSON data
+
+    With dictionary=True, text columns with few distinct values are sent as
+    integer codes into a per-column list of values, so repeated strings
+    (region, status, area group, ...) are written once.
+
+    Args:
+        df: Source frame
+        dictionary: Dictionary-encode low-cardinality text columns
+
+    Returns:
+        {"columns": [...], "data": {column: [values]}, "total": n}, plus
+        "dictionaries": {column: [values]} when dictionary encoding is used
+
+    Example:
+        >>> frame_to_columns(pd.DataFrame({"region": ["R1", "R1", "R2", "R1"]}), dictionary=True)["data"]
+        {'region': [0, 0, 1, 0]}
+    """
+    columns = [str(col) for col in df.columns]
+    data: Dict[str, Any] = {}
+    dictionaries: Dict[str, Any] = {}
+    for name, col in zip(columns, df.columns):
+        values = df[col]
+        if dictionary and values.dtype == object and len(values):
+            codes, uniques = pd.factorize(values)
+            if len(uniques) <= len(values) * DICTIONARY_MAX_RATIO:
+                data[name] = codes.tolist()
+                dictionaries[name] = uniques.tolist()
+                continue
+        data[name] = values.tolist()
+
+    result: Dict[str, Any] = {"columns": columns, "data": data, "total": len(df)}
+    if dictionary:
+        result["dictionaries"] = dictionaries
+    return result
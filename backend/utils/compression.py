@@ -0,0 +1,145 @@
+"""
+Response compression (gzip, or brotli when installed) and precompressed static files
+"""
+import gzip
+import os
+import zlib
+from typing import Iterable, Iterator, Optional, Tuple
+from flask import Flask, Request, Response, request
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Compressible media types besides text/*
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+}
+# Precompressed sibling suffix per encoding, preferred first
+PRECOMPRESSED_SUFFIXES = (("br", ".br"), ("gzip", ".gz"))
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Compress a response body
+
+    Args:
+        body: Raw bytes
+        encoding: "br" or "gzip"
+
+    Returns:
+        Compressed bytes (gzip output is deterministic)
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, GZIP_LEVEL, mtime=0)
+
+
+def negotiate_encoding(req: Request) -> Optional[str]:
+    """
+    Pick the best content encoding the client accepts
+
+    Args:
+        req: Flask request
+
+    Returns:
+        "br" (when brotli is installed), "gzip", or None for identity
+    """
+    accepted = req.accept_encodings
+    if brotli is not None and accepted.quality("br") > 0:
+        return "br"
+    if accepted.quality("gzip") > 0:
+        return "gzip"
+    return None
+
+
+def is_compressible(mimetype: Optional[str]) -> bool:
+    if not mimetype or mimetype == "text/event-stream":
+        return False
+    return mimetype.startswith("text/") or mimetype in COMPRESSIBLE_MIMETYPES
+
+
+def gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Gzip a streamed body chunk by chunk
+
+    Args:
+        chunks: Body chunks
+
+    Yields:
+        Compressed chunks
+    """
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def precompressed_sibling(directory: str, path: str, req: Request) -> Optional[Tuple[str, str]]:
+    """
+    Find a precompressed copy of a static file the client can accept
+
+    Looks for path + ".br" and path + ".gz" next to the file (written at
+    build time, see scripts/precompress_dist.py). Brotli copies are served
+    even when the brotli package is not installed.
+
+    Args:
+        directory: Static root directory
+        path: File path relative to directory
+        req: Flask request
+
+    Returns:
+        Tuple of (sibling path relative to directory, encoding), or None
+    """
+    accepted = req.accept_encodings
+    for encoding, suffix in PRECOMPRESSED_SUFFIXES:
+        if accepted.quality(encoding) > 0 and os.path.isfile(os.path.join(directory, path + suffix)):
+            return path + suffix, encoding
+    return None
+
+
+def init_compression(app: Flask) -> None:
+    """
+    Compress responses per the request's Accept-Encoding
+
+    Buffered bodies use brotli (when installed) or gzip; streamed bodies
+    (NDJSON, chunked JSON) are gzipped chunk by chunk. File responses,
+    server-sent events, small bodies and already encoded responses are
+    left alone.
+
+    Args:
+        app: Flask application
+    """
+    @app.after_request
+    def compress_response(response: Response) -> Response:
+        if (response.status_code < 200 or response.status_code in (204, 206, 304)
+                or "Content-Encoding" in response.headers or response.direct_passthrough
+                or not is_compressible(response.mimetype)):
+            return response
+        response.vary.add("Accept-Encoding")
+
+        if response.is_streamed:
+            if request.accept_encodings.quality("gzip") > 0:
+                response.response = gzip_stream(response.iter_encoded())
+                response.headers["Content-Encoding"] = "gzip"
+                response.headers.pop("Content-Length", None)
+            return response
+
+        encoding = negotiate_encoding(request)
+        body = response.get_data()
+        if encoding is None or len(body) < MIN_COMPRESS_SIZE:
+            return response
+        response.set_data(compress(body, encoding))
+        response.headers["Content-Encoding"] = encoding
+        return response
@@ -0,0 +1,135 @@
+"""
+Conditional GET support (ETag / If-None-Match, Last-Modified / If-Modified-Since)
+"""
+import hashlib
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional, Tuple
+from flask import Blueprint, Flask, Response, current_app, g, request
+from backend.utils.data_cache import get_file_version
+
+# Headers a representation can vary on (part of every version-derived ETag)
+VARY_HEADERS = ("Accept", "Accept-Encoding")
+# Clients may keep a copy but must revalidate before using it
+CACHE_CONTROL = "no-cache"
+
+
+def _source_version(source: Any) -> Any:
+    """Get version of a data source (a service with get_data_version, or a callable)"""
+    return source.get_data_version() if hasattr(source, "get_data_version") else source()
+
+
+def _last_modified(sources: Iterable[Any]) -> Optional[datetime]:
+    """
+    Latest modification time of the sources' backing files
+
+    Returns None when a source is not file-backed (e.g. a callable), since
+    its changes would not show in the file times.
+    """
+    mtimes = []
+    for source in sources:
+        if not hasattr(source, "get_data_files"):
+            return None
+        versions = [get_file_version(path) for path in source.get_data_files()]
+        mtimes.extend(version[0] for version in versions if version is not None)
+    if not mtimes:
+        return None
+    return datetime.fromtimestamp(max(mtimes) // 1_000_000_000, tz=timezone.utc)
+
+
+def version_etag(sources: Iterable[Any]) -> str:
+    """
+    Build a strong ETag for the current request from data source versions
+
+    The tag covers the path, the query parameters, the negotiation headers
+    and the version of every source, so it changes whenever the response
+    could.
+
+    Args:
+        sources: Services (get_data_version) or callables returning versions
+
+    Returns:
+        Hex ETag value (unquoted)
+    """
+    payload = repr((
+        request.path,
+        sorted(request.args.items(multi=True)),
+        [request.headers.get(name, "") for name in VARY_HEADERS],
+        [_source_version(source) for source in sources],
+    ))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _set_validators(response: Response, etag: str, last_modified: Optional[datetime]) -> Response:
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    for name in VARY_HEADERS:
+        response.vary.add(name)
+    return response
+
+
+def track_data_versions(blueprint: Blueprint, *sources: Any, exclude: Iterable[str] = ()) -> None:
+    """
+    Answer conditional GETs on a blueprint from data versions
+
+    The ETag is computed before the view runs, so a matching If-None-Match
+    (or an If-Modified-Since not older than the data) returns 304 without
+    building the response. Only use this for endpoints whose GET responses
+    depend on nothing but the request and the given sources; other
+    endpoints fall back to body hashes (see init_conditional_requests).
+
+    Args:
+        blueprint: Blueprint to track
+        *sources: Services (get_data_version/get_data_files) or callables returning versions
+        exclude: View function names to leave to the body-hash fallback
+    """
+    excluded = {f"{blueprint.name}.{name}" for name in exclude}
+
+    @blueprint.before_request
+    def check_not_modified() -> Optional[Response]:
+        if request.method not in ("GET", "HEAD") or request.endpoint in excluded:
+            return None
+        try:
+            etag = version_etag(sources)
+            last_modified = _last_modified(sources)
+        except Exception as e:
+            print(f"[WARNING] Failed to compute ETag for {request.path}: {e}")
+            return None
+        g.data_etag = (etag, last_modified)
+
+        not_modified = request.if_none_match.contains(etag) if request.if_none_match else (
+            last_modified is not None and request.if_modified_since is not None
+            and last_modified <= request.if_modified_since
+        )
+        if not_modified:
+            return _set_validators(current_app.response_class(status=304), etag, last_modified)
+        return None
+
+    @blueprint.after_request
+    def add_data_etag(response: Response) -> Response:
+        validators: Optional[Tuple[str, Optional[datetime]]] = g.pop("data_etag", None)
+        if validators is not None and response.status_code == 200:
+            _set_validators(response, *validators)
+        return response
+
+
+def init_conditional_requests(app: Flask) -> None:
+    """
+    Add body-hash ETags to API GET responses that have no validator yet
+
+    Endpoints not covered by track_data_versions still build their body,
+    but an unchanged body is answered with 304 and no content.
+
+    Args:
+        app: Flask application
+    """
+    @app.after_request
+    def add_body_etag(response: Response) -> Response:
+        if (request.method not in ("GET", "HEAD") or request.blueprint is None
+                or response.status_code != 200 or response.is_streamed or response.direct_passthrough
+                or "ETag" in response.headers):
+            return response
+        response.add_etag()
+        response.headers["Cache-Control"] = CACHE_CONTROL
+        return response.make_conditional(request)
@@ -1,4 +1,5 @@
 from typing import List
+import numpy as np
 import pandas as pd
 from backend.utils.helpers import to_snake
 
@@ -48,4 +49,83 @@ def read_csv_normalized(path: str) -> pd.DataFrame:
     for col in df.columns:
         df[col] = df[col].fillna("")
     
-    return df
\ No newline at end of file
+    return df
+
+def text_column(df: pd.DataFrame, col: str, default: str = "") -> pd.Series:
+    """
+    Get a column as stripped strings (missing values become "")
+    
+    Args:
+        df: Source DataFrame
+        col: Column name
+        default: Value used for every row if the column doesn't exist
+        
+    Returns:
+        Series of stripped strings aligned with df
+    """
+    if col not in df.columns:
+        return pd.Series(default, index=df.index, dtype=object)
+    return df[col].astype(str).str.strip().mask(df[col].isna(), "")
+
+def int_column(df: pd.DataFrame, col: str) -> pd.Series:
+    """
+    Get a column as integers, truncating decimals (0 if missing or invalid)
+    
+    Vectorized equivalent of int(float(str(value).strip())) with a 0 fallback.
+    
+    Args:
+        df: Source DataFrame
+        col: Column name
+        
+    Returns:
+        Series of int64 aligned with df
+    """
+    if col not in df.columns:
+        return pd.Series(0, index=df.index, dtype="int64")
+    values = pd.to_numeric(df[col].astype(str).str.strip(), errors="coerce")
+    values = values.replace([np.inf, -np.inf], np.nan).fillna(0)
+    return np.trunc(values).astype("int64")
+
+def float_column(df: pd.DataFrame, col: str) -> pd.Series:
+    """
+    Get a column as floats (0 if missing or invalid)
+    
+    Args:
+        df: Source DataFrame
+        col: Column name
+        
+    Returns:
+        Series of float64 aligned with df
+    """
+    if col not in df.columns:
+        return pd.Series(0.0, index=df.index)
+    return pd.to_numeric(df[col], errors="coerce").fillna(0.0).astype(float)
+
+def paginate_frame(df: pd.DataFrame, page: int = 1, per_page: int = 50) -> dict:
+    """
+    Paginate a DataFrame, converting only the requested page to records
+    
+    Same response shape as helpers.paginate().
+    
+    Args:
+        df: DataFrame to paginate
+        page: Page number (1-indexed)
+        per_page: Items per page
+        
+    Returns:
+        Dictionary with pagination info and items
+    """
+    total = len(df)
+    total_pages = (total + per_page - 1) // per_page
+    
+    start = max(page - 1, 0) * per_page
+    
+    return {
+        "items": df.iloc[start:start + per_page].to_dict(orient="records"),
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "total_pages": total_pages,
+        "has_next": page < total_pages,
+        "has_prev": page > 1
+    }
@@ -0,0 +1,98 @@
+"""
+Data file versioning and in-memory cache helpers
+"""
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+FileVersion = Optional[Tuple[int, int]]
+
+
+def get_file_version(path: str) -> FileVersion:
+    """
+    Get version stamp of a data file
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Tuple of (mtime_ns, size), or None if the file doesn't exist
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class VersionedCache:
+    """
+    Keeps one computed value per key and rebuilds it only when the version changes
+
+    Example:
+        >>> cache = VersionedCache()
+        >>> cache.get("tools", (1, 10), lambda: "built")
+        'built'
+    """
+
+    def __init__(self):
+        self._entries: Dict[Hashable, Tuple[Any, Any]] = {}
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, version: Any, builder: Callable[[], Any]) -> Any:
+        """
+        Get cached value for key, building it if missing or stale
+
+        Args:
+            key: Cache key
+            version: Current version of the underlying data
+            builder: Function that builds the value
+
+        Returns:
+            Cached or freshly built value
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                return entry[1]
+            value = builder()
+            self._entries[key] = (version, value)
+            return value
+
+    def peek(self, key: Hashable) -> Optional[Tuple[Any, Any]]:
+        """
+        Get (version, value) stored for key without rebuilding
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (version, value) or None
+        """
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: Hashable, version: Any, value: Any) -> None:
+        """
+        Store value for key at the given version
+
+        Args:
+            key: Cache key
+            version: Version of the underlying data
+            value: Value to store
+        """
+        with self._lock:
+            self._entries[key] = (version, value)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """
+        Drop one cached entry, or all entries if key is None
+
+        Args:
+            key: Cache key to drop
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
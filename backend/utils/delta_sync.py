@@ -0,0 +1,32 @@
+"""
+Change version header for list endpoints that support delta sync
+"""
+from typing import Any
+from flask import Response, after_this_request
+
+# Cursor a client passes back as /<resource>/changes?since=
+CHANGE_VERSION_HEADER = "X-Change-Version"
+
+
+def expose_change_version(service: Any) -> None:
+    """
+    Send the service's current change version with this request's response
+
+    The version is read before the body is built, so a write landing in
+    between is sent again on the next sync rather than lost. Nothing is
+    added when the data can't be read; the view reports that error itself.
+
+    Args:
+        service: Service with get_change_version()
+    """
+    try:
+        version = service.get_change_version()
+    except (FileNotFoundError, ValueError):
+        return
+
+    @after_this_request
+    def add_change_version(response: Response) -> Response:
+        if response.status_code == 200:
+            response.headers[CHANGE_VERSION_HEADER] = str(version)
+            response.headers.add("Access-Control-Expose-Headers", CHANGE_VERSION_HEADER)
+        return response
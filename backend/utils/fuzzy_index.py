@@ -0,0 +1,192 @@
+"""
+Typo-tolerant name index (trigram similarity + bounded edit distance)
+"""
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+import numpy as np
+from backend.utils.name_index import fold_name
+
+# Candidates re-scored with edit distance, per requested result
+CANDIDATES_PER_RESULT = 3
+MIN_CANDIDATES = 20
+
+DEFAULT_MIN_SCORE = 0.3
+
+
+def _padded_trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _pattern_masks(pattern: str) -> Dict[str, int]:
+    masks: Dict[str, int] = {}
+    for i, char in enumerate(pattern):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    return masks
+
+
+def edit_distance(a: str, b: str, masks: Optional[Dict[str, int]] = None) -> int:
+    """
+    Levenshtein distance using the bit-parallel Myers/Hyyro algorithm
+
+    Runs in O(len(b)) integer operations (plus O(len(a)) setup), which keeps
+    re-scoring of candidates cheap in pure Python.
+
+    Args:
+        a: First string (pattern)
+        b: Second string
+        masks: Precomputed character masks of a, to reuse across calls
+
+    Returns:
+        Edit distance
+    """
+    if not a:
+        return len(b)
+    peq = masks if masks is not None else _pattern_masks(a)
+    full = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+    pv, mv, score = full, 0, len(a)
+    for char in b:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = (ph << 1) | 1
+        mh = mh << 1
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv & full
+    return score
+
+
+def bounded_edit_distance(a: str, b: str, max_distance: int,
+                          masks: Optional[Dict[str, int]] = None) -> Optional[int]:
+    """
+    Levenshtein distance between two strings, giving up past max_distance
+
+    Args:
+        a: First string (pattern)
+        b: Second string
+        max_distance: Largest distance of interest
+        masks: Precomputed character masks of a
+
+    Returns:
+        Edit distance, or None if it exceeds max_distance
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    distance = edit_distance(a, b, masks)
+    return distance if distance <= max_distance else None
+
+
+class FuzzyIndex:
+    """
+    Prebuilt index for top-k fuzzy lookups over short names
+
+    Candidates come from trigram postings (only names sharing a trigram with
+    the query are touched), ranked by Dice similarity; the best candidates are
+    re-scored with a bounded edit distance against the whole name and against
+    its prefix, so both full names with typos and partially typed names score
+    well.
+
+    Example:
+        >>> index = FuzzyIndex([(0, "Obeng Plus"), (1, "Tang Potong")])
+        >>> index.search("obenk plus")[0][:2]
+        (0, 'Obeng Plus')
+    """
+
+    def __init__(self, entries: Sequence[Tuple[Any, Any]]):
+        """
+        Build index
+
+        Args:
+            entries: (key, name) pairs; a key may appear with several names
+        """
+        self._keys: List[Any] = []
+        self._names: List[str] = []
+        self._folded: List[str] = []
+        gram_counts: List[int] = []
+        postings: Dict[str, List[int]] = {}
+
+        for key, name in entries:
+            if name is None:
+                continue
+            name = str(name).strip()
+            folded = fold_name(name)
+            if not folded:
+                continue
+            entry_id = len(self._keys)
+            grams = _padded_trigrams(folded)
+            self._keys.append(key)
+            self._names.append(name)
+            self._folded.append(folded)
+            gram_counts.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(entry_id)
+
+        self._gram_counts = np.asarray(gram_counts, dtype=np.float64)
+        self._postings: Dict[str, np.ndarray] = {
+            gram: np.asarray(ids, dtype=np.int64) for gram, ids in postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _edit_similarity(self, query: str, masks: Dict[str, int], entry_id: int) -> float:
+        name = self._folded[entry_id]
+        max_distance = max(1, len(query) // 3)
+        best = 0.0
+        distance = bounded_edit_distance(query, name, max_distance, masks)
+        if distance is not None:
+            best = 1 - distance / max(len(query), len(name))
+        if len(name) > len(query):
+            distance = bounded_edit_distance(query, name[:len(query)], max_distance, masks)
+            if distance is not None:
+                # Prefix matches rank just below equally close full matches
+                best = max(best, 0.9 * (1 - distance / len(query)))
+        return best
+
+    def search(self, query: str, limit: int = 10,
+               min_score: float = DEFAULT_MIN_SCORE) -> List[Tuple[Any, str, float]]:
+        """
+        Find the names closest to query
+
+        Args:
+            query: Possibly misspelled name
+            limit: Maximum number of results
+            min_score: Minimum similarity (0-1) to include
+
+        Returns:
+            List of (key, name, score) tuples, best first, one per key
+        """
+        folded = fold_name(query)
+        if not folded or limit <= 0:
+            return []
+        query_grams = _padded_trigrams(folded)
+
+        postings = [self._postings[gram] for gram in query_grams if gram in self._postings]
+        if not postings:
+            return []
+        shared = np.bincount(np.concatenate(postings), minlength=len(self._keys))
+        dice = 2 * shared / (len(query_grams) + self._gram_counts)
+
+        pool = max(MIN_CANDIDATES, limit * CANDIDATES_PER_RESULT)
+        matched = np.flatnonzero(shared)
+        if len(matched) > pool:
+            matched = matched[np.argpartition(-dice[matched], pool - 1)[:pool]]
+
+        masks = _pattern_masks(folded)
+        best: Dict[Any, Tuple[float, int]] = {}
+        for entry_id in matched.tolist():
+            score = max(float(dice[entry_id]), self._edit_similarity(folded, masks, entry_id))
+            if score < min_score:
+                continue
+            key = self._keys[entry_id]
+            if key not in best or score > best[key][0]:
+                best[key] = (score, entry_id)
+
+        ranked = sorted(best.values(), key=lambda item: (-item[0], item[1]))[:limit]
+        return [(self._keys[entry_id], self._names[entry_id], round(score, 4)) for score, entry_id in ranked]
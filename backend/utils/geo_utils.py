@@ -0,0 +1,449 @@
+"""
+Geographic helpers: haversine distance and a KD-tree for nearest-neighbor queries
+"""
+import heapq
+import re
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Fallback coordinates for FSL cities (same table the StockPart page uses)
+CITY_COORDINATES: Dict[str, Tuple[float, float]] = {
+    'Jakarta': (-6.2088, 106.8456),
+    'Surabaya': (-7.2575, 112.7521),
+    'Bandung': (-6.9175, 107.6191),
+    'Medan': (3.5952, 98.6722),
+    'Semarang': (-6.9667, 110.4167),
+    'Makassar': (-5.1477, 119.4327),
+    'Palembang': (-2.9761, 104.7754),
+    'Tangerang': (-6.1783, 106.6319),
+    'Bogor': (-6.5971, 106.8060),
+    'Yogyakarta': (-7.7956, 110.3695),
+    'Malang': (-7.9797, 112.6304),
+    'Denpasar': (-8.6705, 115.2126),
+    'Balikpapan': (-1.2379, 116.8529),
+    'Banjarmasin': (-3.3194, 114.5906),
+    'Pekanbaru': (0.5071, 101.4478),
+    'Padang': (-0.9471, 100.4172),
+    'Manado': (1.4748, 124.8421),
+    'Pontianak': (-0.0263, 109.3425),
+    'Batam': (1.0456, 104.0305),
+    'Jambi': (-1.6101, 103.6131),
+    'Cirebon': (-6.7063, 108.5571),
+    'Mataram': (-8.5833, 116.1167),
+    'Kupang': (-10.1718, 123.6075),
+    'Jayapura': (-2.5916, 140.6692),
+    'Ambon': (-3.6954, 128.1814),
+    'Palu': (-0.8999, 119.8707),
+    'Purwokerto': (-7.4297, 109.2344),
+    'Jember': (-8.1706, 113.6997),
+    'Bandar Lampung': (-5.4294, 105.2628),
+    'Palangkaraya': (-2.2088, 113.9213),
+    'Bengkulu': (-3.8004, 102.2655),
+    'Pematang Siantar': (2.9631, 99.0618),
+}
+
+# Province spellings found in data_mesin.csv -> province name in indonesia-prov.geojson
+# (from the centroid/centroid.py mapping, with targets fixed to the GeoJSON names)
+PROVINSI_ALIASES: Dict[str, Optional[str]] = {
+    'Nusa Tenggara Barat': 'NUSATENGGARA BARAT',
+    'Kepulauan Bangka Belitung': 'BANGKA BELITUNG',
+    'Nanggroe Aceh Darussalam': 'DI. ACEH',
+    'Aceh': 'DI. ACEH',
+    'DI Yogyakarta': 'DAERAH ISTIMEWA YOGYAKARTA',
+    'Yogyakarta': 'DAERAH ISTIMEWA YOGYAKARTA',
+    'Sumatra Utara': 'SUMATERA UTARA',
+    'Sumatra Selatan': 'SUMATERA SELATAN',
+    'Sumatra Barat': 'SUMATERA BARAT',
+    'West Java': 'JAWA BARAT',
+    'Kalimantan Selata': 'KALIMANTAN SELATAN',
+    'Tangerang': 'BANTEN',
+    'Jakarta': 'DKI JAKARTA',
+    'Papua Selatan': 'PAPUA',
+    'Papua Barat Daya': 'PAPUA BARAT',
+    'Papua Tengah': 'PAPUA',
+    'Papua Pegunungan': 'PAPUA',
+    'nan': None,
+    '0': None,
+}
+
+_NON_ALNUM_RE = re.compile(r'[^0-9a-z]+')
+
+_CITY_LOOKUP = {city.casefold(): coords for city, coords in CITY_COORDINATES.items()}
+
+
+def province_key(name: Any) -> str:
+    """
+    Normalize a province name for matching (casefolded, letters and digits only)
+
+    Example:
+        >>> province_key(' Nusa Tenggara  Barat ') == province_key('NUSATENGGARA BARAT')
+        True
+    """
+    return _NON_ALNUM_RE.sub('', str(name).casefold())
+
+
+_PROVINSI_ALIAS_KEYS = {
+    province_key(alias): (province_key(target) if target else None)
+    for alias, target in PROVINSI_ALIASES.items()
+}
+
+
+def canonical_province_keys(names: pd.Series) -> pd.Series:
+    """
+    Map raw province names to GeoJSON province keys (vectorized)
+
+    Args:
+        names: Province names as found in the data
+
+    Returns:
+        Series of keys; None for placeholders such as "nan" or "0"
+    """
+    keys = names.astype(str).map(province_key)
+    aliased = keys.map(_PROVINSI_ALIAS_KEYS)
+    is_alias = keys.isin(_PROVINSI_ALIAS_KEYS.keys())
+    keys = keys.where(~is_alias, aliased)
+    return keys.where(keys != '', None)
+
+
+LATITUDE_COLUMNS = ('latitude', 'lat')
+LONGITUDE_COLUMNS = ('longitude', 'lng', 'lon', 'long')
+
+
+def city_coordinates(city: Any) -> Optional[Tuple[float, float]]:
+    """
+    Look up coordinates of a known city (case-insensitive)
+
+    Args:
+        city: City name
+
+    Returns:
+        Tuple of (latitude, longitude), or None if the city is unknown
+    """
+    if city is None:
+        return None
+    return _CITY_LOOKUP.get(str(city).strip().casefold())
+
+
+def find_coordinate_columns(df: pd.DataFrame) -> Optional[Tuple[str, str]]:
+    """
+    Find latitude/longitude columns of a normalized DataFrame
+
+    Args:
+        df: DataFrame with snake_case columns
+
+    Returns:
+        Tuple of (latitude column, longitude column), or None if missing
+    """
+    lat_col = next((col for col in LATITUDE_COLUMNS if col in df.columns), None)
+    lng_col = next((col for col in LONGITUDE_COLUMNS if col in df.columns), None)
+    if lat_col is None or lng_col is None:
+        return None
+    return lat_col, lng_col
+
+
+def coordinate_arrays(lat: pd.Series, lng: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse coordinates and flag valid ones
+
+    Args:
+        lat: Latitude values
+        lng: Longitude values
+
+    Returns:
+        Tuple of (latitudes, longitudes, valid mask); invalid values are NaN
+    """
+    lat = pd.to_numeric(lat, errors='coerce').to_numpy(dtype=float)
+    lng = pd.to_numeric(lng, errors='coerce').to_numpy(dtype=float)
+    valid = np.isfinite(lat) & np.isfinite(lng) & (np.abs(lat) <= 90) & (np.abs(lng) <= 180)
+    # (0, 0) is the usual placeholder for a missing location
+    valid &= ~((lat == 0) & (lng == 0))
+    return lat, lng, valid
+
+
+def to_unit_vectors(lat: np.ndarray, lng: np.ndarray) -> np.ndarray:
+    """
+    Convert degrees to 3D points on the unit sphere
+
+    Euclidean (chord) distance between these points is monotonic in
+    great-circle distance, so a KD-tree over them answers haversine queries.
+
+    Args:
+        lat: Latitudes in degrees
+        lng: Longitudes in degrees
+
+    Returns:
+        Array of shape (n, 3)
+    """
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lng = np.radians(np.asarray(lng, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lng), cos_lat * np.sin(lng), np.sin(lat)))
+
+
+def chord_to_km(chord: np.ndarray) -> np.ndarray:
+    """Convert unit-sphere chord length to great-circle distance in km"""
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord) / 2, 0, 1))
+
+
+def km_to_chord(km: float) -> float:
+    """Convert great-circle distance in km to unit-sphere chord length"""
+    return float(2 * np.sin(min(km / EARTH_RADIUS_KM, np.pi) / 2))
+
+
+def haversine_km(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """
+    Great-circle distance in km (vectorized)
+
+    Example:
+        >>> round(float(haversine_km(-6.2088, 106.8456, -6.9175, 107.6191)), 1)
+        116.2
+    """
+    lat1, lng1, lat2, lng2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def _mercator(lng: np.ndarray, lat: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    lat = np.clip(lat, -85.05112878, 85.05112878)
+    return np.radians(lng), np.log(np.tan(np.pi / 4 + np.radians(lat) / 2))
+
+
+def mercator_unit(lat: np.ndarray, lng: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Project degrees to Web Mercator map units in [0, 1) (x east, y south)
+
+    Multiplying by 2**zoom * 256 gives the pixel position used by web map tiles.
+
+    Args:
+        lat: Latitudes in degrees
+        lng: Longitudes in degrees
+
+    Returns:
+        Tuple of (x, y) arrays
+    """
+    x, y = _mercator(np.asarray(lng, dtype=float), np.asarray(lat, dtype=float))
+    x = (x + np.pi) / (2 * np.pi)
+    y = (1 - y / np.pi) / 2
+    limit = np.nextafter(1.0, 0)
+    return np.clip(x, 0, limit), np.clip(y, 0, limit)
+
+
+def polygon_centroid(geometry: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    """
+    Area-weighted centroid of a GeoJSON Polygon or MultiPolygon
+
+    Computed with the shoelace formula in Web Mercator and projected back,
+    which matches centroid/centroid.py (EPSG:3857 centroid) without geopandas.
+
+    Args:
+        geometry: GeoJSON geometry with lon/lat coordinates
+
+    Returns:
+        Tuple of (latitude, longitude), or None for empty/degenerate shapes
+    """
+    if geometry.get('type') == 'Polygon':
+        polygons = [geometry['coordinates']]
+    elif geometry.get('type') == 'MultiPolygon':
+        polygons = geometry['coordinates']
+    else:
+        return None
+
+    area = moment_x = moment_y = 0.0
+    for polygon in polygons:
+        for ring_index, ring in enumerate(polygon):
+            coords = np.asarray(ring, dtype=float)
+            if len(coords) < 3:
+                continue
+            x, y = _mercator(coords[:, 0], coords[:, 1])
+            x_next, y_next = np.roll(x, -1), np.roll(y, -1)
+            cross = x * y_next - x_next * y
+            ring_area = cross.sum() / 2
+            if ring_area == 0:
+                continue
+            # Exterior rings add area and holes subtract it, whatever their winding
+            sign = (1 if ring_index == 0 else -1) * np.sign(ring_area)
+            area += sign * ring_area
+            moment_x += sign * ((x + x_next) * cross).sum() / 6
+            moment_y += sign * ((y + y_next) * cross).sum() / 6
+    if area == 0:
+        return None
+
+    lng = np.degrees(moment_x / area)
+    lat = np.degrees(2 * np.arctan(np.exp(moment_y / area)) - np.pi / 2)
+    return float(lat), float(lng)
+
+
+def nearest_k_points(lat: np.ndarray, lng: np.ndarray, point_lat: np.ndarray, point_lng: np.ndarray,
+                     k: int = 1, max_block: int = 2_000_000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the k nearest points of a set for every query location (brute force)
+
+    Works through the queries in row blocks so the (block x points) matrix of
+    unit-vector dot products stays below max_block entries; the k largest dot
+    products per row are the k nearest points, and only those pairs are
+    measured with haversine.
+
+    Args:
+        lat: Query latitudes
+        lng: Query longitudes
+        point_lat: Point latitudes
+        point_lng: Point longitudes
+        k: Neighbors per query (capped at the number of points)
+        max_block: Maximum entries of one distance block
+
+    Returns:
+        Tuple of (indices, distances in km), each of shape (queries, k),
+        nearest first
+    """
+    lat = np.asarray(lat, dtype=float)
+    lng = np.asarray(lng, dtype=float)
+    point_lat = np.asarray(point_lat, dtype=float)
+    point_lng = np.asarray(point_lng, dtype=float)
+    k = min(k, len(point_lat))
+    indices = np.empty((len(lat), k), dtype=np.int64)
+    if not k or not len(lat):
+        return indices, np.empty((len(lat), k))
+
+    points = to_unit_vectors(point_lat, point_lng)
+    queries = to_unit_vectors(lat, lng)
+    chunk = max(1, max_block // len(points))
+    for start in range(0, len(queries), chunk):
+        block = queries[start:start + chunk] @ points.T
+        if k < len(points):
+            top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(k), (len(block), k))
+        order = np.argsort(-np.take_along_axis(block, top, axis=1), axis=1, kind="stable")
+        indices[start:start + chunk] = np.take_along_axis(top, order, axis=1)
+
+    distances = haversine_km(lat[:, None], lng[:, None], point_lat[indices], point_lng[indices])
+    return indices, distances
+
+
+def nearest_points(lat: np.ndarray, lng: np.ndarray, point_lat: np.ndarray, point_lng: np.ndarray,
+                   max_block: int = 2_000_000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the nearest point of a set for every query location
+
+    Args:
+        lat: Query latitudes
+        lng: Query longitudes
+        point_lat: Point latitudes
+        point_lng: Point longitudes
+        max_block: Maximum entries of one distance block
+
+    Returns:
+        Tuple of (nearest point index, distance in km); -1 and NaN when the
+        point set is empty
+    """
+    if not len(point_lat):
+        return np.full(len(lat), -1, dtype=np.int64), np.full(len(lat), np.nan)
+    indices, distances = nearest_k_points(lat, lng, point_lat, point_lng, k=1, max_block=max_block)
+    return indices[:, 0], distances[:, 0]
+
+
+class KDTree:
+    """
+    Static KD-tree over 3D points with bucketed leaves
+
+    Leaves hold up to leaf_size points and are scanned with numpy; inner
+    nodes split on the widest dimension at the median.
+    """
+
+    def __init__(self, points: np.ndarray, leaf_size: int = 16):
+        """
+        Build tree
+
+        Args:
+            points: Array of shape (n, d)
+            leaf_size: Maximum points per leaf
+        """
+        self.points = np.asarray(points, dtype=float)
+        self.leaf_size = leaf_size
+        self._order = np.arange(len(self.points))
+        # Node arrays: split dim (-1 for leaves), split value, children, leaf range
+        self._dim: List[int] = []
+        self._split: List[float] = []
+        self._left: List[int] = []
+        self._right: List[int] = []
+        self._start: List[int] = []
+        self._end: List[int] = []
+        if len(self.points):
+            self._build(0, len(self.points))
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _new_node(self, start: int, end: int) -> int:
+        self._dim.append(-1)
+        self._split.append(0.0)
+        self._left.append(-1)
+        self._right.append(-1)
+        self._start.append(start)
+        self._end.append(end)
+        return len(self._dim) - 1
+
+    def _build(self, start: int, end: int) -> int:
+        node = self._new_node(start, end)
+        if end - start <= self.leaf_size:
+            return node
+        subset = self._order[start:end]
+        coords = self.points[subset]
+        dim = int(np.argmax(coords.max(axis=0) - coords.min(axis=0)))
+        mid = (end - start) // 2
+        partitioned = np.argpartition(coords[:, dim], mid)
+        self._order[start:end] = subset[partitioned]
+        self._dim[node] = dim
+        self._split[node] = float(self.points[self._order[start + mid], dim])
+        self._left[node] = self._build(start, start + mid)
+        self._right[node] = self._build(start + mid, end)
+        return node
+
+    def query(self, point: np.ndarray, k: int = 1,
+              max_distance: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k nearest points
+
+        Args:
+            point: Query point of shape (d,)
+            k: Number of neighbors
+            max_distance: Ignore points farther than this (Euclidean)
+
+        Returns:
+            Tuple of (distances, point indices), nearest first
+        """
+        if not len(self.points) or k <= 0:
+            return np.empty(0), np.empty(0, dtype=int)
+        point = np.asarray(point, dtype=float)
+        bound = np.inf if max_distance is None else max_distance ** 2
+        best: List[Tuple[float, int]] = []  # max-heap of (-squared distance, index)
+        stack = [(0.0, 0)]
+        while stack:
+            min_dist, node = stack.pop()
+            worst = -best[0][0] if len(best) == k else bound
+            if min_dist > worst:
+                continue
+            dim = self._dim[node]
+            if dim < 0:
+                idx = self._order[self._start[node]:self._end[node]]
+                dists = ((self.points[idx] - point) ** 2).sum(axis=1)
+                for dist, i in zip(dists.tolist(), idx.tolist()):
+                    if dist > bound:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-dist, i))
+                    elif dist < -best[0][0]:
+                        heapq.heapreplace(best, (-dist, i))
+                continue
+            diff = point[dim] - self._split[node]
+            near, far = (self._left[node], self._right[node]) if diff < 0 else (self._right[node], self._left[node])
+            # Far side first on the stack so the near side is searched first
+            stack.append((diff * diff, far))
+            stack.append((min_dist, near))
+        best.sort(key=lambda item: -item[0])
+        distances = np.sqrt([-dist for dist, _ in best])
+        indices = np.array([i for _, i in best], dtype=int)
+        return distances, indices
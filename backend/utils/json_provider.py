@@ -0,0 +1,114 @@
+"""
+Fast JSON provider for Flask responses (orjson when installed)
+"""
+import dataclasses
+import decimal
+import json
+import math
+import uuid
+from datetime import date
+from typing import Any, Optional
+import numpy as np
+import pandas as pd
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+def _default(o: Any) -> Any:
+    """Encode values the JSON encoders don't handle natively (same output as Flask for dates)"""
+    if o is pd.NaT or o is pd.NA:
+        return None
+    if isinstance(o, np.generic):
+        return o.item()
+    if isinstance(o, (np.ndarray, pd.Series, pd.Index)):
+        return o.tolist()
+    if isinstance(o, date):
+        return http_date(o)
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    if dataclasses.is_dataclass(o):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def _replace_non_finite(obj: Any) -> Any:
+    """Copy of obj with NaN/Infinity floats (including NumPy ones) replaced by None"""
+    if isinstance(obj, dict):
+        return {key: _replace_non_finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_replace_non_finite(value) for value in obj]
+    if isinstance(obj, (np.generic, np.ndarray, pd.Series, pd.Index)):
+        return _replace_non_finite(_default(obj))
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    return obj
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider using orjson when installed, the stdlib encoder otherwise
+
+    Both encoders accept NumPy scalars/arrays and pandas values, and write
+    NaN/Infinity (invalid JSON) as null. Keys are sorted like Flask's
+    default provider; unlike it, non-ASCII text is written as UTF-8.
+
+    Example:
+        >>> FastJSONProvider(Flask(__name__)).dumps({"n": np.int64(1), "x": float("nan")})
+        '{"n":1,"x":null}'
+    """
+
+    ensure_ascii = False
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is not None and set(kwargs) <= {"indent", "separators"}:
+            return self.dumps_bytes(obj, kwargs.get("indent")).decode("utf-8")
+        kwargs.setdefault("default", _default)
+        kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+        kwargs.setdefault("sort_keys", self.sort_keys)
+        kwargs.setdefault("separators", (",", ":"))
+        try:
+            return json.dumps(obj, allow_nan=False, **kwargs)
+        except ValueError:
+            # Only rebuild the payload when it actually contains NaN/Infinity
+            return json.dumps(_replace_non_finite(obj), allow_nan=False, **kwargs)
+
+    def dumps_bytes(self, obj: Any, indent: Optional[int] = None) -> bytes:
+        """
+        Serialize obj to UTF-8 JSON bytes
+
+        Args:
+            obj: Value to serialize
+            indent: Pretty-print with 2-space indentation when set
+
+        Returns:
+            Encoded JSON
+        """
+        if orjson is None:
+            return self.dumps(obj, indent=indent).encode("utf-8")
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self.dumps_bytes(obj, 2 if pretty else None) + b"\n",
+                                        mimetype=self.mimetype)
@@ -0,0 +1,81 @@
+"""
+Normalized name index for hash lookups by display name
+"""
+import unicodedata
+from typing import Any, Dict, Optional
+import pandas as pd
+
+
+def normalize_name(value: Any) -> str:
+    """
+    Normalize a name for comparison (strip whitespace, NFKC unicode form)
+
+    Args:
+        value: Name to normalize
+
+    Returns:
+        Normalized name
+
+    Example:
+        >>> normalize_name("  Obeng \\uff0b ")
+        'Obeng +'
+    """
+    if value is None:
+        return ""
+    return unicodedata.normalize('NFKC', str(value).strip())
+
+
+def fold_name(value: Any) -> str:
+    """
+    Normalize and casefold a name for case-insensitive comparison
+
+    Args:
+        value: Name to fold
+
+    Returns:
+        Normalized, casefolded name
+    """
+    return normalize_name(value).casefold()
+
+
+class NameIndex:
+    """
+    Hash index of normalized names -> row index labels
+
+    Lookups try the NFKC-normalized name first (case-sensitive), then the
+    casefolded name, returning the first matching row like a top-down scan.
+    """
+
+    def __init__(self, names: pd.Series):
+        """
+        Build index from a series of names
+
+        Args:
+            names: Series of names indexed by row label (empty names are skipped)
+        """
+        normalized = names.astype(str).str.strip().str.normalize('NFKC')
+        normalized = normalized[normalized != ""]
+        folded = normalized.str.casefold()
+
+        self.exact: Dict[str, Any] = dict(zip(normalized[~normalized.duplicated()],
+                                              normalized.index[~normalized.duplicated()]))
+        self.folded: Dict[str, Any] = dict(zip(folded[~folded.duplicated()],
+                                               folded.index[~folded.duplicated()]))
+
+    def __len__(self) -> int:
+        return len(self.exact)
+
+    def lookup(self, name: Any) -> Optional[Any]:
+        """
+        Find row label for a name
+
+        Args:
+            name: Name to find
+
+        Returns:
+            Row index label, or None if not found
+        """
+        normalized = normalize_name(name)
+        if normalized in self.exact:
+            return self.exact[normalized]
+        return self.folded.get(normalized.casefold())
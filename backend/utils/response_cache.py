@@ -0,0 +1,131 @@
+"""
+Cache of encoded JSON response bodies keyed by endpoint, query and data version
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from flask import Response, current_app, request
+from backend.utils.compression import MIN_COMPRESS_SIZE, compress, negotiate_encoding
+
+# Cached responses kept (least recently used dropped first)
+MAX_CACHED_RESPONSES = 64
+
+
+class CachedBody:
+    """Encoded JSON body plus its compressed variants, built on first use"""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self._compressed: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        """Get the body in one content encoding (None = identity)"""
+        if encoding is None:
+            return self.body
+        with self._lock:
+            if encoding not in self._compressed:
+                self._compressed[encoding] = compress(self.body, encoding)
+            return self._compressed[encoding]
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of encoded response bodies
+
+    An entry is reused only while the data version it was built for is
+    current, so writes to the backing CSV invalidate it implicitly. Bodies
+    are built outside the cache lock; concurrent misses on the same key wait
+    for the one build in flight instead of repeating it, and requests for
+    other keys are never blocked by a build.
+
+    Example:
+        >>> cache = ResponseCache()
+        >>> cache.get("key", (1, 10), lambda: b"[]")[0].body
+        b'[]'
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHED_RESPONSES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Any, CachedBody]]" = OrderedDict()
+        # Keys being built, set once the build finishes (or fails)
+        self._building: Dict[Hashable, threading.Event] = {}
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, version: Any, build: Callable[[], bytes]) -> Tuple[CachedBody, bool]:
+        """
+        Get cached body for key, building it if missing or stale
+
+        Args:
+            key: Cache key (endpoint and query)
+            version: Current version of the underlying data
+            build: Function producing the encoded body
+
+        Returns:
+            Tuple of (cached body, True if it was served from the cache)
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == version:
+                    self._entries.move_to_end(key)
+                    return entry[1], True
+                building = self._building.get(key)
+                if building is None:
+                    building = self._building[key] = threading.Event()
+                    break
+            # Another request is building this key; re-check once it's done
+            building.wait()
+
+        try:
+            cached = CachedBody(build())
+            with self._lock:
+                self._entries[key] = (version, cached)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return cached, False
+        finally:
+            with self._lock:
+                del self._building[key]
+            building.set()
+
+    def invalidate(self) -> None:
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+response_cache = ResponseCache()
+
+
+def cached_json_response(version: Any, build: Callable[[], Any], key: Optional[Hashable] = None) -> Response:
+    """
+    Serve a JSON response from the response cache
+
+    On a miss, build() runs and its result is encoded the same way jsonify
+    would; hits skip both steps. Bodies are compressed per the request's
+    Accept-Encoding, and each compressed variant is cached next to the body.
+
+    Args:
+        version: Data version the response depends on (e.g. service.get_data_version())
+        build: Function returning the JSON-serializable data
+        key: Cache key (default: request path plus query parameters)
+
+    Returns:
+        Flask response with X-Cache: HIT or MISS
+    """
+    if key is None:
+        key = (request.path, tuple(sorted(request.args.items(multi=True))))
+    cached, hit = response_cache.get(key, version, lambda: current_app.json.response(build()).get_data())
+
+    encoding = negotiate_encoding(request) if len(cached.body) >= MIN_COMPRESS_SIZE else None
+    response = current_app.response_class(cached.encoded(encoding), mimetype="application/json")
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.headers["X-Cache"] = "HIT" if hit else "MISS"
+    return response
@@ -0,0 +1,76 @@
+"""
+Helpers for response negotiation on API list endpoints
+"""
+from typing import Iterable, List, Optional
+from flask import Request
+
+# Response profiles: legacy (v1) repeats every field under its CSV name,
+# compact (v2) emits each field once
+PROFILE_LEGACY = "legacy"
+PROFILE_COMPACT = "compact"
+PROFILE_VERSIONS = {PROFILE_LEGACY: 1, PROFILE_COMPACT: 2}
+COMPACT_MEDIA_TYPE = "application/vnd.rocdashboard.v2+json"
+
+
+def get_response_profile(req: Request) -> str:
+    """
+    Determine requested response profile
+
+    Compact mode is selected with ?profile=compact, ?v=2, or
+    Accept: application/vnd.rocdashboard.v2+json. Anything else is legacy.
+
+    Args:
+        req: Flask request
+
+    Returns:
+        PROFILE_COMPACT or PROFILE_LEGACY
+    """
+    profile = req.args.get('profile', '').strip().lower()
+    if profile in PROFILE_VERSIONS:
+        return profile
+    if req.args.get('v', '').strip() == str(PROFILE_VERSIONS[PROFILE_COMPACT]):
+        return PROFILE_COMPACT
+    if COMPACT_MEDIA_TYPE in req.headers.get('Accept', ''):
+        return PROFILE_COMPACT
+    return PROFILE_LEGACY
+
+
+def profile_header(profile: str) -> str:
+    """
+    Build X-API-Profile header value
+
+    Args:
+        profile: Response profile
+
+    Returns:
+        Header value, e.g. "compact; version=2"
+    """
+    return f"{profile}; version={PROFILE_VERSIONS[profile]}"
+
+
+def parse_fields(value: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    """
+    Parse a fields= projection parameter
+
+    Args:
+        value: Comma-separated field names (None/empty = all fields)
+        allowed: Valid field names
+
+    Returns:
+        List of fields in requested order, or None for all fields
+
+    Raises:
+        ValueError: If an unknown field is requested
+    """
+    if not value:
+        return None
+    allowed = list(allowed)
+    fields = []
+    for field in value.split(','):
+        field = field.strip()
+        if not field or field in fields:
+            continue
+        if field not in allowed:
+            raise ValueError(f"Unknown field '{field}'. Allowed fields: {', '.join(allowed)}")
+        fields.append(field)
+    return fields or None
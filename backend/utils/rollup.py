@@ -0,0 +1,150 @@
+"""
+Precomputed count rollups over a fixed set of dimensions
+"""
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+import pandas as pd
+
+RollupKey = Tuple[str, ...]
+
+
+def _dimension_value(value: Any) -> str:
+    """Normalize a dimension value the way read_csv_normalized leaves it"""
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return str(value)
+
+
+class Rollup:
+    """
+    Row counts per combination of dimension values
+
+    Drill-downs (group by any subset of the dimensions, filtered on any
+    others) are answered from the combination counts, whose number is far
+    below the number of rows; writes adjust the counts of the rows they touch.
+
+    Example:
+        >>> rollup = Rollup(["region", "status"])
+        >>> rollup.add([("R1", "Active"), ("R1", "Down"), ("R2", "Active")])
+        >>> rollup.counts_by("region")
+        {'R1': 2, 'R2': 1}
+        >>> rollup.query(["status"], {"region": ["R1"]})
+        [{'status': 'Active', 'count': 1}, {'status': 'Down', 'count': 1}]
+    """
+
+    def __init__(self, dimensions: Sequence[str], present: Optional[Iterable[str]] = None):
+        """
+        Initialize empty rollup
+
+        Args:
+            dimensions: Dimension (column) names
+            present: Dimensions that exist in the source data (default: all)
+        """
+        self.dimensions = list(dimensions)
+        self.present = set(self.dimensions if present is None else present)
+        self._positions = {dim: i for i, dim in enumerate(self.dimensions)}
+        self._counts: Counter = Counter()
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, dimensions: Sequence[str]) -> "Rollup":
+        """
+        Build rollup from a DataFrame (missing dimension columns count as "")
+
+        Args:
+            df: Source rows
+            dimensions: Dimension column names
+
+        Returns:
+            Rollup
+        """
+        rollup = cls(dimensions, present=[dim for dim in dimensions if dim in df.columns])
+        rollup._counts = Counter(rollup.keys_from_frame(df))
+        return rollup
+
+    def keys_from_frame(self, df: pd.DataFrame) -> List[RollupKey]:
+        """Get dimension keys of every row of a DataFrame"""
+        columns = [
+            df[dim].fillna("").astype(str) if dim in df.columns else pd.Series("", index=df.index)
+            for dim in self.dimensions
+        ]
+        return list(zip(*columns)) if columns else []
+
+    def key(self, record: Mapping[str, Any]) -> RollupKey:
+        """Get dimension key of one record"""
+        return tuple(_dimension_value(record.get(dim)) for dim in self.dimensions)
+
+    def copy(self) -> "Rollup":
+        rollup = Rollup(self.dimensions, self.present)
+        rollup._counts = self._counts.copy()
+        return rollup
+
+    def add(self, keys: Iterable[RollupKey], sign: int = 1) -> None:
+        """
+        Add (sign=1) or remove (sign=-1) rows
+
+        Args:
+            keys: Dimension keys of the rows
+            sign: 1 to add, -1 to remove
+        """
+        for key in keys:
+            self._counts[key] += sign
+            if self._counts[key] <= 0:
+                del self._counts[key]
+
+    @property
+    def total(self) -> int:
+        return sum(self._counts.values())
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def _check_dimensions(self, dimensions: Iterable[str]) -> None:
+        unknown = [dim for dim in dimensions if dim not in self._positions]
+        if unknown:
+            raise ValueError(f"Unknown dimension(s): {', '.join(unknown)}. Use: {', '.join(self.dimensions)}")
+
+    def counts_by(self, dimension: str) -> Dict[str, int]:
+        """
+        Row counts per value of one dimension, largest first (like value_counts)
+
+        Args:
+            dimension: Dimension name
+
+        Returns:
+            Dictionary mapping value to count
+        """
+        self._check_dimensions([dimension])
+        pos = self._positions[dimension]
+        counts: Counter = Counter()
+        for key, count in self._counts.items():
+            counts[key[pos]] += count
+        return dict(counts.most_common())
+
+    def query(self, group_by: Sequence[str], filters: Optional[Mapping[str, Iterable[str]]] = None
+              ) -> List[Dict[str, Any]]:
+        """
+        Row counts grouped by some dimensions, filtered on others
+
+        Args:
+            group_by: Dimensions to group by (empty = grand total)
+            filters: Dimension -> accepted values
+
+        Returns:
+            List of {dimension: value, ..., "count": n}, largest first
+
+        Raises:
+            ValueError: If a dimension is unknown
+        """
+        filters = {dim: {str(v) for v in values} for dim, values in (filters or {}).items()}
+        self._check_dimensions(list(group_by) + list(filters))
+        group_positions = [self._positions[dim] for dim in group_by]
+        filter_positions = [(self._positions[dim], values) for dim, values in filters.items()]
+
+        groups: Counter = Counter()
+        for key, count in self._counts.items():
+            if all(key[pos] in values for pos, values in filter_positions):
+                groups[tuple(key[pos] for pos in group_positions)] += count
+        return [
+            {**dict(zip(group_by, group)), "count": count}
+            for group, count in sorted(groups.items(), key=lambda item: (-item[1], item[0]))
+        ]
@@ -0,0 +1,158 @@
+"""
+Inverted token/trigram index for search-as-you-type over record lists
+"""
+import re
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Set
+from backend.utils.name_index import fold_name
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Terms shorter than this match token prefixes; longer terms match substrings
+MIN_SUBSTRING_LENGTH = 3
+
+# Match weights, multiplied by the field weight
+EXACT_FIELD_SCORE = 8
+FIELD_PREFIX_SCORE = 4
+TOKEN_SCORE = 3
+TOKEN_PREFIX_SCORE = 2
+SUBSTRING_SCORE = 1
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    """
+    Search index over selected fields of a list of records
+
+    Text is NFKC-normalized and casefolded. Query terms of 3+ characters match
+    anywhere inside a field (trigram postings narrow the candidates, then the
+    substring is verified); shorter terms match the start of a word. Every
+    term must match for a record to be returned. Results are ranked by match
+    quality, with earlier fields weighted higher and ties kept in record order.
+
+    Example:
+        >>> index = SearchIndex([{"name": "Obeng Plus"}, {"name": "Tang"}], ["name"])
+        >>> index.search("ang")
+        [1]
+    """
+
+    def __init__(self, records: Sequence[Dict[str, Any]], fields: Sequence[str]):
+        """
+        Build index
+
+        Args:
+            records: Records to index (positions are used as document ids)
+            fields: Fields to index, most important first
+        """
+        self.fields = list(fields)
+        self._weights = [len(self.fields) - i for i in range(len(self.fields))]
+        self._texts: List[List[str]] = []
+        self._tokens: List[List[List[str]]] = []
+        token_postings: Dict[str, Set[int]] = {}
+        trigram_postings: Dict[str, Set[int]] = {}
+
+        for pos, record in enumerate(records):
+            texts = []
+            tokens = []
+            for field in self.fields:
+                value = record.get(field)
+                text = "" if value is None else fold_name(value)
+                words = _TOKEN_RE.findall(text)
+                texts.append(text)
+                tokens.append(words)
+                for word in words:
+                    token_postings.setdefault(word, set()).add(pos)
+                for gram in _trigrams(text):
+                    trigram_postings.setdefault(gram, set()).add(pos)
+            self._texts.append(texts)
+            self._tokens.append(tokens)
+
+        self._token_postings = token_postings
+        self._trigram_postings = trigram_postings
+        self._sorted_tokens = sorted(token_postings)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def _prefix_candidates(self, prefix: str) -> Set[int]:
+        candidates: Set[int] = set()
+        i = bisect_left(self._sorted_tokens, prefix)
+        while i < len(self._sorted_tokens) and self._sorted_tokens[i].startswith(prefix):
+            candidates |= self._token_postings[self._sorted_tokens[i]]
+            i += 1
+        return candidates
+
+    def _substring_candidates(self, term: str) -> Set[int]:
+        postings = sorted((self._trigram_postings.get(gram, set()) for gram in _trigrams(term)), key=len)
+        if not postings or not postings[0]:
+            return set()
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        return {pos for pos in candidates if any(term in text for text in self._texts[pos])}
+
+    def _term_score(self, pos: int, term: str) -> int:
+        best = 0
+        for weight, text, words in zip(self._weights, self._texts[pos], self._tokens[pos]):
+            if term in words:
+                score = TOKEN_SCORE
+            elif any(word.startswith(term) for word in words):
+                score = TOKEN_PREFIX_SCORE
+            elif len(term) >= MIN_SUBSTRING_LENGTH and term in text:
+                score = SUBSTRING_SCORE
+            else:
+                continue
+            best = max(best, score * weight)
+        return best
+
+    def _phrase_score(self, pos: int, phrase: str) -> int:
+        best = 0
+        for weight, text in zip(self._weights, self._texts[pos]):
+            if text == phrase:
+                best = max(best, EXACT_FIELD_SCORE * weight)
+            elif text.startswith(phrase):
+                best = max(best, FIELD_PREFIX_SCORE * weight)
+        return best
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[int]:
+        """
+        Find records matching query
+
+        Args:
+            query: Search text
+            limit: Maximum number of results (None = all)
+
+        Returns:
+            Record positions, best match first
+        """
+        phrase = fold_name(query)
+        terms = list(dict.fromkeys(_TOKEN_RE.findall(phrase)))
+        if not terms:
+            # Punctuation-only query: plain substring scan
+            if not phrase:
+                return []
+            positions = [pos for pos, texts in enumerate(self._texts) if any(phrase in text for text in texts)]
+            return positions[:limit] if limit is not None else positions
+
+        candidates: Optional[Set[int]] = None
+        for term in sorted(terms, key=len, reverse=True):
+            if len(term) >= MIN_SUBSTRING_LENGTH:
+                matches = self._substring_candidates(term)
+            else:
+                matches = self._prefix_candidates(term)
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+
+        scored = [
+            (-(sum(self._term_score(pos, term) for term in terms) + self._phrase_score(pos, phrase)), pos)
+            for pos in candidates
+        ]
+        scored.sort()
+        positions = [pos for _, pos in scored]
+        return positions[:limit] if limit is not None else positions
@@ -0,0 +1,83 @@
+"""
+Streaming JSON output (NDJSON or a chunked JSON array) for large list endpoints
+"""
+from typing import Any, Iterable, Iterator, List, Optional
+from flask import Request, Response, current_app
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_FORMATS = ("ndjson", "json")
+# Records encoded per chunk
+STREAM_BATCH_SIZE = 1000
+
+
+def get_stream_format(req: Request) -> Optional[str]:
+    """
+    Determine requested streaming format
+
+    Streaming is selected with ?stream=ndjson|json, or with
+    Accept: application/x-ndjson. Anything else keeps the buffered response.
+
+    Args:
+        req: Flask request
+
+    Returns:
+        "ndjson", "json", or None for a regular response
+
+    Raises:
+        ValueError: If ?stream= has an unknown value
+    """
+    value = req.args.get('stream', '').strip().lower()
+    if value:
+        if value not in STREAM_FORMATS:
+            raise ValueError(f"Invalid stream '{value}'. Use one of: {', '.join(STREAM_FORMATS)}")
+        return value
+    if NDJSON_MEDIA_TYPE in req.headers.get('Accept', ''):
+        return "ndjson"
+    return None
+
+
+def stream_records(total: int, batches: Iterable[List[Any]], stream_format: str,
+                   envelope: Optional[str] = None) -> Response:
+    """
+    Stream records in batches as they are encoded
+
+    NDJSON writes one record per line. The "json" format writes the same
+    document as the buffered endpoint: a plain array, or
+    {envelope: [...], "total": n} when envelope is given.
+
+    Args:
+        total: Number of records (sent as X-Total-Count)
+        batches: Iterable of record lists, converted lazily
+        stream_format: "ndjson" or "json"
+        envelope: Key holding the records in the "json" format
+
+    Returns:
+        Streamed Flask response
+    """
+    provider = current_app.json
+    encode = provider.dumps_bytes if hasattr(provider, "dumps_bytes") \
+        else (lambda obj: provider.dumps(obj, separators=(",", ":")).encode("utf-8"))
+
+    def ndjson() -> Iterator[bytes]:
+        for batch in batches:
+            if batch:
+                yield b"\n".join(encode(record) for record in batch) + b"\n"
+
+    def json_array() -> Iterator[bytes]:
+        yield b'{"' + envelope.encode("utf-8") + b'":[' if envelope else b"["
+        first = True
+        for batch in batches:
+            if not batch:
+                continue
+            # Encoded list without its brackets
+            chunk = encode(batch)[1:-1]
+            yield chunk if first else b"," + chunk
+            first = False
+        yield b'],"total":' + str(total).encode("ascii") + b"}\n" if envelope else b"]\n"
+
+    if stream_format == "ndjson":
+        response = current_app.response_class(ndjson(), mimetype=NDJSON_MEDIA_TYPE)
+    else:
+        response = current_app.response_class(json_array(), mimetype="application/json")
+    response.headers["X-Total-Count"] = str(total)
+    return response
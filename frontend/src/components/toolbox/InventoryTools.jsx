@@ -59,7 +59,7 @@ const InventoryTools = () => {
       try {
         if (isMountedRef.current) setLoading(true);
         
-        const apiUrl = `${API_BASE_URL}/tools`;
+        const apiUrl = `${API_BASE_URL}/tools?profile=compact`;
         const response = await fetch(apiUrl);
         
         if (!isMountedRef.current) {
@@ -158,7 +158,7 @@ const InventoryTools = () => {
       const search = searchTerm.toLowerCase();
       filtered = filtered.filter(tool => 
         (tool.tools_name || tool['Part Name'] || tool['TOOLS NAME'] || '').toLowerCase().includes(search) ||
-        (tool.description || tool['Detail Specification'] || '').toLowerCase().includes(search) ||
+        (tool.description || tool.stock_detail || tool['Detail Specification'] || '').toLowerCase().includes(search) ||
         (tool.stock_detail || tool['Detail Specification'] || '').toLowerCase().includes(search) ||
         (tool.remark || tool['Remark'] || '').toLowerCase().includes(search)
       );
@@ -260,7 +260,7 @@ const InventoryTools = () => {
         stock_old: tool.stock_old || tool['OLD'] || 0,
         stock_detail: tool.stock_detail || tool['Detail Specification'] || '',
         photo: tool.photo || tool['Picture'] || '',
-        description: tool.description || tool['Detail Specification'] || '',
+        description: tool.description || tool.stock_detail || tool['Detail Specification'] || '',
         uom: tool.uom || tool['UOM'] || 'Pcs',
         remark: tool.remark || tool['Remark'] || '',
         location: tool.location || ''
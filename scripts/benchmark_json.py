@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON encoding of the list endpoint payloads
+
+Compares Flask's default provider (stdlib json) with FastJSONProvider on
+the data in DATA_DIR. Usage:
+
+    DATA_DIR=data python scripts/benchmark_json.py [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from backend.services.baby_part_service import BabyPartService
+from backend.services.engineer_service import EngineerService
+from backend.services.fsl_service import FSLLocationService
+from backend.services.leveling_service import LevelingService
+from backend.services.machine_service import MachineService
+from backend.services.monthly_machine_service import MonthlyMachineService
+from backend.services.so_service import SOService
+from backend.services.stock_service import StockPartService
+from backend.services.tool_service import ToolService
+from backend.utils import json_provider
+from backend.utils.json_provider import FastJSONProvider
+
+
+def raw_so_payload():
+    data = SOService().get_all_so_data()
+    return {'data': data, 'total': len(data)}
+
+
+# Endpoint -> function building the same payload as the route
+ENDPOINTS = {
+    '/api/engineers': lambda: EngineerService().get_all(),
+    '/api/machines': lambda: MachineService().get_all(),
+    '/api/so-data/raw': raw_so_payload,
+    '/api/stock-parts': lambda: StockPartService().query(),
+    '/api/tools': lambda: ToolService().get_all(),
+    '/api/baby-parts': lambda: BabyPartService().get_all(),
+    '/api/fsl-locations': lambda: FSLLocationService().get_all(),
+    '/api/monthly-machines': lambda: {'rows': MonthlyMachineService().get_all_monthly_data()},
+    '/api/leveling': lambda: LevelingService().get_all(),
+}
+
+
+def best_time(encode, payload, repeat):
+    """Fastest of `repeat` runs in milliseconds, plus the encoded size"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = encode(payload)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='runs per encoder (fastest is reported)')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    encoders = {
+        'flask-default': DefaultJSONProvider(app),
+        'fast (orjson)' if json_provider.orjson else 'fast (stdlib)': FastJSONProvider(app),
+    }
+
+    print(f"{'endpoint':<24}{'encoder':<16}{'ms':>10}{'bytes':>12}")
+    with app.app_context():
+        for endpoint, build in ENDPOINTS.items():
+            try:
+                payload = build()
+            except Exception as e:
+                print(f"{endpoint:<24}skipped: {e}")
+                continue
+            for name, provider in encoders.items():
+                try:
+                    ms, size = best_time(lambda obj: provider.response(obj).get_data(), payload, args.repeat)
+                    print(f"{endpoint:<24}{name:<16}{ms:>10.1f}{size:>12,}")
+                except (TypeError, ValueError) as e:
+                    print(f"{endpoint:<24}{name:<16}  failed: {e}")
+
+
+if __name__ == '__main__':
+    main()
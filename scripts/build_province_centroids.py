@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Compute province centroids from centroid/indonesia-prov.geojson into
+centroid/province_centroids.csv, the lookup the backend uses to place
+machines without coordinates. Run after changing the GeoJSON and commit
+the result:
+
+    python scripts/build_province_centroids.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.services.province_centroids import ProvinceCentroids
+
+
+def main():
+    lookup = ProvinceCentroids()
+    try:
+        centroids = lookup.rebuild()
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"✅ Wrote {len(centroids)} province centroids to {lookup.lookup_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Write precompressed .gz (and .br, when brotli is installed) copies of the
+frontend build so app.py can serve them without compressing per request.
+
+Run after `npm run build`:
+
+    python scripts/precompress_dist.py [dist directory]
+"""
+import gzip
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import Config
+from backend.utils.compression import MIN_COMPRESS_SIZE
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+EXTENSIONS = ('.html', '.js', '.mjs', '.css', '.json', '.svg', '.txt', '.map', '.webmanifest')
+
+
+def precompress(path):
+    """Write compressed siblings of one file; returns the number of files written"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return 0
+
+    written = 0
+    variants = [('.gz', lambda body: gzip.compress(body, 9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', lambda body: brotli.compress(body, quality=11)))
+    for suffix, compress in variants:
+        compressed = compress(data)
+        # Not worth serving if it barely shrinks
+        if len(compressed) < len(data) * 0.9:
+            with open(path + suffix, 'wb') as f:
+                f.write(compressed)
+            written += 1
+    return written
+
+
+def main():
+    dist_dir = sys.argv[1] if len(sys.argv) > 1 else Config.DIST_DIR
+    if not os.path.isdir(dist_dir):
+        print(f"❌ Build directory not found: {dist_dir}")
+        sys.exit(1)
+
+    files = written = 0
+    for root, _, names in os.walk(dist_dir):
+        for name in names:
+            if name.endswith(EXTENSIONS):
+                files += 1
+                written += precompress(os.path.join(root, name))
+    print(f"✅ Precompressed {files} files in {dist_dir} ({written} .gz/.br copies"
+          f"{'' if brotli else ', brotli not installed'})")
+
+
+if __name__ == '__main__':
+    main()